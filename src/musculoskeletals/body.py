@@ -19,6 +19,7 @@ from mathutils import Vector as vec
 from .muscles import *
 from oscillators import ParallelOscillator
 from .sensors import Vestibular
+from utils import trace
 
 
 class Part:
@@ -36,6 +37,7 @@ class Part:
 
         self.n_iter = 0
         self.logger = config_["logger"]
+        self.debug = trace.debug_enabled(self.logger)
         self.simulator = simulator
         # Create the muscles objects
         self.muscles = []
@@ -99,8 +101,9 @@ class Leg(Part):
                     j += 1
 
                 self.muscles[i].update(ctrl_sig=ctrl_sig)
-                self.logger.debug(self.name + " iteration " + str(self.n_iter) +
-                                  ": Control signal = " + str(ctrl_sig))
+                if self.debug:
+                    self.logger.debug(self.name + " iteration " + str(self.n_iter) +
+                                      ": Control signal = " + str(ctrl_sig))
         self.n_iter += 1
 
 
@@ -134,6 +137,9 @@ class Body(Part):
         self.loss_fct = 0.0
         self.penalty = False
         self.count = 0
+        self.tracer = trace.tracer()
+        self.trace_id = self.tracer.register("body " + self.name, ("power", "penalty")) \
+            if self.tracer is not None else 0
 
         # Create 4 legs
         self.l_fo_leg = Leg(config_.get_leg_config("ForeLeg_L"), simulator, "ForeLeg_L")
@@ -236,6 +242,9 @@ class Body(Part):
         self.monitor_fall()
 
         self.n_iter += 1
-        self.logger.debug("Body " + self.name + " iteration " + str(self.n_iter))
-        self.logger.debug("Average power: " + "{0:0.2f}".format(self.av_power))
+        if self.debug:
+            self.logger.debug("Body " + self.name + " iteration " + str(self.n_iter))
+            self.logger.debug("Average power: " + "{0:0.2f}".format(self.av_power))
+        if self.tracer is not None:
+            self.tracer.record(self.trace_id, self.n_iter, self.powers[-1], self.penalty)
         return self.penalty
@@ -18,7 +18,6 @@
 
 from .muscle import Muscle
 from .fiber import SlowTwitchFiber, FastTwitchFiber
-import numpy as np
 
 
 class BrownMuscle(Muscle):
@@ -42,7 +41,7 @@ class BrownMuscle(Muscle):
         self.f_05 = 0.36  # The cycle frequency ranged from 0.15 to 0.72 Hz for the mouse (Guisheng Zhong, 2011)
         self.pcsa = 0. if "pcsa" not in self.params else self.params["pcsa"]
 
-        self.l_ce = np.linalg.norm(self.app_point_1 - self.app_point_2)
+        self.l_ce = (self.app_point_1 - self.app_point_2).length
         # Length at optimal fascicle
         self.l_0 = self.l_ce if "l_0" not in self.params else self.params["l_0"]
         # Tendon Length
@@ -67,7 +66,7 @@ class BrownMuscle(Muscle):
         self.l_se = l_se / len(self.fibers) if len(self.fibers) > 0 else 0.
 
         # get length and velocity
-        l = np.linalg.norm(self.length)
+        l = self.length.length
         old_l_ce = self.l_ce
         # self.l_ce = (l - l_se) / (self.angle * self.l_0) if self.l_0 > 0 and self.angle != 0. else self.l_0
         self.l_ce = l
@@ -101,6 +100,14 @@ class BrownMuscle(Muscle):
             energy += fiber.update_energy(self.force) * percent
         return energy
 
+    def get_force_magnitude(self):
+        """
+        Return the magnitude of the force developed by the fibers
+        :return: Float force
+        """
+
+        return abs(self.force)
+
     def print_update(self):
         """Debug function that prints muscle update"""
 
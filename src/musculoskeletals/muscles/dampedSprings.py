@@ -56,10 +56,11 @@ class DampedSpringMuscle(Muscle):
             power_2 = self.force * self.velocity_2
             power = power_2 + power_1
 
-            self.logger.debug("v_1 = " + str(self.velocity_1.length) + " m/s; v_2 = " + str(self.velocity_2.length) +
-                              " m/s; F = " + str(self.force.length) + " N")
-            self.logger.debug("power obj1 = " + str(power_1) + " ; power obj2 = " + str(power_2) +
-                              " ; power tot = " + str(power))
+            if self.debug:
+                self.logger.debug("v_1 = " + str(self.velocity_1.length) + " m/s; v_2 = " +
+                                  str(self.velocity_2.length) + " m/s; F = " + str(self.force.length) + " N")
+                self.logger.debug("power obj1 = " + str(power_1) + " ; power obj2 = " + str(power_2) +
+                                  " ; power tot = " + str(power))
         return power
 
     def update(self, **kwargs):
@@ -98,12 +99,17 @@ class DampedSpringMuscle(Muscle):
                 self.simulator.apply_impulse(self.obj1, -impulse, self.app_point_1_world)
                 self.simulator.apply_impulse(self.obj2, impulse, self.app_point_2_world)
 
-            self.logger.debug("Muscle " + self.name + ":" + str(self.n_iter) + ": Ft = " + str(
-                self.force) + " - " + str(self.force * self.length.normalized()) + "N")
-            self.logger.debug("  Fs = " + str(force_s) + " ;  Fd = " + str(force_d))
-            self.logger.debug("  l = " + str(self.length) + " ; l0 = " + str(self.l0))
-            self.logger.debug("  L P1 = " + str(self.app_point_1) + " ; L P2 = " + str(self.app_point_2))
-            self.logger.debug("  G P1 = " + str(self.app_point_1_world) + " ; G P2 = " + str(self.app_point_2_world))
+            if self.debug:
+                self.logger.debug("Muscle " + self.name + ":" + str(self.n_iter) + ": Ft = " + str(
+                    self.force) + " - " + str(self.force * self.length.normalized()) + "N")
+                self.logger.debug("  Fs = " + str(force_s) + " ;  Fd = " + str(force_d))
+                self.logger.debug("  l = " + str(self.length) + " ; l0 = " + str(self.l0))
+                self.logger.debug("  L P1 = " + str(self.app_point_1) + " ; L P2 = " + str(self.app_point_2))
+                self.logger.debug("  G P1 = " + str(self.app_point_1_world) + " ; G P2 = " +
+                                  str(self.app_point_2_world))
+            if self.tracer is not None:
+                self.tracer.record(self.trace_id, self.n_iter, self.ctrl_sig if self.ctrl_sig is not None else 0.,
+                                   self.force.length, self.length.length)
 
         else:
             self.logger.warning("Muscle " + self.name + " has been deactivated.")
@@ -152,6 +158,7 @@ class DampedSpringReducedTorqueMuscle(DampedSpringMuscle):
                 self.simulator.apply_torque(self.obj1, torque_1)
                 self.simulator.apply_torque(self.obj2, torque_2)
 
-            self.logger.debug("  G O1 = " + str(cg_1) + " ; G O2 = " + str(cg_1))
-            self.logger.debug("  G OP 1 = " + str(lever_1_vect) + " ; G CG 2 = " + str(lever_2_vect))
-            self.logger.debug("  T1 = " + str(torque_1) + " ; T2 = " + str(torque_2))
+            if self.debug:
+                self.logger.debug("  G O1 = " + str(cg_1) + " ; G O2 = " + str(cg_1))
+                self.logger.debug("  G OP 1 = " + str(lever_1_vect) + " ; G CG 2 = " + str(lever_2_vect))
+                self.logger.debug("  T1 = " + str(torque_1) + " ; T2 = " + str(torque_2))
@@ -19,6 +19,8 @@
 import logging
 from mathutils import Vector as vec
 
+from utils import trace
+
 
 class Muscle:
     """
@@ -39,6 +41,10 @@ class Muscle:
         self.active = True
 
         self.logger = logging.getLogger(params_["logger"])
+        self.debug = trace.debug_enabled(self.logger)
+        self.tracer = trace.tracer()
+        self.trace_id = self.tracer.register("muscle " + self.name, ("ctrl", "force", "length")) \
+            if self.tracer is not None else 0
 
         # Check if object exists
         self.obj1 = self.simulator.get_object(self.params["obj_1"])
@@ -85,6 +91,14 @@ class Muscle:
 
         return 0.
 
+    def get_force_magnitude(self):
+        """
+        Return the magnitude of the force applied by the muscle
+        :return: Float norm of the force
+        """
+
+        return self.force.length
+
     def draw_muscle(self, color_=[256, 0, 0]):
         """
         Draw a line to represent the muscle in the blender simulation
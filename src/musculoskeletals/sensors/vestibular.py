@@ -15,8 +15,9 @@
 # June 2016
 ##
 
+import math
+
 from .sensor import Sensor
-import numpy as np
 
 
 class Vestibular(Sensor):
@@ -34,5 +35,5 @@ class Vestibular(Sensor):
     def get_stability(self):
         res = []
         for result in self.rec:
-            res.append((np.rad2deg(result.x + result.y) / 2))
+            res.append((math.degrees(result.x + result.y) / 2))
         return abs(sum(res) / len(res))
@@ -1,2 +1,11 @@
+from .resultStore import ResultStore
 from .genetic import Genetic
+from .arrayGenetic import ArrayGenetic, ArrayPopulation
+from .cmaes import CMAES
+from .evolutionStrategy import EvolutionStrategy
+from .island import IslandGenetic, parse_address
+from .multiFidelity import MultiFidelityGenetic
+from .steadyState import SteadyStateGenetic
+from .surrogate import SurrogateGenetic, RBFSurrogate
+from .sweep import Sweep, SweepChannel
 from .metaoptimization import MetaOptimization, GeneticMetaOptimization
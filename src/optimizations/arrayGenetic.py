@@ -0,0 +1,390 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import copy
+import logging
+
+import numpy as np
+
+from config import Config
+from .optimization import Optimization
+from .pyevolve import Consts
+from .pyevolve.Statistics import Statistics
+
+CROSSOVERS = ("uniform", "sbx")
+SELECTORS = ("tournament", "rank")
+
+
+class ArrayPopulation:
+    """
+    Population of real valued genomes stored as a genome matrix, a row per specimen, with a vector of raw
+    scores and a vector of scaled fitness. The genetic operators work on the whole matrix at once.
+    The fitness is always the higher the better, whatever the direction of the raw scores.
+    Usage:
+                # Create and initialize a population of 1000 genomes of size 20
+                population = ArrayPopulation(1000, 20, -2., 2.)
+                population.initialize()
+
+                # Set the scores, then create the genomes of the next generation
+                population.set_scores(scores)
+                moms = population.genomes[population.select_tournament(500)]
+    """
+
+    def __init__(self, size, genome_size, genome_min, genome_max, minimize=True):
+        """
+        Class initialization
+        :param size: Int number of specimens
+        :param genome_size: Int genome size
+        :param genome_min: Float min genome value
+        :param genome_max: Float max genome value
+        :param minimize: Boolean True if the lower raw score is the better
+        """
+
+        self.genome_min = genome_min
+        self.genome_max = genome_max
+        self.minimize = minimize
+        self.genomes = np.zeros((size, genome_size))
+        self.scores = np.zeros(size)
+        self.fitness = np.zeros(size)
+        self.stats = Statistics()
+
+    def __len__(self):
+        """Return the number of specimens"""
+
+        return self.genomes.shape[0]
+
+    def initialize(self):
+        """Draw every genome value uniformly between the genome bounds"""
+
+        self.genomes = np.random.uniform(self.genome_min, self.genome_max, self.genomes.shape)
+
+    def set_scores(self, scores):
+        """
+        Set the raw scores of the specimens, then scale them and compute the statistics
+        :param scores: List of Float raw scores, a score per genome
+        """
+
+        self.scores = np.asarray(scores, dtype=float)
+        self.scale()
+        self.statistics()
+
+    def scale(self):
+        """Linear scaling of the raw scores, as pyevolve LinearScaling on scores turned positive"""
+
+        utility = self.scores.max() - self.scores if self.minimize else self.scores - self.scores.min()
+        c = Consts.CDefScaleLinearMultiplier
+        u_ave = utility.mean()
+        u_max = utility.max()
+        u_min = utility.min()
+        if u_ave == u_max:
+            a, b = 1., 0.
+        elif u_min > c * u_ave - u_max / c - 1.:
+            delta = u_max - u_ave
+            a = (c - 1.) * u_ave / delta
+            b = u_ave * (u_max - c * u_ave) / delta
+        else:
+            delta = u_ave - u_min
+            a = u_ave / delta
+            b = -u_min * u_ave / delta
+        self.fitness = np.maximum(utility * a + b, 0.)
+
+    def statistics(self):
+        """
+        Compute the statistics of the population
+        :return: pyevolve Statistics instance
+        """
+
+        self.stats["rawMax"] = float(self.scores.max())
+        self.stats["rawMin"] = float(self.scores.min())
+        self.stats["rawAve"] = float(self.scores.mean())
+        self.stats["rawVar"] = float(self.scores.var(ddof=1)) if len(self) > 1 else 0.
+        self.stats["rawDev"] = self.stats["rawVar"] ** 0.5
+        self.stats["fitMax"] = float(self.fitness.max())
+        self.stats["fitMin"] = float(self.fitness.min())
+        self.stats["fitAve"] = float(self.fitness.mean())
+        return self.stats
+
+    def order(self):
+        """
+        Return the indexes of the specimens, the best first
+        :return: numpy array of Int indexes
+        """
+
+        return np.argsort(self.scores, kind="mergesort") if self.minimize else \
+            np.argsort(-self.scores, kind="mergesort")
+
+    def best(self, index=0):
+        """
+        Return the index-th best specimen
+        :param index: Int rank of the specimen
+        :return: Tuple (Float raw score, List of Float genome)
+        """
+
+        i = self.order()[index]
+        return float(self.scores[i]), list(self.genomes[i])
+
+    def select_tournament(self, n, size=Consts.CDefTournamentPoolSize):
+        """
+        Select parents by tournament on the fitness
+        :param n: Int number of parents
+        :param size: Int number of specimens competing in a tournament
+        :return: numpy array of Int indexes of the parents
+        """
+
+        competitors = np.random.randint(0, len(self), (n, size))
+        return competitors[np.arange(n), np.argmax(self.fitness[competitors], axis=1)]
+
+    def select_rank(self, n):
+        """
+        Select parents with a probability proportional to their rank, the worst specimen having no chance
+        :param n: Int number of parents
+        :return: numpy array of Int indexes of the parents
+        """
+
+        size = len(self)
+        weights = np.empty(size)
+        weights[self.order()] = np.arange(size, 0, -1) - 1.
+        total = weights.sum()
+        return np.random.choice(size, n, p=weights / total if total > 0 else None)
+
+    def crossover_uniform(self, moms, dads):
+        """
+        Uniform crossover, every gene comes from one parent or the other
+        :param moms: numpy array of genomes
+        :param dads: numpy array of genomes
+        :return: Tuple of the numpy arrays of sisters and brothers
+        """
+
+        mask = np.random.rand(*moms.shape) < 0.5
+        return np.where(mask, moms, dads), np.where(mask, dads, moms)
+
+    def crossover_sbx(self, moms, dads, eta=15.):
+        """
+        Simulated binary crossover
+        :param moms: numpy array of genomes
+        :param dads: numpy array of genomes
+        :param eta: Float distribution index, the higher the closer the children are to their parents
+        :return: Tuple of the numpy arrays of sisters and brothers
+        """
+
+        u = np.random.rand(*moms.shape)
+        beta = np.where(u <= 0.5, (2. * u) ** (1. / (eta + 1.)), (1. / (2. * (1. - u))) ** (1. / (eta + 1.)))
+        sisters = 0.5 * ((1. + beta) * moms + (1. - beta) * dads)
+        brothers = 0.5 * ((1. - beta) * moms + (1. + beta) * dads)
+        return np.clip(sisters, self.genome_min, self.genome_max), np.clip(brothers, self.genome_min, self.genome_max)
+
+    def mutate_gaussian(self, genomes, pmut, mu=Consts.CDefG1DListMutRealMU, sigma=Consts.CDefG1DListMutRealSIGMA):
+        """
+        Gaussian mutation of every gene with the probability pmut
+        :param genomes: numpy array of genomes, modified in place
+        :param pmut: Float mutation rate
+        :param mu: Float mean of the gaussian
+        :param sigma: Float standard deviation of the gaussian
+        :return: Int number of mutations
+        """
+
+        mask = np.random.rand(*genomes.shape) < pmut
+        n_mutations = int(mask.sum())
+        genomes[mask] += np.random.normal(mu, sigma, n_mutations)
+        np.clip(genomes, self.genome_min, self.genome_max, out=genomes)
+        return n_mutations
+
+
+class ArrayGenetic(Optimization):
+    """
+    Genetic algorithm on a numpy population. It follows the generation scheme of pyevolve GSimpleGA,
+    with elitism, but selects, crosses and mutates the whole population at once so the populations of
+    thousands of specimens stay cheap for the client.
+    Usage:
+                # Instantiate ArrayGenetic
+                genetic = ArrayGenetic(self.opt, self, population_size=1000, crossover="sbx")
+
+                # Run genetic algorithm
+                genetic.start()
+    """
+
+    def __init__(self, opt, observable, num_max_generation=40, population_size=30, genome_size=None, mutation_rate=0.2,
+                 cross_over_rate=0.65, genome_min=-2, genome_max=2.0, stop_num_av=10, stop_thresh=0.01,
+                 crossover="uniform", selector="tournament", n_elitism=1):
+        """
+        Class initialization
+        :param opt: Dictionary containing simulation parameters
+        :param observable: Observable instance to get update from
+        :param num_max_generation: Int maximum number of generation
+        :param population_size: Int population size
+        :param genome_size: Int genome size
+        :param mutation_rate: Float mutation rate
+        :param cross_over_rate: Float cross over rate
+        :param genome_min: Float min genome value
+        :param genome_max: Float max genome value
+        :param stop_num_av: Int size of best solution list
+        :param stop_thresh: Float threshold used to stop the genetic process
+        :param crossover: String crossover: uniform or sbx
+        :param selector: String selection of the parents: tournament or rank
+        :param n_elitism: Int number of best specimens kept from a generation to the next one
+        """
+
+        if crossover not in CROSSOVERS:
+            raise ValueError("Unknown crossover " + str(crossover) + ". Choose one of " + str(CROSSOVERS))
+        if selector not in SELECTORS:
+            raise ValueError("Unknown selector " + str(selector) + ". Choose one of " + str(SELECTORS))
+        Optimization.__init__(self, opt, observable, num_max_generation, population_size, stop_thresh)
+        self.genome_size = Config(opt["simulator"],
+                                  opt["config_name"]).get_conn_matrix_len() if genome_size is None else genome_size
+        self.mutation_rate = mutation_rate
+        self.cross_over_rate = cross_over_rate
+        self.genome_min = genome_min
+        self.genome_max = genome_max
+        self.stop_num_av = stop_num_av
+        self.crossover = crossover
+        self.selector = selector
+        self.n_elitism = n_elitism
+        self.population = ArrayPopulation(population_size, self.genome_size, genome_min, genome_max)
+
+    def update_population(self, population):
+        """
+        Create the simulation list of a population
+        :param population: ArrayPopulation to evaluate
+        """
+
+        Optimization.update_population(self, population)
+        self.sim_list = []
+        gen_list = population.genomes.tolist()
+        for genome in gen_list:
+            self.opt["genome"] = genome
+            self.sim_list.append(copy.copy(self.opt))
+        self.configs.append(gen_list)
+
+    def evaluate(self, population):
+        """
+        Evaluation function of the genetic algorithm.
+        :param population: ArrayPopulation to evaluate
+        :return: List of Float scores for the population
+        """
+
+        return [self.score(res) for res in self.res_list]
+
+    def update_scores(self, scores, population):
+        """
+        Set the scores of the population
+        :param scores: List of Float scores
+        :param population: ArrayPopulation evaluated
+        :return: Float sum of the scores
+        """
+
+        scores = [scores[i] if i < len(scores) else self.max_score for i in range(len(population))]
+        population.set_scores(scores)
+        self.best_solutions_list.append(population.stats["rawMin"])
+
+        logging.info("\nPopulation gen " + str(self.current_gen) + " scores: " + str(scores))
+        logging.info("Population gen " + str(self.current_gen) + " mean score: " + str(population.stats["rawAve"]))
+        return Optimization.update_scores(self, scores, population)
+
+    def conv_fct(self, algorithm=None):
+        """
+        Convergence function of the genetic algorithm. It is called at each generation
+        :param algorithm: Unused, kept for the Optimization interface
+        :return: Boolean depending on a convergence criteria
+        """
+
+        if Optimization.conv_fct(self, algorithm):
+            return True
+
+        if len(self.best_solutions_list) > self.stop_num_av:
+            av = sum(self.best_solutions_list[-self.stop_num_av:]) / self.stop_num_av
+            if abs(self.best_solutions_list[-1] - av) < self.stop_thresh:
+                logging.info("Criterion reached. Best element : " + str(min(self.best_solutions_list)))
+                return True
+
+        return False
+
+    def select(self, n):
+        """
+        Select parents in the current population
+        :param n: Int number of parents
+        :return: numpy array of the genomes of the parents
+        """
+
+        if self.selector == "rank":
+            return self.population.genomes[self.population.select_rank(n)]
+        return self.population.genomes[self.population.select_tournament(n)]
+
+    def step(self):
+        """Create, evaluate and replace the population by the next generation"""
+
+        size = len(self.population)
+        n_pairs = (size + 1) // 2
+        moms = self.select(n_pairs)
+        dads = self.select(n_pairs)
+
+        # Cross the pairs drawn with the cross over rate, copy the others
+        if self.crossover == "sbx":
+            sisters, brothers = self.population.crossover_sbx(moms, dads)
+        else:
+            sisters, brothers = self.population.crossover_uniform(moms, dads)
+        crossed = (np.random.rand(n_pairs) < self.cross_over_rate)[:, None]
+        children = np.vstack((np.where(crossed, sisters, moms), np.where(crossed, brothers, dads)))[:size]
+        self.population.mutate_gaussian(children, self.mutation_rate)
+
+        new_population = ArrayPopulation(size, self.genome_size, self.genome_min, self.genome_max)
+        new_population.genomes = children
+        self.eval_fct(new_population)
+        if self.interruption:
+            return
+
+        # Elitism: the best specimens of the last generation replace the worst children if they are better
+        old_order = self.population.order()
+        new_order = new_population.order()
+        for i in range(min(self.n_elitism, size)):
+            old, new = old_order[i], new_order[size - 1 - i]
+            if self.population.scores[old] < new_population.scores[new]:
+                new_population.genomes[new] = self.population.genomes[old]
+                new_population.scores[new] = self.population.scores[old]
+        new_population.set_scores(new_population.scores)
+        self.population = new_population
+
+    def bestIndividual(self):
+        """
+        Return the best specimen of the current population
+        :return: Tuple (Float score, List of Float genome)
+        """
+
+        return self.population.best()
+
+    def start(self, **kwargs):
+        """
+        Start the genetic process
+        :param kwargs: Dictionary parameter to pass for the simulation
+        """
+
+        freq_stats = kwargs["freq_stats"] if "freq_stats" in kwargs.keys() else 10
+        self.population.initialize()
+        self.eval_fct(self.population)
+        generation = 0
+        while not self.interruption and generation < self.max_iteration and not self.conv_fct():
+            self.step()
+            generation += 1
+            if freq_stats and generation % freq_stats == 0:
+                logging.info("Gen. " + str(generation) + " Max/Min/Avg Fitness(Raw) [%(fitMax).2f(%(rawMax).2f)/"
+                             "%(fitMin).2f(%(rawMin).2f)/%(fitAve).2f(%(rawAve).2f)]" % self.population.stats)
+
+        score, genome = self.bestIndividual()
+        logging.info("Best specimen: " + str(genome) + " with score " + str(score))
+        self.best_solutions_list.append(genome)
+        self.stop()
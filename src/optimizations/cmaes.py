@@ -0,0 +1,260 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import copy
+import datetime
+import logging
+import math
+
+import numpy as np
+
+from config import Config
+from utils import FileUtils, PickleUtils
+from .optimization import Optimization
+
+
+class CMAES(Optimization):
+    """
+    Covariance Matrix Adaptation Evolution Strategy. Every iteration samples lambda genomes from a multivariate
+    normal distribution, simulates them in a single batch and moves the distribution towards the best ones.
+    The state of the strategy is saved after every iteration so an interrupted optimization can be resumed.
+    Usage:
+                # Instantiate CMAES
+                cma = CMAES(self.opt, self)
+
+                # Resume a previous optimization if needed, then run it
+                cma.load_state(filename)
+                cma.start()
+    """
+
+    def __init__(self, opt, observable, num_max_iteration=100, population_size=None, genome_size=None,
+                 genome_min=-2., genome_max=2., sigma=None, stop_num_av=10, stop_thresh=0.01, tol_x=1e-6):
+        """
+        Class initialization
+        :param opt: Dictionary containing simulation parameters
+        :param observable: Observable instance to get update from
+        :param num_max_iteration: Int maximum number of iterations
+        :param population_size: Int number of genomes sampled every iteration (lambda). Default is 4 + 3 ln(n)
+        :param genome_size: Int genome size
+        :param genome_min: Float min genome value
+        :param genome_max: Float max genome value
+        :param sigma: Float initial step size. Default is 0.3 * (genome_max - genome_min)
+        :param stop_num_av: Int number of iterations the best score is averaged on to detect a stagnation
+        :param stop_thresh: Float threshold used to stop the optimization on a stagnation
+        :param tol_x: Float step size below which the optimization stops
+        """
+
+        self.genome_size = Config(opt["simulator"],
+                                  opt["config_name"]).get_conn_matrix_len() if genome_size is None else genome_size
+        n = self.genome_size
+        lambda_ = int(population_size) if population_size else 4 + int(3 * math.log(n))
+        Optimization.__init__(self, opt, observable, num_max_iteration, lambda_, stop_thresh)
+        self.genome_min = genome_min
+        self.genome_max = genome_max
+        self.stop_num_av = stop_num_av
+        self.tol_x = tol_x
+
+        # Selection and recombination
+        self.mu = lambda_ // 2
+        weights = math.log(lambda_ / 2. + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1. / (self.weights ** 2).sum()
+
+        # Adaptation
+        self.cc = (4. + self.mueff / n) / (n + 4. + 2. * self.mueff / n)
+        self.cs = (self.mueff + 2.) / (n + self.mueff + 5.)
+        self.c1 = 2. / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1. - self.c1, 2. * (self.mueff - 2. + 1. / self.mueff) / ((n + 2.) ** 2 + self.mueff))
+        self.damps = 1. + 2. * max(0., math.sqrt((self.mueff - 1.) / (n + 1.)) - 1.) + self.cs
+        self.chi_n = math.sqrt(n) * (1. - 1. / (4. * n) + 1. / (21. * n ** 2))
+
+        # Dynamic state
+        self.mean = np.random.uniform(genome_min, genome_max, n)
+        self.sigma = float(sigma) if sigma else 0.3 * (genome_max - genome_min)
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.C = np.eye(n)
+        self.B = np.eye(n)
+        self.D = np.ones(n)
+        self.best = (None, None)  # (score, genome) of the best genome simulated
+        self.state_file = self.save_directory + "CMAES_" + datetime.datetime.now().strftime("%Y_%m_%d_%H_%M") + \
+            ".state"
+
+    def ask(self):
+        """
+        Sample a new population
+        :return: List of numpy arrays genomes, clipped to the genome bounds
+        """
+
+        # Eigen decomposition of the covariance matrix
+        self.C = np.triu(self.C) + np.triu(self.C, 1).T
+        eigenvalues, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+        z = np.random.randn(self.population_size, self.genome_size)
+        population = self.mean + self.sigma * (z * self.D).dot(self.B.T)
+        return list(np.clip(population, self.genome_min, self.genome_max))
+
+    def tell(self, population, scores):
+        """
+        Update the distribution with the scores of the population
+        :param population: List of numpy arrays genomes
+        :param scores: List of Float scores, the lower the better
+        """
+
+        n = self.genome_size
+        order = np.argsort(scores)
+        x = np.array([population[i] for i in order[:self.mu]])
+        old_mean = self.mean
+        self.mean = self.weights.dot(x)
+
+        # Evolution paths
+        y = (self.mean - old_mean) / self.sigma
+        c_inv_sqrt = self.B.dot(np.diag(1. / self.D)).dot(self.B.T)
+        self.ps = (1. - self.cs) * self.ps + math.sqrt(self.cs * (2. - self.cs) * self.mueff) * c_inv_sqrt.dot(y)
+        h_sig = np.linalg.norm(self.ps) / math.sqrt(1. - (1. - self.cs) ** (2. * (self.current_gen + 1))) / \
+            self.chi_n < 1.4 + 2. / (n + 1.)
+        self.pc = (1. - self.cc) * self.pc + h_sig * math.sqrt(self.cc * (2. - self.cc) * self.mueff) * y
+
+        # Covariance matrix and step size
+        artmp = (x - old_mean) / self.sigma
+        self.C = (1. - self.c1 - self.cmu) * self.C + \
+            self.c1 * (np.outer(self.pc, self.pc) + (1 - h_sig) * self.cc * (2. - self.cc) * self.C) + \
+            self.cmu * artmp.T.dot(np.diag(self.weights)).dot(artmp)
+        self.sigma *= math.exp((self.cs / self.damps) * (np.linalg.norm(self.ps) / self.chi_n - 1.))
+
+        best = order[0]
+        if self.best[0] is None or scores[best] < self.best[0]:
+            self.best = (scores[best], list(population[best]))
+
+    def update_population(self, population):
+        """
+        Create the simulation list of a population
+        :param population: List of numpy arrays genomes
+        """
+
+        Optimization.update_population(self, population)
+        self.sim_list = []
+        gen_list = []
+        for genome in population:
+            self.opt["genome"] = list(genome)
+            gen_list.append(list(genome))
+            self.sim_list.append(copy.copy(self.opt))
+        self.configs.append(gen_list)
+
+    def evaluate(self, population):
+        """
+        Score the simulated population
+        :param population: List of numpy arrays genomes
+        :return: List of Float scores
+        """
+
+        return [self.score(res) for res in self.res_list]
+
+    def update_scores(self, scores, population):
+        """
+        Record the scores of an iteration
+        :param scores: List of Float scores
+        :param population: List of numpy arrays genomes
+        :return: Float sum of the scores
+        """
+
+        if scores:
+            self.best_solutions_list.append(min(scores))
+            logging.info("\nCMA-ES iteration " + str(self.current_gen) + " scores: " + str(scores))
+            logging.info("CMA-ES iteration " + str(self.current_gen) + " mean score: " +
+                         str(sum(scores) / len(scores)) + ", step size: " + str(self.sigma))
+        return Optimization.update_scores(self, scores, population)
+
+    def conv_fct(self, algorithm=None):
+        """
+        Convergence function of the strategy. It is called after every iteration
+        :param algorithm: Unused, kept for the Optimization interface
+        :return: Boolean depending on a convergence criteria
+        """
+
+        if Optimization.conv_fct(self, algorithm):
+            return True
+        if self.current_gen >= self.max_iteration:
+            return True
+        if self.sigma * self.D.max() < self.tol_x:
+            logging.info("Step size below " + str(self.tol_x) + ". Best score: " + str(self.best[0]))
+            return True
+        if len(self.best_solutions_list) > self.stop_num_av:
+            av = sum(self.best_solutions_list[-self.stop_num_av:]) / self.stop_num_av
+            if abs(self.best_solutions_list[-1] - av) < self.stop_thresh:
+                logging.info("Criterion reached. Best score: " + str(self.best[0]))
+                return True
+        return False
+
+    def get_state(self):
+        """
+        Return the state of the strategy
+        :return: Dictionary of the state
+        """
+
+        return {"mean": self.mean, "sigma": self.sigma, "pc": self.pc, "ps": self.ps, "C": self.C,
+                "current_gen": self.current_gen, "best": self.best, "results": self.results,
+                "configs": self.configs, "best_solutions_list": self.best_solutions_list,
+                "genome_size": self.genome_size, "population_size": self.population_size,
+                "random_state": np.random.get_state()}
+
+    def load_state(self, filename):
+        """
+        Resume the strategy from a state file
+        :param filename: String path to the state file
+        """
+
+        state = PickleUtils.read_file(filename)
+        if not state or state["genome_size"] != self.genome_size or \
+                state["population_size"] != self.population_size:
+            logging.error("The state file " + str(filename) + " does not match this optimization. Starting over.")
+            return
+        for key in ("mean", "sigma", "pc", "ps", "C", "current_gen", "best", "results", "configs",
+                    "best_solutions_list"):
+            setattr(self, key, state[key])
+        np.random.set_state(state["random_state"])
+        self.state_file = filename
+        logging.info("CMA-ES resumed from " + str(filename) + " at iteration " + str(self.current_gen))
+
+    def save_state(self):
+        """Write the state of the optimization in the state file, if the results are saved"""
+
+        if not self.to_save:
+            return
+        FileUtils.create_file(self.state_file)
+        PickleUtils.write_file(self.state_file, self.get_state())
+
+    def start(self, **kwargs):
+        """
+        Start the optimization process till it reach convergence or max iteration
+        :param kwargs: Dictionary parameter to pass for the simulation
+        """
+
+        while not self.conv_fct():
+            population = self.ask()
+            self.eval_fct(population)
+            if self.interruption:
+                break
+            self.tell(population, self.results[-1])
+            self.save_state()
+
+        logging.info("Best genome: " + str(self.best[1]) + " with score " + str(self.best[0]))
+        self.best_solutions_list.append(self.best[1])
+        self.stop()
@@ -0,0 +1,179 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import copy
+import logging
+
+import numpy as np
+
+from config import Config
+from utils import NumpyUtils
+from .optimization import Optimization
+
+MAX_SEED = 2 ** 31 - 1
+
+
+class EvolutionStrategy(Optimization):
+    """
+    Evolution strategy with antithetic sampling. Every iteration draws noise seeds and simulates the mean genome
+    perturbed by the noise of every seed, added and subtracted. A request only holds its seed: the mean genome
+    is shared by the requests of the iteration and the servers regenerate the noise from the seed. The mean
+    genome follows the gradient estimated from the ranks of the scores.
+    Usage:
+                # Instantiate EvolutionStrategy
+                es = EvolutionStrategy(self.opt, self)
+
+                # Run the evolution strategy
+                es.start()
+    """
+
+    def __init__(self, opt, observable, num_max_iteration=100, population_size=30, genome_size=None, sigma=0.1,
+                 learning_rate=0.05, genome_min=-2., genome_max=2., stop_num_av=10, stop_thresh=0.01):
+        """
+        Class initialization
+        :param opt: Dictionary containing simulation parameters
+        :param observable: Observable instance to get update from
+        :param num_max_iteration: Int maximum number of iterations
+        :param population_size: Int number of perturbed genomes simulated every iteration, rounded to an even number
+        :param genome_size: Int genome size
+        :param sigma: Float standard deviation of the noise
+        :param learning_rate: Float step of the mean genome along the gradient
+        :param genome_min: Float min genome value
+        :param genome_max: Float max genome value
+        :param stop_num_av: Int size of best solution list
+        :param stop_thresh: Float threshold used to stop the optimization
+        """
+
+        Optimization.__init__(self, opt, observable, num_max_iteration, max(population_size // 2, 1) * 2,
+                              stop_thresh)
+        self.genome_size = Config(opt["simulator"],
+                                  opt["config_name"]).get_conn_matrix_len() if genome_size is None else genome_size
+        self.sigma = sigma
+        self.learning_rate = learning_rate
+        self.genome_min = genome_min
+        self.genome_max = genome_max
+        self.stop_num_av = stop_num_av
+        self.mean = np.random.uniform(genome_min, genome_max, self.genome_size)
+        self.best = (None, None)  # (score, genome) of the best mean genome
+
+    def update_population(self, seeds):
+        """
+        Create the simulation list of an iteration: the mean genome, then a request per signed seed
+        :param seeds: List of Int signed seeds, 0 for the mean genome
+        """
+
+        Optimization.update_population(self, seeds)
+        opt = copy.copy(self.opt)
+        opt.pop("genome", None)
+        opt["es_version"] = self.run_id + "_" + str(self.current_gen)
+        opt["es_base"] = self.mean.tolist()
+        opt["es_sigma"] = self.sigma
+        self.sim_list = []
+        for seed in seeds:
+            rqt = copy.copy(opt)
+            rqt["es_seed"] = seed
+            self.sim_list.append(rqt)
+        self.configs.append({"mean": self.mean.tolist(), "sigma": self.sigma, "seeds": list(seeds)})
+
+    def request_genome(self, rqt):
+        """
+        Return the genome simulated by a request, regenerated from its noise seed
+        :param rqt: Dictionary containing simulation parameters
+        :return: List of Float genome values
+        """
+
+        return NumpyUtils.perturb(rqt["es_base"], rqt["es_seed"], rqt["es_sigma"])
+
+    def evaluate(self, seeds):
+        """
+        Score the simulations of an iteration
+        :param seeds: List of Int signed seeds
+        :return: List of Float scores
+        """
+
+        return [self.score(res) for res in self.res_list]
+
+    def update_scores(self, scores, seeds):
+        """
+        Record the scores of an iteration
+        :param scores: List of Float scores, the one of the mean genome first
+        :param seeds: List of Int signed seeds
+        :return: Float sum of the scores
+        """
+
+        if scores:
+            self.best_solutions_list.append(scores[0])
+            if self.best[0] is None or scores[0] < self.best[0]:
+                self.best = (scores[0], self.mean.tolist())
+            logging.info("\nES iteration " + str(self.current_gen) + " scores: " + str(scores))
+            logging.info("ES iteration " + str(self.current_gen) + " mean genome score: " + str(scores[0]) +
+                         ", mean score: " + str(sum(scores) / len(scores)))
+        return Optimization.update_scores(self, scores, seeds)
+
+    def step(self, seeds, scores):
+        """
+        Move the mean genome along the gradient estimated from the scores of the antithetic pairs
+        :param seeds: List of Int positive seeds, a pair of simulations per seed
+        :param scores: List of Float scores of the pairs, the + perturbations then the - ones
+        """
+
+        n = len(seeds)
+        # Centered ranks make the update insensitive to the scale of the scores
+        ranks = np.empty(2 * n)
+        ranks[np.argsort(scores)] = np.arange(2 * n)
+        utilities = ranks / (2 * n - 1) - 0.5
+        noise = np.array([np.random.RandomState(seed).randn(self.genome_size) for seed in seeds])
+        gradient = (utilities[:n] - utilities[n:]).dot(noise) / (2 * n * self.sigma)
+        self.mean = np.clip(self.mean - self.learning_rate * gradient, self.genome_min, self.genome_max)
+
+    def conv_fct(self, algorithm=None):
+        """
+        Convergence function of the evolution strategy. It is called after every iteration
+        :param algorithm: Unused, kept for the Optimization interface
+        :return: Boolean depending on a convergence criteria
+        """
+
+        if Optimization.conv_fct(self, algorithm):
+            return True
+        if self.current_gen >= self.max_iteration:
+            return True
+        if len(self.best_solutions_list) > self.stop_num_av:
+            av = sum(self.best_solutions_list[-self.stop_num_av:]) / self.stop_num_av
+            if abs(self.best_solutions_list[-1] - av) < self.stop_thresh:
+                logging.info("Criterion reached. Best score: " + str(self.best[0]))
+                return True
+        return False
+
+    def start(self, **kwargs):
+        """
+        Start the optimization process till it reach convergence or max iteration
+        :param kwargs: Dictionary parameter to pass for the simulation
+        """
+
+        n = self.population_size // 2
+        while not self.conv_fct():
+            seeds = [int(seed) for seed in np.random.randint(1, MAX_SEED, n)]
+            self.eval_fct([0] + seeds + [-seed for seed in seeds])
+            if self.interruption:
+                break
+            self.step(seeds, self.results[-1][1:])
+
+        logging.info("Best genome: " + str(self.best[1]) + " with score " + str(self.best[0]))
+        self.best_solutions_list.append(self.best[1])
+        self.stop()
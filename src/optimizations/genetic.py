@@ -90,8 +90,6 @@ class Genetic(Optimization):
         self.ga.setEvaluator(self.eval_fct)
         self.ga.setMinimax(Consts.minimaxType["minimize"])
 
-        self.max_score = 200.
-
     def update_population(self, population):
         """
         Update the current population and configuration
@@ -100,6 +98,7 @@ class Genetic(Optimization):
 
         Optimization.update_population(self, population)
         # Create a config for the genome
+        self.sim_list = []
         gen_list = []
         for ind in population.internalPop:
             self.opt["genome"] = ind.getInternalList()
@@ -132,17 +131,7 @@ class Genetic(Optimization):
         :return: List of Float scores for the population
         """
 
-        scores = []
-        for res in self.res_list:
-            if "penalty" not in res or "distance" not in res or "stability" not in res:
-                score = self.max_score
-            elif res["penalty"]:
-                score = self.max_score - res["distance"]
-            else:
-                score = self.max_score / 2. - res["distance"] + res["stability"]
-            scores.append(score)
-
-        return scores
+        return [self.score(res) for res in self.res_list]
 
     def eval_fct(self, population):
         return Optimization.eval_fct(self, population)
@@ -166,6 +155,35 @@ class Genetic(Optimization):
 
         return False
 
+    def generations_left(self):
+        """
+        Return the number of generations the genetic process can still run
+        :return: Int number of generations before num_max_generation
+        """
+
+        return max(self.ga.getGenerations() - self.ga.getCurrentGeneration(), 0)
+
+    def evolve_more(self, n_generations=1, **kwargs):
+        """
+        Run more generations of the genetic process, at most the ones left before num_max_generation.
+        The population is created and evaluated at the first call
+        :param n_generations: Int number of generations to run
+        :param kwargs: Dictionary parameter to pass for the simulation
+        :return: Boolean True if the genetic process has converged or has run its last generation
+        """
+
+        if len(self.ga.internalPop) == 0:
+            self.ga.initialize()
+            self.ga.internalPop.evaluate()
+            self.ga.internalPop.sort()
+
+        for _ in range(min(n_generations, self.generations_left())):
+            if self.conv_fct(self.ga):
+                return True
+            if self.ga.step():
+                return True
+        return self.interruption or self.generations_left() == 0
+
     def start(self, **kwargs):
         """
         Start the genetic process
@@ -0,0 +1,203 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import json
+import logging
+import socket
+import zlib
+from random import choice as rand_choice, randint as rand_randint
+
+from .genetic import Genetic
+from .pyevolve import Migration, Network, Util
+
+TOPOLOGIES = ("ring", "full", "star")
+
+
+def parse_address(address):
+    """
+    Parse an island address
+    :param address: String "host:port"
+    :return: Tuple (String host, Int port)
+    """
+
+    host, port = address.rsplit(":", 1)
+    return host, int(port)
+
+
+def build_topology(islands, topology="ring"):
+    """
+    Create the migration graph between the islands
+    :param islands: List of (String host, Int port) addresses of every island
+    :param topology: String shape of the graph: ring, full or star (the first island is the hub)
+    :return: pyevolve Util.Graph
+    """
+
+    if topology not in TOPOLOGIES:
+        raise ValueError("Unknown island topology " + str(topology) + ". Choose one of " + str(TOPOLOGIES))
+
+    graph = Util.Graph()
+    for island in islands:
+        graph.addNode(island)
+    if len(islands) < 2:
+        return graph
+
+    if topology == "ring":
+        for i, island in enumerate(islands):
+            graph.addEdge(island, islands[(i + 1) % len(islands)])
+    elif topology == "full":
+        for i, island in enumerate(islands):
+            for other in islands[i + 1:]:
+                graph.addEdge(island, other)
+    else:
+        for island in islands[1:]:
+            graph.addEdge(islands[0], island)
+    return graph
+
+
+class IslandServerThread(Network.UDPThreadServer):
+    """
+    UDP server of an island. The senders are identified by their address and their port, so the islands
+    running on the same machine can exchange specimens.
+    """
+
+    def getData(self):
+        """
+        Wait for a message
+        :return: Tuple ((String ip, Int port) of the sender, String data), None on timeout
+        """
+
+        try:
+            data, sender = self.sock.recvfrom(self.bufferSize)
+        except socket.timeout:
+            return None
+        return sender, data
+
+
+class IslandMigration(Migration.WANMigration):
+    """
+    Migration scheme of the islands. The best specimens are sent to the neighbors of the island as
+    compressed JSON messages holding their genome and their score, so nothing is unpickled from the network.
+    The immigrants replace the worst specimens of the population.
+    """
+
+    def __init__(self, host, port, group_name):
+        """
+        Class initialization
+        :param host: String address of the island
+        :param port: Int port of the island
+        :param group_name: String name shared by the islands of the same optimization
+        """
+
+        Migration.MigrationScheme.__init__(self, host, port, group_name)
+        self.topologyGraph = None
+        self.serverThread = IslandServerThread(host, port)
+        self.clientThread = Network.UDPThreadUnicastClient(host, rand_randint(30000, 65534))
+
+    def exchange(self):
+        """Send the best specimens to the neighbors and integrate the specimens received"""
+
+        if not self.isReady():
+            return
+
+        # Emigration of the best specimens
+        population = self.GAEngine.getPopulation()
+        for i in range(min(self.getNumIndividuals(), len(population))):
+            individual = population.bestRaw(i)
+            message = {"group": self.getGroupName(), "genome": list(individual.getInternalList()),
+                       "score": individual.getRawScore()}
+            self.clientThread.addData(zlib.compress(json.dumps(message).encode("utf-8"),
+                                                    self.getCompressionLevel()))
+
+        # Immigration
+        pool = []
+        while self.serverThread.isReady():
+            source, data = self.serverThread.popPool()
+            try:
+                message = json.loads(zlib.decompress(data).decode("utf-8"))
+                genome = [float(value) for value in message["genome"]]
+                score = float(message["score"])
+            except (zlib.error, ValueError, KeyError, TypeError) as e:
+                logging.warning("Invalid migration message from " + str(source) + ": " + str(e))
+                continue
+            if message.get("group") == self.getGroupName() and len(genome) == len(population[0]):
+                pool.append((genome, score))
+
+        if not pool:
+            return
+        logging.info("Island " + str(self.myself) + " received " + str(len(pool)) + " specimen(s)")
+
+        for i in range(min(self.getNumReplacement(), len(population))):
+            if not pool:
+                break
+            genome, score = rand_choice(pool)
+            pool.remove((genome, score))
+
+            # Replace the worst
+            immigrant = population[len(population) - 1 - i].clone()
+            immigrant.genomeList = genome
+            immigrant.setRawScore(score)
+            population[len(population) - 1 - i] = immigrant
+
+
+class IslandGenetic(Genetic):
+    """
+    Island version of the genetic algorithm. Every island runs its own Genetic instance on the simulation
+    slots of its observable, usually a LocalExecutor on a server or a Client of a server group. Every
+    migration_rate generations, the islands send their best specimens to their neighbors in the topology.
+    Usage:
+                # Instantiate the island listening on its address
+                islands = [("10.0.0.1", 20000), ("10.0.0.2", 20000)]
+                genetic = IslandGenetic(self.opt, executor, islands[0], islands)
+
+                # Run genetic algorithm
+                genetic.start()
+    """
+
+    def __init__(self, opt, observable, island, islands, topology="ring", migration_rate=5, n_migrants=2,
+                 group_name="locomotion", **kwargs):
+        """
+        Class initialization
+        :param opt: Dictionary containing simulation parameters
+        :param observable: Observable instance to get update from
+        :param island: Tuple (String host, Int port) address of this island
+        :param islands: List of (String host, Int port) addresses of every island
+        :param topology: String shape of the migration graph: ring, full or star
+        :param migration_rate: Int number of generations between two migrations
+        :param n_migrants: Int number of specimens sent to the neighbors and replaced at every migration
+        :param group_name: String name shared by the islands of the same optimization
+        :param kwargs: Dictionary of the Genetic parameters
+        """
+
+        Genetic.__init__(self, opt, observable, **kwargs)
+        self.island = island
+        self.islands = islands if island in islands else [island] + list(islands)
+
+        graph = build_topology(self.islands, topology)
+        if not graph.getNeighbors(island):
+            logging.warning("Island " + str(island) + " has no neighbor: no migration")
+            self.migration = None
+            return
+
+        self.migration = IslandMigration(island[0], island[1], group_name)
+        self.migration.setTopology(graph)
+        self.migration.setMigrationRate(migration_rate)
+        self.migration.setNumIndividuals(n_migrants)
+        self.migration.setNumReplacement(n_migrants)
+        self.ga.setMigrationAdapter(self.migration)
+        logging.info("Island " + str(island) + " connected to " + str(graph.getNeighbors(island)))
@@ -15,18 +15,17 @@
 # June 2016
 ##
 
+import copy
 import logging
+import math
 import numpy as np
 import datetime
-import matplotlib
 
 import time
 from .genetic import Genetic
 from .optimization import Optimization
-
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
+from .pyevolve import Initializators
+from .sweep import Sweep
 
 
 class MetaOptimization(Optimization):
@@ -61,6 +60,7 @@ class MetaOptimization(Optimization):
         self.res_list['scores'] = []
         self.res_list['configs'] = []
         self.res_list['param_val'] = []
+        self.res_list['eliminated'] = []
 
         self.observable = observable
         self.minimum = minimum
@@ -82,6 +82,8 @@ class MetaOptimization(Optimization):
                 mean_ += str(sum(scores) / len(scores)) if len(scores) > 0 else str(0.) + " "
                 max_ += str(max(scores)) if len(scores) > 0 else str(0.) + " "
             res += "## " + self.res_list['abs_name'] + " = " + str(i) + " ##\n"
+            if self.eliminated(j) is not None:
+                res += "\tEliminated by the race after generation " + str(self.eliminated(j)) + "\n"
             res += "\tSimulation time: " + str(self.res_list['time'][j]) + "\n"
             res += "\tMin score evolution: " + "\n\t" + min_ + "\n"
             res += "\tMean score evolution: " + "\n\t" + mean_ + "\n"
@@ -96,6 +98,12 @@ class MetaOptimization(Optimization):
         :param filename: String path for the pdf file
         """
 
+        # matplotlib is only loaded to plot, with a backend that does not need a display
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_pdf import PdfPages
+
         logging.info("Printing plots into pdf file" + filename)
         plots = []
 
@@ -124,7 +132,9 @@ class MetaOptimization(Optimization):
             plt.plot(iterations, max_, 'r-')
 
             ax = fig.add_subplot(111)
-            ax.set_title(self.res_list['abs_name'] + " = " + str(i))
+            ax.set_title(self.res_list['abs_name'] + " = " + str(i) +
+                         (" (eliminated after generation " + str(self.eliminated(j)) + ")"
+                          if self.eliminated(j) is not None else ""))
             ax.yaxis.grid(True)
             ax.set_xticks([y for y in iterations], )
             ax.set_xlabel("Iteration number")
@@ -166,6 +176,15 @@ class MetaOptimization(Optimization):
         else:
             logging.warning("Nothing to save in the pdf file")
 
+    def eliminated(self, j):
+        """
+        Return the generation after which a configuration was eliminated by a race
+        :param j: Int index of the configuration in the result container
+        :return: Int generation, None if the configuration was not eliminated
+        """
+
+        return self.res_list['eliminated'][j] if j < len(self.res_list['eliminated']) else None
+
     def update(self, **kwargs):
         """
         Retrieve results from the simulation and update parameters
@@ -190,39 +209,76 @@ class MetaOptimization(Optimization):
             raise Exception("Parameter 'n_gen' missing in notification")
         self.res_list['time'].append(time.time() - self.t_init)
 
+    def record(self, param_val, optimization, duration, eliminated=None):
+        """
+        Add the results of a finished optimization to the result container
+        :param param_val: Value of the benchmarked parameter
+        :param optimization: Optimization instance
+        :param duration: Float duration of the optimization in seconds
+        :param eliminated: Int generation after which the optimization was eliminated by a race, if any
+        """
+
+        self.res_list['param_val'].append(param_val)
+        self.res_list['eliminated'].append(eliminated)
+        self.res_list['scores'].append(optimization.results)
+        self.res_list['configs'].append(optimization.configs)
+        self.res_list['n_gen'].append(optimization.current_gen)
+        self.res_list['time'].append(duration)
+        if optimization.interruption:
+            self.interruption = True
+
 
 class GeneticMetaOptimization(MetaOptimization):
     """
     This class provides tools to benchmark the Genetic Algorithm parameters
     """
 
-    def __init__(self, opt, observable):
+    def __init__(self, opt, observable, race_generations=2):
         """
         Init genetic meta optimization objects
         :param opt: Dictionary containing simulation parameters
         :param observable: Observable instance to get update from
+        :param race_generations: Int number of generations of the first round of a race
         """
 
         MetaOptimization.__init__(self, opt, observable)
+        self.racing = opt["racing"] if "racing" in opt else False
+        self.race_budget = opt["race_budget"] if "race_budget" in opt else None
+        self.race_generations = race_generations
 
-    def co_bench(self):
+    def sweep(self, abs_name, values, **kwargs):
         """
-        Benchmark evolution of the cross-over parameter
+        Run a Genetic optimization for every value of a parameter, all at the same time on the observable,
+        then save, display and plot the results
+        :param abs_name: String name of the benchmarked parameter
+        :param values: List of (value, Dictionary of Genetic parameters) pairs
+        :param kwargs: Dictionary of the attributes to set on the genome of the optimizations, as lists
+        with a value per pair
         """
 
         # Configure result container
-        self.res_list['abs_name'] = "Cross-Over Rate"
+        self.res_list['abs_name'] = abs_name
         self.res_list['ord_name'] = "Loss function scores"
 
-        for i in np.arange(self.minimum, self.max_iteration + self.step, self.step):
-            self.res_list['param_val'].append(i)
-
-            genetic = Genetic(self.opt, self.observable, cross_over_rate=i)
-            genetic.add_observer(self)
-            genetic.start(**{"freq_stats": 2})
-
-            if self.interruption:
-                break
+        # Every optimization has its own parameters and saves nothing, the results are saved here
+        sweep = Sweep(self.observable)
+        optimizations = []
+        for i, (value, params) in enumerate(values):
+            opt = copy.copy(self.opt)
+            opt["save"] = False
+            genetic = Genetic(opt, sweep.channel(), **params)
+            for key, settings in kwargs.items():
+                getattr(genetic.genome, key).set(settings[i])
+            optimizations.append(genetic)
+
+        logging.info("Benchmark of the " + abs_name + " on " + str(len(optimizations)) + " concurrent optimizations")
+        if self.racing:
+            durations, eliminated = self.race(sweep, optimizations)
+        else:
+            durations = sweep.run(optimizations, **{"freq_stats": 2})
+            eliminated = [None for _ in optimizations]
+        for (value, _), genetic, duration, gen in zip(values, optimizations, durations, eliminated):
+            self.record(value, genetic, duration, gen)
 
         # Save, display and plot results
         self.save(filename="GeneticMetaOptimization")
@@ -230,14 +286,146 @@ class GeneticMetaOptimization(MetaOptimization):
         self.plot(self.save_directory + "GeneticMetaOptimization" +
                   datetime.datetime.now().strftime("_%Y_%m_%d_%H_%M") + ".pdf")
 
+    def race(self, sweep, optimizations):
+        """
+        Successive halving of the optimizations. All of them run a few generations, then the worse half
+        and the ones significantly worse than the best are eliminated. The survivors run twice more
+        generations, until one remains, the survivors have run their last generation or the simulation budget
+        is spent.
+        :param sweep: Sweep instance the optimizations simulate through
+        :param optimizations: List of Genetic instances
+        :return: Tuple of the List of Float durations and the List of the generations after which every
+        optimization was eliminated, None for the survivors
+        """
+
+        durations = [0. for _ in optimizations]
+        eliminated = [None for _ in optimizations]
+        alive = range(len(optimizations))
+        n_generations = self.race_generations
+        while len(alive) > 1 and not self.interruption:
+            # The first round also evaluates the initial population
+            cost = sum(optimizations[i].population_size * (min(n_generations, optimizations[i].generations_left()) +
+                                                           (0 if optimizations[i].results else 1))
+                       for i in alive)
+            spent = sum(len(scores) for o in optimizations for scores in o.results)
+            if self.race_budget is not None and spent + cost > self.race_budget:
+                logging.info("Race budget spent after " + str(spent) + " simulations")
+                break
+
+            logging.info("Race round of " + str(n_generations) + " generations for " + str(len(alive)) +
+                         " configurations")
+            for i, duration in zip(alive, sweep.run([optimizations[i] for i in alive], "evolve_more",
+                                                    n_generations=n_generations)):
+                durations[i] += duration
+            if any(optimizations[i].interruption for i in alive):
+                self.interruption = True
+                break
+
+            for i in self.losers(alive, optimizations):
+                eliminated[i] = optimizations[i].current_gen
+                alive = [k for k in alive if k != i]
+                logging.info("Configuration " + str(i) + " eliminated after generation " + str(eliminated[i]))
+            if all(optimizations[i].generations_left() == 0 for i in alive):
+                break
+            n_generations *= 2
+        return durations, eliminated
+
+    def losers(self, alive, optimizations, z_thresh=1.645):
+        """
+        Select the optimizations to eliminate from a race, on the scores of their last generation
+        :param alive: List of Int indexes of the optimizations still in the race
+        :param optimizations: List of Genetic instances
+        :param z_thresh: Float one-sided threshold of the Mann-Whitney test, 1.645 for 5%
+        :return: List of Int indexes of the optimizations to eliminate
+        """
+
+        last = dict((i, optimizations[i].results[-1] if optimizations[i].results else [self.max_score])
+                    for i in alive)
+        order = sorted(alive, key=lambda i: np.median(last[i]))
+        leader = order[0]
+        n_kept = int(math.ceil(len(order) / 2.))
+        return [i for k, i in enumerate(order)
+                if k >= n_kept or (i != leader and mann_whitney_z(last[leader], last[i]) > z_thresh)]
+
+    def co_bench(self):
+        """
+        Benchmark evolution of the cross-over parameter
+        """
+
+        self.sweep("Cross-Over Rate", [(i, {"cross_over_rate": i}) for i in
+                                       np.arange(self.minimum, self.max_iteration + self.step, self.step)])
+
     def mut_bench(self):
         """Benchmark evolution of the mutation parameter"""
 
-    def pop_size_bench(self):
-        """Benchmark evolution of the extrema in the interval [-val val]"""
+        self.sweep("Mutation Rate", [(i, {"mutation_rate": i}) for i in
+                                     np.arange(self.minimum, self.max_iteration + self.step, self.step)])
+
+    def pop_size_bench(self, sizes=(10, 20, 30, 40, 50)):
+        """
+        Benchmark evolution of the population size
+        :param sizes: List of Int population sizes
+        """
+
+        self.sweep("Population Size", [(size, {"population_size": size}) for size in sizes])
 
     def init_strat_bench(self):
         """Benchmark different initialization strategies"""
 
+        strategies = [("Uniform", Initializators.G1DListInitializatorReal),
+                      ("Gaussian", gaussian_initializator),
+                      ("Centered", centered_initializator)]
+        self.sweep("Initialization Strategy", [(name, {}) for name, _ in strategies],
+                   initializator=[initializator for _, initializator in strategies])
+
     def loss_fct_bench(self):
         """Benchmark different loss functions"""
+
+
+def mann_whitney_z(a, b):
+    """
+    Normal approximation of the Mann-Whitney U test that the scores of a are lower than the scores of b
+    :param a: List of Float scores
+    :param b: List of Float scores
+    :return: Float z statistic, the higher the more likely a is better than b
+    """
+
+    n_a = len(a)
+    n_b = len(b)
+    if n_a == 0 or n_b == 0:
+        return 0.
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    u = (a[:, None] < b[None, :]).sum() + 0.5 * (a[:, None] == b[None, :]).sum()
+    sigma = math.sqrt(n_a * n_b * (n_a + n_b + 1) / 12.)
+    return (u - n_a * n_b / 2.) / sigma
+
+
+def gaussian_initializator(genome, **args):
+    """
+    Initialize a real G1DList with values drawn from a gaussian centered between the genome bounds,
+    a quarter of the range wide, clipped to the bounds
+    :param genome: G1DList genome
+    :param args: Dictionary of the initialization arguments
+    """
+
+    range_min = genome.getParam("rangemin", 0)
+    range_max = genome.getParam("rangemax", 100)
+    center = (range_min + range_max) / 2.
+    width = (range_max - range_min) / 4.
+    genome.genomeList = [min(max(np.random.normal(center, width), range_min), range_max)
+                         for _ in range(genome.getListSize())]
+
+
+def centered_initializator(genome, **args):
+    """
+    Initialize a real G1DList with values drawn uniformly in the central tenth of the genome range
+    :param genome: G1DList genome
+    :param args: Dictionary of the initialization arguments
+    """
+
+    range_min = genome.getParam("rangemin", 0)
+    range_max = genome.getParam("rangemax", 100)
+    center = (range_min + range_max) / 2.
+    width = (range_max - range_min) / 20.
+    genome.genomeList = [np.random.uniform(center - width, center + width) for _ in range(genome.getListSize())]
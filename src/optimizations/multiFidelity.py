@@ -0,0 +1,138 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import copy
+import logging
+import math
+
+from .genetic import Genetic
+
+HORIZON_CONDITION = "self.body.config.n_iter > "  # Exit condition of a simulation shortened to a horizon
+
+
+class MultiFidelityGenetic(Genetic):
+    """
+    Genetic algorithm evaluating the specimens at increasing fidelities. Every specimen of a generation
+    first runs a simulation stopped at the shortest horizon, then only the best fraction is simulated again
+    at the next horizon, and so on up to the full simulation of the config. Only the full simulations give a
+    score. The specimens stopped at a shorter horizon are ranked behind every fully simulated one, first by
+    the last horizon they reached, then by their rank at this horizon: the scores of different horizons are
+    never compared.
+    Usage:
+                # Instantiate MultiFidelityGenetic with horizons of 100 and 250 iterations
+                genetic = MultiFidelityGenetic(self.opt, self, horizons=(100, 250))
+
+                # Run genetic algorithm
+                genetic.start()
+    """
+
+    def __init__(self, opt, observable, horizons=(125, 250), promotion_rate=0.5, **kwargs):
+        """
+        Class initialization
+        :param opt: Dictionary containing simulation parameters
+        :param observable: Observable instance to get update from
+        :param horizons: List of Int numbers of iterations of the short simulations, in increasing order.
+        The last fidelity is always the exit condition of the config
+        :param promotion_rate: Float share of the specimens of a fidelity simulated at the next one
+        :param kwargs: Dictionary of the Genetic parameters
+        """
+
+        Genetic.__init__(self, opt, observable, **kwargs)
+        self.fidelities = [HORIZON_CONDITION + str(int(h)) for h in sorted(horizons)] + [None]
+        self.promotion_rate = promotion_rate
+        self.fidelity_results = []  # Scores of every fidelity, a list of (indexes, scores) per generation
+
+    def simulate_fidelity(self, indexes, exit_condition):
+        """
+        Simulate specimens of the current generation at a fidelity
+        :param indexes: List of Int indexes of the specimens in the generation
+        :param exit_condition: String exit condition of the simulations, None for the one of the config
+        :return: List of Float scores, a score per index
+        """
+
+        sim_list = []
+        for i in indexes:
+            rqt = copy.copy(self.sim_list[i])
+            if exit_condition is not None:
+                rqt["exit_condition"] = exit_condition
+            sim_list.append(rqt)
+
+        self.res_list = [{} for _ in sim_list]
+        self.observable.simulate(sim_list)
+        if exit_condition is None:
+            self.store_evaluations(sim_list, self.res_list)
+        return [self.score(res) for res in self.res_list]
+
+    def eval_fct(self, population):
+        """
+        Evaluation function of the genetic algorithm, with a fidelity increasing for the best specimens
+        :param population: List of specimen to evaluate
+        :return: Float population score
+        """
+
+        self.res_list = []
+        if self.interruption:
+            return 0.
+        self.update_population(population)
+
+        n = len(self.sim_list)
+        candidates = range(n)
+        scores = [None] * n
+        stopped = []  # (fidelity, rank at this fidelity, index) of the specimens not promoted
+        levels = []
+        for level, exit_condition in enumerate(self.fidelities):
+            level_scores = self.simulate_fidelity(candidates, exit_condition)
+            levels.append((list(candidates), level_scores))
+            if self.interruption:
+                break
+            if exit_condition is None:
+                for i, score in zip(candidates, level_scores):
+                    scores[i] = score
+                break
+
+            # Promote the best fraction to the next fidelity
+            order = sorted(range(len(candidates)), key=lambda k: level_scores[k])
+            n_promoted = max(int(math.ceil(self.promotion_rate * len(candidates))), 1)
+            stopped.extend((level, rank, candidates[k]) for rank, k in enumerate(order[n_promoted:]))
+            candidates = sorted(candidates[k] for k in order[:n_promoted])
+            logging.info("Fidelity " + str(exit_condition) + ": " + str(len(candidates)) + " of " +
+                         str(len(level_scores)) + " specimen(s) promoted")
+        self.fidelity_results.append(levels)
+
+        # The specimens stopped early come after the full ones, the longest horizons first
+        full = [score for score in scores if score is not None]
+        ceiling = max(full) if full else self.max_score
+        for level, rank, i in stopped:
+            scores[i] = ceiling + (len(self.fidelities) - 1 - level) * (n + 1) + rank + 1
+        scores = [score if score is not None else ceiling + len(self.fidelities) * (n + 1) for score in scores]
+        return self.update_scores(scores, population)
+
+    def stop(self):
+        """Stop the optimization and save the results with the scores of every fidelity"""
+
+        self.notify()
+        self.close_store()
+        if self.to_save:
+            self.save(filename=self.__class__.__name__, result={
+                "res": self.results,
+                "configs": self.configs,
+                "fidelities": self.fidelities,
+                "fidelity_results": self.fidelity_results,
+                "current_generation": self.current_gen
+            })
@@ -15,8 +15,10 @@
 # April 2016
 ##
 import datetime
+import uuid
 
 from utils import PickleUtils, Observer, Observable
+from .resultStore import ResultStore
 
 
 class Optimization(Observer, Observable):
@@ -49,11 +51,15 @@ class Optimization(Observer, Observable):
         self.max_iteration = max_iteration
         self.res_list = []
         self.sim_list = []
+        self.max_score = 200.  # Score of a failed simulation
 
         # Saving parameters
         self.to_save = opt["save"] if "save" in opt else True
         self.save_directory = self.opt["root_dir"] + "/save/"
         self.extension = ".sim"
+        self.run_id = self.__class__.__name__ + datetime.datetime.now().strftime("_%Y_%m_%d_%H_%M_%S_") + \
+            uuid.uuid4().hex[:6]
+        self.store = None  # Store of every evaluation, opened with the first one
         # Saving content
         self.results = []
         self.configs = []
@@ -73,6 +79,20 @@ class Optimization(Observer, Observable):
     def evaluate(self, population):
         return self.res_list
 
+    def score(self, res):
+        """
+        Score of a specimen from its simulation results. The lower the better.
+        :param res: Dictionary of the simulation results
+        :return: Float score
+        """
+
+        if "penalty" not in res or "distance" not in res or "stability" not in res:
+            return self.max_score
+        elif res["penalty"]:
+            return self.max_score - res["distance"]
+        else:
+            return self.max_score / 2. - res["distance"] + res["stability"]
+
     def eval_fct(self, population):
         """
         Evaluation function used to test solution
@@ -84,10 +104,46 @@ class Optimization(Observer, Observable):
         if self.interruption:
             return 0.
         self.update_population(population)
+        # One empty result per simulation, filled as the results arrive
+        self.res_list = [{} for _ in self.sim_list]
         self.observable.simulate(self.sim_list)
+        self.store_evaluations(self.sim_list, self.res_list)
         scores = self.evaluate(population)
         return self.update_scores(scores, population)
 
+    def request_genome(self, rqt):
+        """
+        Return the genome simulated by a request
+        :param rqt: Dictionary containing simulation parameters
+        :return: List of Float genome values, None for the connection matrix of the config
+        """
+
+        return rqt["genome"] if "genome" in rqt else None
+
+    def store_evaluations(self, sim_list, res_list, generation=None):
+        """
+        Append the evaluations of simulated requests to the result store of the save directory
+        :param sim_list: List of Dictionary containing simulation parameters
+        :param res_list: List of Dictionary of the simulation results, a result per request
+        :param generation: Int generation of the evaluations, None for the current one
+        """
+
+        if not self.to_save or self.interruption:
+            return
+        if self.store is None:
+            self.store = ResultStore(self.save_directory + ResultStore.FILENAME)
+            self.store.register(self.run_id, self.__class__.__name__, self.opt.get("config_name"))
+        for rqt, res in zip(sim_list, res_list):
+            self.store.add(self.run_id, self.current_gen if generation is None else generation,
+                           self.request_genome(rqt), res, self.score(res))
+
+    def close_store(self):
+        """Write the last evaluations and close the result store"""
+
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
     def conv_fct(self, algorithm):
         """
         Convergence function to test solutions evolution
@@ -104,7 +160,13 @@ class Optimization(Observer, Observable):
         :param kwargs: Dictionary parameter used for update
         """
 
-        if "res" in kwargs.keys():
+        if "result" in kwargs.keys():
+            # A single new result with its index in the simulation list
+            index, res = kwargs["result"]
+            while len(self.res_list) <= index:
+                self.res_list.append({})
+            self.res_list[index] = res
+        elif "res" in kwargs.keys():
             self.res_list = kwargs["res"].copy() if type(kwargs["res"]) == dict else kwargs["res"]
         elif "interruption" in kwargs.keys():
             if type(kwargs["interruption"]) == bool and kwargs["interruption"]:
@@ -122,6 +184,7 @@ class Optimization(Observer, Observable):
         """Stop the optimization and save the results"""
 
         self.notify()
+        self.close_store()
         if self.to_save:
             self.save(filename=self.__class__.__name__, result={
                 "res": self.results,
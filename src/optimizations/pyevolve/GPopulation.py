@@ -36,7 +36,6 @@ import logging
 from math import sqrt as math_sqrt
 
 import Consts
-import Util
 from FunctionSlot import FunctionSlot
 from Statistics import Statistics
 
@@ -144,6 +143,7 @@ class GPopulation:
 
             self.internalParams = genome.internalParams
             self.multiProcessing = genome.multiProcessing
+            self.procPool = genome.procPool
 
             self.statted = False
             self.stats = Statistics()
@@ -164,6 +164,7 @@ class GPopulation:
 
         self.internalParams = {}
         self.multiProcessing = (False, False)
+        self.procPool = None
 
         # Statistics
         self.statted = False
@@ -184,6 +185,9 @@ class GPopulation:
                      will get a good tradeoff between the process communication speed and the
                      parallel evaluation.
 
+        .. note:: The worker pool is created at the first evaluation and shared by the next
+                  generations until :meth:`closePool` is called.
+
         .. versionadded:: 0.6
            The `setMultiProcessing` method.
 
@@ -320,12 +324,12 @@ class GPopulation:
         rev = (self.minimax == Consts.minimaxType["maximize"])
 
         if self.sortType == Consts.sortType["raw"]:
-            self.internalPop.sort(cmp=Util.cmp_individual_raw, reverse=rev)
+            self.internalPop.sort(key=key_raw_score, reverse=rev)
         else:
             self.scale()
-            self.internalPop.sort(cmp=Util.cmp_individual_scaled, reverse=rev)
+            self.internalPop.sort(key=key_fitness_score, reverse=rev)
             self.internalPopRaw = self.internalPop[:]
-            self.internalPopRaw.sort(cmp=Util.cmp_individual_raw, reverse=rev)
+            self.internalPopRaw.sort(key=key_raw_score, reverse=rev)
 
         self.sorted = True
 
@@ -384,15 +388,19 @@ class GPopulation:
         # We have multiprocessing
         if self.multiProcessing[0] and MULTI_PROCESSING:
             logging.debug("Evaluating the population using the multiprocessing method")
-            proc_pool = Pool()
+            if self.procPool is None:
+                self.procPool = Pool()
+
+            # Send the individuals by chunks to reduce the communication overhead
+            chunk_size = max(1, len(self.internalPop) // (CPU_COUNT * 4))
 
             # Multiprocessing full_copy parameter
             if self.multiProcessing[1]:
-                results = proc_pool.map(multiprocessing_eval_full, self.internalPop)
+                results = self.procPool.map(multiprocessing_eval_full, self.internalPop, chunk_size)
                 for i in range(len(self.internalPop)):
                     self.internalPop[i] = results[i]
             else:
-                results = proc_pool.map(multiprocessing_eval, self.internalPop)
+                results = self.procPool.map(multiprocessing_eval, self.internalPop, chunk_size)
                 for individual, score in zip(self.internalPop, results):
                     individual.score = score
         else:
@@ -450,6 +458,7 @@ class GPopulation:
         # pop.internalParams = self.internalParams.copy()
         pop.internalParams = self.internalParams
         pop.multiProcessing = self.multiProcessing
+        pop.procPool = self.procPool
 
     def getParam(self, key, nvl=None):
         """ Gets an internal parameter
@@ -477,6 +486,14 @@ class GPopulation:
         """
         self.internalParams.update(args)
 
+    def closePool(self):
+        """ Stop the worker pool of the multiprocessing mode, if any """
+        if self.procPool is not None:
+            logging.debug("Closing the multiprocessing pool")
+            self.procPool.close()
+            self.procPool.join()
+            self.procPool = None
+
     def clear(self):
         """ Remove all individuals from population """
         del self.internalPop[:]
@@ -853,6 +853,9 @@ class GSimpleGA:
         except KeyboardInterrupt:
             logging.debug("CTRL-C detected, finishing evolution.")
             if freq_stats: print("\n\tA break was detected, you have interrupted the evolution !\n")
+        finally:
+            # The worker pool lives as long as the evolution
+            self.internalPop.closePool()
 
         if freq_stats != 0:
             self.printStats()
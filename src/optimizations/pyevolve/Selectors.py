@@ -41,7 +41,9 @@ def GRankSelector(population, **args):
     """
     count = 0
 
-    if args["popID"] != GRankSelector.cachePopID:
+    # The cache is kept in the population, so several engines can run at the same time
+    cache = getattr(population, "rankSelectorCache", None)
+    if cache is None or args["popID"] != cache[0]:
         if population.sortType == Consts.sortType["scaled"]:
             best_fitness = population.bestFitness().fitness
             for index in range(1, len(population.internalPop)):
@@ -53,19 +55,14 @@ def GRankSelector(population, **args):
                 if population[index].score == best_raw:
                     count += 1
 
-        GRankSelector.cachePopID = args["popID"]
-        GRankSelector.cacheCount = count
+        population.rankSelectorCache = (args["popID"], count)
 
     else:
-        count = GRankSelector.cacheCount
+        count = cache[1]
 
     return population[random.randint(0, count)]
 
 
-GRankSelector.cachePopID = None
-GRankSelector.cacheCount = None
-
-
 def GUniformSelector(population, **args):
     """ The Uniform Selector """
     return population[random.randint(0, len(population) - 1)]
@@ -0,0 +1,275 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import logging
+import os
+import sqlite3
+import sys
+import time
+from threading import Lock
+
+import numpy
+
+from utils import PickleUtils
+
+COLUMNS = ("run", "generation", "genome", "score", "distance", "power", "stability", "penalty", "wall_time",
+           "server", "created")
+
+
+class ResultStore:
+    """
+    ResultStore appends the evaluations of the optimizations to a SQLite database, one row per simulation with
+    its run, generation, genome, score and main results. The database is in WAL mode so several optimizations
+    can write in it while it is read. The rows are written by batches and the scores are indexed, so the best
+    genomes are found without loading the runs in memory.
+    Usage:
+            # Open the store and record the evaluations of a run
+            store = ResultStore("save/results.db")
+            store.register(run, "Genetic", opt["config_name"])
+            store.add(run, generation, genome, result, score)
+            store.close()
+
+            # Find the 10 best genomes of every run
+            best = ResultStore("save/results.db").best(10)
+    """
+
+    FILENAME = "results.db"  # Name of the database in the save directory
+    BATCH = 256  # Number of rows buffered before being written
+    FETCH = 1024  # Number of rows read at once when iterating over evaluations
+
+    def __init__(self, filename, batch=BATCH):
+        """
+        Class initialization
+        :param filename: String path to the SQLite database
+        :param batch: Int number of rows buffered before being written
+        """
+
+        self.filename = filename
+        self.batch = batch
+        self.rows = []
+        self.mutex = Lock()
+        self.db = None
+        self.__open(filename)
+
+    def __open(self, filename):
+        """
+        Open the SQLite database and create its tables and indexes
+        :param filename: String path to the SQLite database
+        """
+
+        dirname = os.path.dirname(filename)
+        try:
+            if dirname != "" and not os.path.exists(dirname):
+                os.makedirs(dirname)
+            self.db = sqlite3.connect(filename, timeout=30., check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS runs (run TEXT PRIMARY KEY, optimization TEXT, "
+                            "config_name TEXT, created REAL)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS evaluations (run TEXT, generation INTEGER, genome BLOB, "
+                            "score REAL, distance REAL, power REAL, stability REAL, penalty INTEGER, "
+                            "wall_time REAL, server TEXT, created REAL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS evaluations_score ON evaluations (score)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS evaluations_run_score ON evaluations (run, score)")
+            self.db.commit()
+        except (OSError, sqlite3.Error) as e:
+            logging.error("Impossible to open the result store " + str(filename) + ", evaluations are not saved. " +
+                          "Exception:\n" + str(e))
+            self.db = None
+
+    @staticmethod
+    def encode_genome(genome):
+        """
+        Pack a genome in a blob of little-endian doubles
+        :param genome: List of Float genome values, or None
+        :return: sqlite3 Binary blob, None without genome
+        """
+
+        if genome is None:
+            return None
+        return sqlite3.Binary(numpy.asarray(genome, dtype="<f8").tobytes())
+
+    @staticmethod
+    def decode_genome(blob):
+        """
+        Unpack a genome stored by encode_genome
+        :param blob: Blob of little-endian doubles, or None
+        :return: List of Float genome values, None without genome
+        """
+
+        if blob is None:
+            return None
+        return numpy.frombuffer(bytes(blob), dtype="<f8").tolist()
+
+    def register(self, run, optimization, config_name=None):
+        """
+        Describe a run. Registering a run again keeps its first description
+        :param run: String id of the run
+        :param optimization: String name of the optimization
+        :param config_name: String path to the config of the run
+        """
+
+        if self.db is None:
+            return
+        self.mutex.acquire()
+        try:
+            self.db.execute("INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?)",
+                            (run, optimization, config_name, time.time()))
+            self.db.commit()
+        except sqlite3.Error as e:
+            logging.error("Impossible to write the result store. Exception:\n" + str(e))
+        finally:
+            self.mutex.release()
+
+    def add(self, run, generation, genome, result, score=None):
+        """
+        Buffer the evaluation of a genome. The buffer is written once it holds batch rows
+        :param run: String id of the run
+        :param generation: Int generation or iteration of the evaluation
+        :param genome: List of Float genome values, None to keep the connection matrix of the config
+        :param result: Dictionary of the simulation results
+        :param score: Float score given by the optimization, None if not scored
+        """
+
+        if self.db is None:
+            return
+        result = result if isinstance(result, dict) else {}
+        penalty = result.get("penalty")
+        row = (run, generation, self.encode_genome(genome), score, result.get("distance"), result.get("power"),
+               result.get("stability"), int(penalty) if penalty is not None else None, result.get("t_sim"),
+               result.get("server"), time.time())
+
+        self.mutex.acquire()
+        self.rows.append(row)
+        full = len(self.rows) >= self.batch
+        self.mutex.release()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows in a single transaction"""
+
+        self.mutex.acquire()
+        rows = self.rows
+        self.rows = []
+        try:
+            if rows and self.db is not None:
+                self.db.executemany("INSERT INTO evaluations VALUES (" + ", ".join("?" * len(COLUMNS)) + ")", rows)
+                self.db.commit()
+        except sqlite3.Error as e:
+            logging.error("Impossible to write " + str(len(rows)) + " evaluation(s) in the result store. " +
+                          "Exception:\n" + str(e))
+        finally:
+            self.mutex.release()
+
+    def __query(self, query, args=()):
+        """
+        Iterate over the evaluations selected by a query, a few rows at a time
+        :param query: String SQL query selecting all the columns of the evaluations
+        :param args: Tuple of the query arguments
+        :return: Generator of Dictionary of the evaluations
+        """
+
+        if self.db is None:
+            return
+        self.flush()
+        self.mutex.acquire()
+        try:
+            cursor = self.db.execute(query, args)
+            rows = cursor.fetchmany(self.FETCH)
+        finally:
+            self.mutex.release()
+        while rows:
+            for row in rows:
+                evaluation = dict(zip(COLUMNS, row))
+                evaluation["genome"] = self.decode_genome(evaluation["genome"])
+                yield evaluation
+            self.mutex.acquire()
+            try:
+                rows = cursor.fetchmany(self.FETCH)
+            finally:
+                self.mutex.release()
+
+    def best(self, k=10, run=None):
+        """
+        Return the best scored evaluations. The lower the score, the better
+        :param k: Int number of evaluations
+        :param run: String id of a run, None for every run
+        :return: List of Dictionary of the evaluations, the best first
+        """
+
+        if run is None:
+            return list(self.__query("SELECT * FROM evaluations WHERE score IS NOT NULL ORDER BY score LIMIT ?",
+                                     (k,)))
+        return list(self.__query("SELECT * FROM evaluations WHERE run = ? AND score IS NOT NULL ORDER BY score "
+                                 "LIMIT ?", (run, k)))
+
+    def evaluations(self, run=None):
+        """
+        Iterate over the evaluations in their order of insertion
+        :param run: String id of a run, None for every run
+        :return: Generator of Dictionary of the evaluations
+        """
+
+        if run is None:
+            return self.__query("SELECT * FROM evaluations ORDER BY rowid")
+        return self.__query("SELECT * FROM evaluations WHERE run = ? ORDER BY rowid", (run,))
+
+    def runs(self):
+        """
+        Return the description of the runs
+        :return: List of Dictionary of the runs, the oldest first
+        """
+
+        if self.db is None:
+            return []
+        self.mutex.acquire()
+        try:
+            rows = self.db.execute("SELECT run, optimization, config_name, created FROM runs ORDER BY created")
+            return [dict(zip(("run", "optimization", "config_name", "created"), row)) for row in rows]
+        except sqlite3.Error as e:
+            logging.error("Impossible to read the result store. Exception:\n" + str(e))
+            return []
+        finally:
+            self.mutex.release()
+
+    def close(self):
+        """Write the buffered rows and close the database"""
+
+        self.flush()
+        self.mutex.acquire()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+        self.mutex.release()
+
+
+if __name__ == "__main__":
+
+    # Usage: python -m optimizations.resultStore save/results.db [k]
+    filename_ = sys.argv[1] if len(sys.argv) > 1 else "save/" + ResultStore.FILENAME
+    k_ = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    store_ = ResultStore(filename_)
+    best_ = store_.best(k_)
+    for evaluation_ in best_:
+        print(str(evaluation_["score"]) + " " + str(evaluation_["run"]) + " gen " + str(evaluation_["generation"]) +
+              " distance " + str(evaluation_["distance"]))
+    if best_ and best_[0]["genome"] is not None:
+        PickleUtils.write_file(os.path.join(os.path.dirname(filename_), "best_solution.gene"), best_[0]["genome"])
+    store_.close()
@@ -0,0 +1,205 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import bisect
+import copy
+import logging
+import random
+
+try:
+    from Queue import Queue, Empty
+except ImportError:
+    from queue import Queue, Empty
+
+from .genetic import Genetic
+from .pyevolve import Util
+
+
+class SteadyStateGenetic(Genetic):
+    """
+    Asynchronous steady-state version of the genetic algorithm. There is no generation barrier: as soon as a
+    result arrives, the specimen joins the evaluated pool and a child of two parents selected by tournament in
+    this pool is submitted. The number of simulations in flight stays equal to the capacity of the observable.
+    Every population_size evaluations are logged and tested for convergence like a generation of Genetic.
+    Usage:
+                # Instantiate SteadyStateGenetic with an observable able to submit requests
+                genetic = SteadyStateGenetic(self.opt, client)
+
+                # Run the algorithm
+                genetic.start()
+    """
+
+    WAIT_T = 0.5  # Maximum delay before handling a user interruption while waiting for results
+
+    def __init__(self, opt, observable, num_max_generation=40, population_size=30, genome_size=None,
+                 mutation_rate=0.2, cross_over_rate=0.65, genome_min=-2, genome_max=2.0, stop_num_av=10,
+                 stop_thresh=0.01, tournament_size=2):
+        """
+        Creation and initialization function for the genome and the steady-state algorithm
+        :param opt: Dictionary containing simulation parameters
+        :param observable: Client or LocalExecutor instance to submit the simulations to
+        :param num_max_generation: Int maximum number of evaluations, in population_size units
+        :param population_size: Int size of the evaluated pool
+        :param genome_size: Int genome size
+        :param mutation_rate: Float mutation rate
+        :param cross_over_rate: Float cross over rate
+        :param genome_min: Float min genome value
+        :param genome_max: Float max genome value
+        :param stop_num_av: Int size of best solution list
+        :param stop_thresh: Float threshold used to stop the genetic process
+        :param tournament_size: Int number of specimens competing to be a parent
+        """
+
+        Genetic.__init__(self, opt, observable, num_max_generation, population_size, genome_size, mutation_rate,
+                         cross_over_rate, genome_min, genome_max, False, stop_num_av, stop_thresh)
+        self.tournament_size = tournament_size
+        self.evaluated = []  # Pool of (score, specimen) pairs, the best first
+        self.running = {}  # Specimens being simulated, indexed by ticket
+        self.arrivals = Queue()  # (ticket, result) pairs notified by the observable
+        self.n_submitted = 0
+        self.block_scores = []
+        self.block_configs = []
+
+    def update(self, **kwargs):
+        """
+        Retrieve results from the simulation and update parameters
+        :param kwargs: Dictionary parameter used for update
+        """
+
+        if "async_result" in kwargs.keys():
+            # Results are handled by the optimization thread
+            self.arrivals.put(kwargs["async_result"])
+        else:
+            Genetic.update(self, **kwargs)
+
+    def select(self):
+        """
+        Select a parent by tournament in the evaluated pool
+        :return: G1DList specimen
+        """
+
+        size = min(self.tournament_size, len(self.evaluated))
+        return self.evaluated[min(random.sample(range(len(self.evaluated)), size))][1]
+
+    def new_child(self):
+        """
+        Create the next specimen to evaluate. The first specimens are random
+        :return: G1DList specimen
+        """
+
+        if self.n_submitted < self.population_size or len(self.evaluated) < 2:
+            child = self.genome.clone()
+            child.initialize()
+            return child
+
+        mom = self.select()
+        dad = self.select()
+        if Util.randomFlipCoin(self.cross_over_rate):
+            child = list(mom.crossover.applyFunctions(mom=mom, dad=dad, count=1))[0][0]
+        else:
+            child = mom.clone()
+        child.mutate(pmut=self.mutation_rate, ga_engine=self.ga)
+        return child
+
+    def submit(self, specimen):
+        """
+        Submit the simulation of a specimen
+        :param specimen: G1DList specimen
+        """
+
+        opt = copy.copy(self.opt)
+        opt["genome"] = list(specimen.getInternalList())
+        ticket = self.observable.submit(opt)
+        self.running[ticket] = specimen
+        self.n_submitted += 1
+
+    def receive(self, ticket, result):
+        """
+        Add a specimen to the evaluated pool once simulated
+        :param ticket: Int ticket of the simulation
+        :param result: Dictionary of the simulation results
+        :return: Boolean True if a block of population_size evaluations is complete
+        """
+
+        specimen = self.running.pop(ticket, None)
+        if specimen is None:
+            return False
+
+        score = self.score(result)
+        specimen.setRawScore(score)
+        self.store_evaluations([{"genome": list(specimen.getInternalList())}], [result], self.current_gen + 1)
+        scores = [s for s, _ in self.evaluated]
+        self.evaluated.insert(bisect.bisect_right(scores, score), (score, specimen))
+        del self.evaluated[self.population_size:]
+
+        self.block_scores.append(score)
+        self.block_configs.append(list(specimen.getInternalList()))
+        if len(self.block_scores) >= self.population_size:
+            self.end_block()
+            return True
+        return False
+
+    def end_block(self):
+        """Record the scores of the last population_size evaluations as a generation"""
+
+        if not self.block_scores:
+            return
+
+        self.current_gen += 1
+        self.configs.append(self.block_configs)
+        self.results.append(self.block_scores)
+        self.best_solutions_list.append(self.evaluated[0][0])
+        logging.info("\nPopulation gen " + str(self.current_gen) + " scores: " + str(self.block_scores))
+        logging.info("Population gen " + str(self.current_gen) + " mean score: " +
+                     str(sum(self.block_scores) / len(self.block_scores)))
+        self.block_scores = []
+        self.block_configs = []
+
+    def start(self, **kwargs):
+        """
+        Start the steady-state genetic process
+        :param kwargs: Dictionary parameter to pass for the simulation
+        """
+
+        budget = self.max_iteration * self.population_size
+        while not self.interruption:
+            # Keep every simulation slot busy
+            capacity = max(self.observable.capacity(), 1)
+            while len(self.running) < capacity and self.n_submitted < budget:
+                self.submit(self.new_child())
+            if not self.running:
+                break
+
+            try:
+                ticket, result = self.arrivals.get(timeout=self.WAIT_T)
+            except Empty:
+                continue
+            except KeyboardInterrupt:
+                logging.warning("Optimization interrupted by user!")
+                self.interruption = True
+                break
+            if self.receive(ticket, result) and self.conv_fct(self.ga):
+                break
+
+        self.end_block()
+        if self.evaluated:
+            logging.info("Best specimen: " + str(self.evaluated[0][1].getInternalList()) +
+                         " with score " + str(self.evaluated[0][0]))
+            self.best_solutions_list.append(self.evaluated[0][1].getInternalList())
+        self.stop()
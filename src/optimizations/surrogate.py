@@ -0,0 +1,270 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import logging
+import math
+import random
+
+import numpy as np
+
+from utils import PickleUtils
+from .genetic import Genetic
+from .resultStore import ResultStore
+
+
+def load_archive(filenames, genome_size):
+    """
+    Read the simulated genomes and their scores from saved optimization files or result stores
+    :param filenames: List of String paths to the .sim files saved by the optimizations or to .db result stores
+    :param genome_size: Int genome size, the genomes of another size are ignored
+    :return: Tuple of the List of genomes and the List of Float scores
+    """
+
+    genomes = []
+    scores = []
+    for filename in filenames:
+        if filename.endswith(".db"):
+            store = ResultStore(filename)
+            for evaluation in store.evaluations():
+                if evaluation["score"] is not None and evaluation["genome"] is not None and \
+                        len(evaluation["genome"]) == genome_size:
+                    genomes.append(evaluation["genome"])
+                    scores.append(evaluation["score"])
+            store.close()
+            continue
+        content = PickleUtils.read_file(filename)
+        if not isinstance(content, dict) or "res" not in content or "configs" not in content:
+            logging.warning("No optimization results in " + str(filename))
+            continue
+        simulated = content["simulated"] if "simulated" in content else None
+        for gen, (gen_scores, gen_configs) in enumerate(zip(content["res"], content["configs"])):
+            indexes = simulated[gen] if simulated is not None else range(len(gen_scores))
+            for i in indexes:
+                if i < len(gen_configs) and len(gen_configs[i]) == genome_size:
+                    genomes.append(list(gen_configs[i]))
+                    scores.append(float(gen_scores[i]))
+    logging.info(str(len(scores)) + " evaluation(s) loaded from " + str(len(filenames)) + " file(s)")
+    return genomes, scores
+
+
+class RBFSurrogate:
+    """
+    Gaussian radial basis function regression of the score of a genome. The kernel width is the median
+    distance between the training genomes. Only the last max_samples evaluations are used for the fit.
+    Usage:
+                # Fit the model on the evaluations
+                surrogate = RBFSurrogate()
+                surrogate.fit(genomes, scores)
+
+                # Predict the scores of new genomes
+                predictions = surrogate.predict(candidates)
+    """
+
+    def __init__(self, max_samples=1000, regularization=1e-6):
+        """
+        Class initialization
+        :param max_samples: Int maximum number of evaluations used for the fit
+        :param regularization: Float ridge added to the kernel matrix
+        """
+
+        self.max_samples = max_samples
+        self.regularization = regularization
+        self.x = None
+        self.weights = None
+        self.offset = 0.
+        self.width = 1.
+
+    def fit(self, genomes, scores):
+        """
+        Fit the model
+        :param genomes: List of genomes
+        :param scores: List of Float scores
+        """
+
+        x = np.array(genomes[-self.max_samples:], dtype=float)
+        y = np.array(scores[-self.max_samples:], dtype=float)
+        sq_dist = self.__sq_distances(x, x)
+        distances = np.sqrt(sq_dist[np.triu_indices(len(x), 1)])
+        self.width = float(np.median(distances)) if len(distances) and np.median(distances) > 0 else 1.
+        self.offset = float(y.mean())
+        kernel = np.exp(-sq_dist / (2. * self.width ** 2)) + self.regularization * np.eye(len(x))
+        try:
+            self.weights = np.linalg.solve(kernel, y - self.offset)
+        except np.linalg.LinAlgError:
+            self.weights = np.linalg.lstsq(kernel, y - self.offset)[0]
+        self.x = x
+
+    def predict(self, genomes):
+        """
+        Predict the scores of genomes
+        :param genomes: List of genomes
+        :return: List of Float predicted scores
+        """
+
+        if self.x is None:
+            return [0. for _ in genomes]
+        kernel = np.exp(-self.__sq_distances(np.array(genomes, dtype=float), self.x) / (2. * self.width ** 2))
+        return list(kernel.dot(self.weights) + self.offset)
+
+    @staticmethod
+    def __sq_distances(a, b):
+        """
+        Squared euclidean distances between two sets of genomes
+        :param a: numpy array of genomes
+        :param b: numpy array of genomes
+        :return: numpy array of the distances, a row per genome of a
+        """
+
+        return np.maximum((a ** 2).sum(1)[:, None] + (b ** 2).sum(1)[None, :] - 2. * a.dot(b.T), 0.)
+
+
+def rank_correlation(a, b):
+    """
+    Spearman rank correlation between two lists
+    :param a: List of Float values
+    :param b: List of Float values
+    :return: Float correlation, None if it is not defined
+    """
+
+    if len(a) < 2:
+        return None
+    rank_a = np.argsort(np.argsort(a))
+    rank_b = np.argsort(np.argsort(b))
+    if rank_a.std() == 0 or rank_b.std() == 0:
+        return None
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+class SurrogateGenetic(Genetic):
+    """
+    Genetic algorithm screening the specimens with a surrogate model before simulating them. Once the model
+    is trained, only the best predicted fraction of every generation and a random exploration share are
+    simulated. The other specimens get their predicted score, never better than the best simulated score of
+    the generation. The model is trained on every evaluation of the run and on the saved optimization files.
+    Usage:
+                # Instantiate SurrogateGenetic warmed up with previous runs
+                genetic = SurrogateGenetic(self.opt, self, history=glob.glob("save/Genetic_*.sim"))
+
+                # Run genetic algorithm
+                genetic.start()
+    """
+
+    def __init__(self, opt, observable, history=None, simulated_fraction=0.3, exploration=0.1, min_samples=None,
+                 **kwargs):
+        """
+        Class initialization
+        :param opt: Dictionary containing simulation parameters
+        :param observable: Observable instance to get update from
+        :param history: List of String paths to saved optimization files used to train the surrogate
+        :param simulated_fraction: Float share of the best predicted specimens simulated every generation
+        :param exploration: Float share of the other specimens simulated, chosen randomly
+        :param min_samples: Int number of evaluations before screening. Default is two population sizes
+        :param kwargs: Dictionary of the Genetic parameters
+        """
+
+        Genetic.__init__(self, opt, observable, **kwargs)
+        self.simulated_fraction = simulated_fraction
+        self.exploration = exploration
+        self.min_samples = min_samples if min_samples is not None else 2 * self.population_size
+        self.surrogate = RBFSurrogate()
+        self.genomes, self.scores = load_archive(history, self.genome_size) if history else ([], [])
+        if len(self.scores) >= self.min_samples:
+            self.surrogate.fit(self.genomes, self.scores)
+        self.simulated = []  # Indexes of the simulated specimens, a list per generation
+        self.predictions = None
+        self.accuracy = []  # (mean absolute error, rank correlation) of the surrogate, per generation
+
+    def update_population(self, population):
+        """
+        Create the simulation list with the specimens selected by the surrogate
+        :param population: List of specimen to evaluate
+        """
+
+        Genetic.update_population(self, population)
+        genomes = self.configs[-1]
+        if len(self.scores) < self.min_samples:
+            self.predictions = None
+            self.simulated.append(range(len(genomes)))
+            return
+
+        self.predictions = self.surrogate.predict(genomes)
+        order = sorted(range(len(genomes)), key=lambda i: self.predictions[i])
+        n_best = int(math.ceil(self.simulated_fraction * len(genomes)))
+        others = order[n_best:]
+        explored = random.sample(others, min(int(math.ceil(self.exploration * len(genomes))), len(others)))
+        selected = sorted(order[:n_best] + explored)
+        self.simulated.append(selected)
+        self.sim_list = [self.sim_list[i] for i in selected]
+        logging.info("Surrogate selected " + str(len(selected)) + " specimen(s) of " + str(len(genomes)) +
+                     " to simulate")
+
+    def evaluate(self, population):
+        """
+        Score the simulated specimens, predict the others and train the surrogate
+        :param population: List of specimen to evaluate
+        :return: List of Float scores for the population
+        """
+
+        selected = self.simulated[-1]
+        genomes = self.configs[-1]
+        real = [self.score(res) for res in self.res_list]
+        if self.predictions is None:
+            scores = real
+        else:
+            # The best specimen of a generation is always a simulated one
+            floor = min(real) if real else self.max_score
+            scores = [max(p, floor) for p in self.predictions]
+            for j, i in enumerate(selected):
+                scores[i] = real[j]
+            self.report([self.predictions[i] for i in selected], real)
+
+        self.genomes.extend(genomes[i] for i in selected)
+        self.scores.extend(real)
+        if len(self.scores) >= self.min_samples:
+            self.surrogate.fit(self.genomes, self.scores)
+        return scores
+
+    def report(self, predicted, real):
+        """
+        Log the accuracy of the surrogate on the simulated specimens
+        :param predicted: List of Float predicted scores
+        :param real: List of Float simulated scores
+        """
+
+        if not real:
+            return
+        error = sum(abs(p - r) for p, r in zip(predicted, real)) / len(real)
+        correlation = rank_correlation(predicted, real)
+        self.accuracy.append((error, correlation))
+        logging.info("Surrogate gen " + str(self.current_gen) + " mean absolute error: " + str(error) +
+                     ", rank correlation: " + str(correlation))
+
+    def stop(self):
+        """Stop the optimization and save the results with the indexes of the simulated specimens"""
+
+        self.notify()
+        self.close_store()
+        if self.to_save:
+            self.save(filename=self.__class__.__name__, result={
+                "res": self.results,
+                "configs": self.configs,
+                "simulated": self.simulated,
+                "accuracy": self.accuracy,
+                "current_generation": self.current_gen
+            })
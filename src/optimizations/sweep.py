@@ -0,0 +1,249 @@
+#!/usr/bin/python2
+
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import logging
+import time
+from collections import deque
+from threading import Thread, Condition, Event
+
+from utils import Observer, Observable
+
+
+class SweepChannel(Observable):
+    """
+    SweepChannel is the observable of one optimization of a sweep. It has the simulate interface of the
+    Client, but its requests are queued in the Sweep that shares the Client with the other channels.
+    """
+
+    WAIT_T = 0.5  # Maximum delay before handling an interruption while waiting for results
+
+    def __init__(self, sweep):
+        """
+        Class initialization
+        :param sweep: Sweep instance dispatching the requests
+        """
+
+        Observable.__init__(self)
+        self.sweep = sweep
+        self.rsp = []
+        self.pending = 0
+        self.done = Event()
+        self.interrupted = False
+
+    def simulate(self, sim_list):
+        """
+        Queue a simulation list in the sweep and wait for its results
+        :param sim_list: List of Dictionary containing simulation parameters
+        :return: List of Dictionary of the simulation results
+        """
+
+        self.rsp = [{} for _ in sim_list]
+        self.pending = len(sim_list)
+        self.done.clear()
+        if sim_list and not self.interrupted:
+            self.sweep.enqueue(self, sim_list)
+            while not self.done.wait(self.WAIT_T) and not self.interrupted:
+                pass
+        return self.rsp
+
+    def store(self, index, result):
+        """
+        Store the result of a simulation of the current list and notify the observers
+        :param index: Int index of the request in the simulation list
+        :param result: Dictionary of the simulation results
+        """
+
+        self.rsp[index] = result
+        self.notify_observers(**{"result": (index, result)})
+        self.pending -= 1
+        if self.pending <= 0:
+            self.done.set()
+
+    def interrupt(self):
+        """Stop waiting for results and notify the interruption to the observers"""
+
+        self.interrupted = True
+        self.notify_observers(**{"interruption": True})
+        self.done.set()
+
+
+class Sweep(Observer):
+    """
+    Sweep runs several optimizations at the same time on a shared Client or LocalExecutor. Every
+    optimization simulates through its own SweepChannel. The requests of the channels are submitted in
+    turn, one channel after the other, and no more requests than the simulation slots are in flight, so
+    every optimization progresses at the same pace.
+    Usage:
+                # Create the sweep on the client
+                sweep = Sweep(client)
+
+                # Run optimizations created with their channel
+                optimizations = [Genetic(opt, sweep.channel(), cross_over_rate=r) for r in rates]
+                durations = sweep.run(optimizations)
+
+                # Run 4 more generations of the first two optimizations
+                durations = sweep.run(optimizations[:2], "evolve_more", n_generations=4)
+    """
+
+    def __init__(self, observable):
+        """
+        Class initialization
+        :param observable: Client or LocalExecutor instance able to submit requests
+        """
+
+        Observer.__init__(self)
+        self.observable = observable
+        self.channels = []
+        self.queues = deque()  # Round of (channel, deque of (index, request)) with requests to submit
+        self.running = {}  # (channel, index) of the requests in flight, indexed by ticket
+        self.early = {}  # Results notified before their ticket was registered, indexed by ticket
+        self.cond = Condition()
+        self.terminated = False
+
+    def channel(self):
+        """
+        Create the channel of a new optimization
+        :return: SweepChannel instance
+        """
+
+        channel = SweepChannel(self)
+        self.channels.append(channel)
+        return channel
+
+    def capacity(self):
+        """
+        Return the number of requests kept in flight
+        :return: Int number of simulation slots of the observable
+        """
+
+        return max(self.observable.capacity(), 1)
+
+    def enqueue(self, channel, sim_list):
+        """
+        Queue the simulation list of a channel
+        :param channel: SweepChannel instance
+        :param sim_list: List of Dictionary containing simulation parameters
+        """
+
+        self.cond.acquire()
+        self.queues.append((channel, deque(enumerate(sim_list))))
+        self.cond.notify()
+        self.cond.release()
+
+    def update(self, **kwargs):
+        """
+        Retrieve the results of the requests submitted by the sweep
+        :param kwargs: Dictionary parameter used for update
+        """
+
+        if "async_result" in kwargs.keys():
+            ticket, result = kwargs["async_result"]
+            self.cond.acquire()
+            target = self.running.pop(ticket, None)
+            if target is None:
+                self.early[ticket] = result
+            self.cond.notify()
+            self.cond.release()
+            if target is not None:
+                target[0].store(target[1], result)
+        elif "interruption" in kwargs.keys() and kwargs["interruption"] is True:
+            self.stop()
+
+    def dispatch(self):
+        """Submit the queued requests in turn while simulation slots are free. Run by the sweep thread"""
+
+        self.cond.acquire()
+        while not self.terminated:
+            if not self.queues or len(self.running) >= self.capacity():
+                self.cond.wait(SweepChannel.WAIT_T)
+                continue
+
+            # Take one request of the next channel of the round
+            channel, requests = self.queues.popleft()
+            if channel.interrupted:
+                continue
+            index, rqt = requests.popleft()
+            if requests:
+                self.queues.append((channel, requests))
+            self.cond.release()
+            ticket = self.observable.submit(rqt)
+            self.cond.acquire()
+
+            result = self.early.pop(ticket, None)
+            if result is None:
+                self.running[ticket] = (channel, index)
+            else:
+                self.cond.release()
+                channel.store(index, result)
+                self.cond.acquire()
+        self.cond.release()
+
+    def run(self, optimizations, method="start", **kwargs):
+        """
+        Run optimizations until they are all finished
+        :param optimizations: List of Optimization instances created with a channel of this sweep
+        :param method: String name of the method of the optimizations to run
+        :param kwargs: Dictionary parameter passed to the method of the optimizations
+        :return: List of Float duration of every optimization in seconds
+        """
+
+        durations = [0. for _ in optimizations]
+
+        def run_optimization(i):
+            t_init = time.time()
+            try:
+                getattr(optimizations[i], method)(**kwargs)
+            except Exception as e:
+                logging.error("Exception in the optimization " + str(i) + " of the sweep:\n" + str(e))
+            durations[i] = time.time() - t_init
+
+        self.terminated = False
+        self.observable.add_observer(self)
+        dispatcher = Thread(target=self.dispatch)
+        dispatcher.daemon = True
+        dispatcher.start()
+        threads = [Thread(target=run_optimization, args=(i,)) for i in range(len(optimizations))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        # Wait for the optimizations and forward a user interruption
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(SweepChannel.WAIT_T)
+        except KeyboardInterrupt:
+            logging.warning("Sweep interrupted by user!")
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+        self.cond.acquire()
+        self.terminated = True
+        self.cond.notify()
+        self.cond.release()
+        dispatcher.join()
+        self.observable.remove_observer(self)
+        return durations
+
+    def stop(self):
+        """Interrupt every optimization of the sweep"""
+
+        for channel in self.channels:
+            channel.interrupt()
@@ -14,8 +14,6 @@
 # Modified by: Gabriel Urbain <gabriel.urbain@ugent.be>.
 ##
 
-import numpy as np
-
 from .matsuokaNeurons import MatsuokaNeurons
 
 from .synapse import Synapse
@@ -26,7 +24,7 @@ class ParallelOscillator:
         self.save = False
         self.config = config_
         self.neurons = []
-        self.rec = np.array(np.zeros((4, 1)))
+        self.rec = None  # Record of the outputs, created at the first saved update
         self.state = []
         for i in range(2):
             self.neurons.append(MatsuokaNeurons(self.config["neuron_config"],
@@ -52,6 +50,10 @@ class ParallelOscillator:
                 res.append([self.neurons[i].exitatingNeuron.y / 5.])
                 res.append([self.neurons[i].inhibitingNeuron.y / 5.])
         if self.save:
+            import numpy as np  # numpy is only needed to record the outputs
+
+            if self.rec is None:
+                self.rec = np.zeros((4, 1))
             res = np.array(res)
             self.rec = np.hstack((self.rec, res))
 
@@ -1,7 +1,8 @@
 import rpyc
 
-PROTOCOL_CONFIG = rpyc.core.protocol.DEFAULT_CONFIG
-rpyc.core.protocol.DEFAULT_CONFIG['allow_pickle'] = True
+# Requests and results are sent as encoded byte strings (see wire.py): pickling is not needed
+PROTOCOL_CONFIG = rpyc.core.protocol.DEFAULT_CONFIG.copy()
+PROTOCOL_CONFIG['allow_pickle'] = False
 
 from .registry import Registry
 from .servers import *
@@ -14,22 +14,27 @@
 #                  Dimitri Rodarie <d.rodarie@gmail.com>
 # February 2016
 ##
-import copy
 import logging
 import threading
 import time
-from threading import Thread, Lock
+from threading import Thread, Lock, Condition, Event
 
 import rpyc
 from rpyc.utils.factory import DiscoveryError
 from rpyc.utils.registry import UDPRegistryClient, REGISTRY_PORT
-from simulations import PROTOCOL_CONFIG
-from simulations import Registry
+from simulations import Registry, wire
 from utils import Observable
 
-from .connection import ServerInfo, SimulationRequest, Connexion
+from .connection import ServerInfo, SimulationRequest
+from .connectionPool import ConnectionPool
+from .inflight import InFlightTable
+from .resultCache import ResultCache, USE, OFF
+from .scheduler import Scheduler
 
-REQUESTS = {"Simulation": "simulation", "Test": "test"}
+ASYNC = -1  # Generation of the requests submitted one by one
+ITEM_KEYS = ("genome", "es_seed")  # Request values sent for every simulation of a batch, the others are shared
+
+REQUESTS = {"Simulation": "simulation", "Batch": "simulate_batch", "Test": "test"}
 
 
 class Client(Observable):
@@ -61,14 +66,15 @@ class Client(Observable):
         self.rsp = []
         self.cloud_state = dict()  # dictionary of server state on the cloud. Entries are server hashes
         self.server_list = []  # list of active servers
-        self.conn_list = []  # list of active RPYC connections
+        self.pools = dict()  # dictionary of persistent RPYC connection pools. Entries are server hashes
         # Server parameters
         self.simulator = opt["simulator"]
         self.ip_register = opt['register_ip'] if 'register_ip' in opt else None
         # Simulation client parameter
         self.rqt_n = 0
-        self.sim_prun_t = 0.1
-        self.mng_prun_t = 0.1
+        self.sim_prun_t = 0.1  # Maximum delay before handling a user interruption while waiting for results
+        self.mng_refresh_t = 1.  # Delay between two lookups for new servers when none is available
+        self.discovery_ttl = float(opt["discovery_ttl"]) if "discovery_ttl" in opt else 5.  # Cloud state lifetime
         self.mng_stop = False
         self.bg_async_threads = []
         self.reg_found = True
@@ -78,19 +84,58 @@ class Client(Observable):
         self.server_dispo = False
         self.t_sim_init = 0
         self.sim_time = 0
-        self.sim_timeout = opt["timeout"]
-        self.results = {}
+        self.sim_timeout = float(opt["timeout"])
+        self.inflight = InFlightTable()  # Requests sent to the servers and not answered yet
+        self.completed = set()  # Indexes of the simulations of the current generation that returned
+        self.generation = 0
+        self.scheduler = Scheduler()
+        # Results of the requests already simulated, shared between the runs when stored in a file
+        cache_file = opt["cache_file"] if "cache_file" in opt else \
+            (opt["root_dir"] + "/save/results.db" if "root_dir" in opt else None)
+        self.cache = ResultCache(cache_file, policy=opt["cache"] if "cache" in opt else USE)
+        self.aliases = {}  # Indexes of the identical requests waiting for a request, indexed by its index
         # Threading
         self.mutex_cloud_state = Lock()
-        self.mutex_conn_list = Lock()
+        self.mutex_pools = Lock()
         self.mutex_rsp = Lock()
         self.mutex_rqt = Lock()
-        self.mutex_res = Lock()
+        # Event-driven dispatching: the dispatcher sleeps on a condition until a request,
+        # a free slot or a stop order wakes it up. The end of a simulation batch is an event
+        self.dispatch_cond = Condition()
+        self.dispatch_flag = False
+        self.sim_done = Event()
+        self.pending = 0
+        # Requests submitted one by one: their results are notified as they arrive
+        self.ticket = 0
+        self.submitted = set()  # Tickets of the submitted requests without result
+        # Servers are checked when a deadline is reached or when a failure is reported
+        self.failures = {}  # Reason of the failure of the servers to check, indexed by server id
+        # Background discovery of the servers: the dispatcher only reads the cloud state
+        self.discovery_event = Event()
 
         self.thread = None
+        self.discovery_thread = None
         logging.debug("Sim Client initialization achieved. Number of active threads = " +
                       str(threading.active_count()))
 
+    def __discovery_loop(self):
+        """Refresh the cloud state in the background until the client is stopped. The registry is polled
+        every discovery_ttl seconds, or more often while no server is found."""
+
+        logging.info("Start Client discovery loop")
+        while not self.mng_stop:
+            try:
+                self.__refresh_cloud_state()
+            except Exception as e:
+                logging.error("Exception during server discovery: " + str(e))
+            self.discovery_event.wait(self.discovery_ttl if self.reg_found else self.mng_refresh_t)
+            self.discovery_event.clear()
+
+    def refresh_cloud_state(self):
+        """Ask the discovery thread to look for servers without waiting for the end of the TTL"""
+
+        self.discovery_event.set()
+
     def __refresh_cloud_state(self):
         """Refresh the cloud state list using the registry server"""
 
@@ -120,18 +165,26 @@ class Client(Observable):
         keys_cloud_state = set(self.cloud_state.keys())
 
         # Compare and update cloud_state set if needed
-        for elem in keys_serv_dict.difference(keys_cloud_state):
-            if len(self.rqt) > 0:
-                self.mutex_cloud_state.acquire()
-                self.cloud_state[elem] = serv_dict[elem]
-                self.cloud_state[elem].status = True
-                self.cloud_state[elem].nb_threads = 0
-                self.mutex_cloud_state.release()
+        new_servers = keys_serv_dict.difference(keys_cloud_state)
+        for elem in new_servers:
+            self.mutex_cloud_state.acquire()
+            self.cloud_state[elem] = serv_dict[elem]
+            self.cloud_state[elem].status = True
+            self.cloud_state[elem].nb_threads = 0
+            self.mutex_cloud_state.release()
 
-        for elem in keys_cloud_state.difference(keys_serv_dict):
+        lost_servers = keys_cloud_state.difference(keys_serv_dict)
+        for elem in lost_servers:
             self.mutex_cloud_state.acquire()
             self.cloud_state.pop(elem)
             self.mutex_cloud_state.release()
+            self.close_pool(elem)
+            self.scheduler.forget(elem)
+            # The simulations of the lost server are resent by the dispatcher
+            self.report_failure(elem, "Disconnection")
+
+        if new_servers:
+            self.wake_dispatcher()
 
         logging.debug("Server list " + str(self.server_list) + " cloud " + str(self.cloud_state))
 
@@ -141,24 +194,13 @@ class Client(Observable):
         :return: Int id of the best candidate, 0 if there is no good candidate
         """
 
-        # We check registry_server for new server (adding it as empty one)
-        self.__refresh_cloud_state()
-        logging.debug("List of registered simulation computers: " + str(self.server_list))
-
-        # We select an available server on the cloud_state list minimizing thread numbers
-        self.check_sim()
+        # The cloud state is kept up to date by the discovery thread, we work on a snapshot of it
         self.mutex_cloud_state.acquire()
-        # Select the server with the largest number of simulations available
-        cloud_list = self.cloud_state.items()
-        if len(self.cloud_state) >= 2:
-            cloud_list = sorted(cloud_list, key=lambda x: x[1].nb_threads, reverse=False)
-        for item in cloud_list:
-            key = item[0]
-            if self.cloud_state[key].status:
-                self.mutex_cloud_state.release()
-                return key
+        cloud_list = list(self.cloud_state.items())
         self.mutex_cloud_state.release()
-        return 0
+
+        # We select the available server that will return a result the soonest
+        return self.scheduler.select(cloud_list)
 
     @staticmethod
     def rpyc_casting(rsp):
@@ -169,10 +211,7 @@ class Client(Observable):
         """
 
         try:
-            cast = rsp.value
-            if not type(rsp.value) == str:
-                cast = eval(str(cast))
-            return cast
+            return wire.decode(rsp.value)
         except Exception as e:
             exception = "Impossible to cast the result. Exception:\n" + str(e)
             logging.error(exception)
@@ -184,29 +223,188 @@ class Client(Observable):
         :param rsp: rpyc response to process
         """
 
-        def function(server_id, rsp_):
+        def function(server_id, rsp_, simulations):
             """
             Function to process the simulation results
             :param server_id: Int Server id for the cloud
             :param rsp_: rpyc response to process
+            :param simulations: List of SimulationRequest answered by the response
             """
 
             # We add the rsp from the simulation to the rsp list
-            for simulation in self.results[server_id]:
-                if simulation.callback == rsp_:
-                    self.mutex_rsp.acquire()
-                    self.rsp[simulation.index] = copy.copy(self.rpyc_casting(rsp_))
-                    self.mutex_rsp.release()
-                    break
-
-            # Notify observer about the new result
-            self.notify_observers(**{"res": self.rsp})
+            for simulation in simulations:
+                result = self.rpyc_casting(rsp_)
+                if not self.handle_busy(server_id, simulation, result):
+                    self.store_result(server_id, simulation, result)
 
             # Decrease thread number in cloud_state dict
             self.mutex_cloud_state.acquire()
-            self.cloud_state[server_id].nb_threads -= 1
+            if server_id in self.cloud_state:  # The server may have been lost meanwhile
+                self.cloud_state[server_id].nb_threads -= len(simulations)
             self.mutex_cloud_state.release()
 
+            # A slot is free on the server
+            self.wake_dispatcher()
+
+        self.__process_callback(rsp, function)
+
+    def store_result(self, server_id, simulation, result):
+        """
+        Store the result of a simulation. When a simulation has been duplicated, the first result is kept.
+        :param server_id: Int Server id for the cloud
+        :param simulation: SimulationRequest that returned
+        :param result: Dictionary of the simulation results
+        :return: Boolean True if the result has been stored
+        """
+
+        if simulation.t_sent is not None:
+            self.scheduler.record(server_id, time.time() - simulation.t_sent)
+
+        # Keep the address of the server that simulated the request
+        server = self.cloud_state.get(server_id)
+        if isinstance(result, dict) and result and server is not None and "server" not in result:
+            result["server"] = str(server.address) + ":" + str(server.port)
+
+        if simulation.generation == ASYNC:
+            return self.store_submitted(simulation, result)
+
+        self.mutex_rsp.acquire()
+        stored = not self.is_done(simulation)
+        indexes = []
+        if stored:
+            # The identical requests of the list get the same result
+            indexes = [simulation.index] + self.aliases.pop(simulation.index, [])
+            for index in indexes:
+                self.rsp[index] = result
+                self.completed.add(index)
+            self.pending -= len(indexes)
+            if self.pending <= 0:
+                self.sim_done.set()
+        self.mutex_rsp.release()
+
+        if stored:
+            self.cache.put(simulation.cache_key, result)
+            # Notify observer about the new results only
+            for index in indexes:
+                self.notify_observers(**{"result": (index, result)})
+        else:
+            logging.debug("Simulation " + str(simulation.index) + " already returned, result dropped.")
+        return stored
+
+    def store_submitted(self, simulation, result):
+        """
+        Store the result of a request submitted alone and notify the observers
+        :param simulation: SimulationRequest that returned
+        :param result: Dictionary of the simulation results
+        :return: Boolean True if the result has been stored
+        """
+
+        self.mutex_rsp.acquire()
+        stored = simulation.index in self.submitted
+        self.submitted.discard(simulation.index)
+        self.mutex_rsp.release()
+
+        if stored:
+            self.cache.put(simulation.cache_key, result)
+            self.notify_observers(**{"async_result": (simulation.index, result)})
+        return stored
+
+    def handle_busy(self, server_id, simulation, result):
+        """
+        Send back to the request list a simulation refused by a busy server. The server is not used
+        again before the retry delay it advised.
+        :param server_id: Int Server id for the cloud
+        :param simulation: SimulationRequest that returned
+        :param result: Dictionary of the simulation results
+        :return: Boolean True if the server refused the simulation
+        """
+
+        if not isinstance(result, dict) or not result.get("busy", False):
+            return False
+
+        retry_after = float(result["retry_after"]) if "retry_after" in result else self.mng_refresh_t
+        self.mutex_cloud_state.acquire()
+        if server_id in self.cloud_state:
+            self.cloud_state[server_id].retry_at = time.time() + retry_after
+        self.mutex_cloud_state.release()
+        logging.warning("Server " + str(server_id) + " busy. Simulation " + str(simulation.index) +
+                        " resent, server retried in " + str(round(retry_after, 2)) + "s")
+
+        if not self.is_done(simulation):
+            self.mutex_rqt.acquire()
+            self.rqt.append(simulation.copy())
+            self.rqt_n += 1
+            self.mutex_rqt.release()
+        return True
+
+    def is_done(self, simulation):
+        """
+        Tell if a simulation does not need to run anymore
+        :param simulation: SimulationRequest to check
+        :return: Boolean True if its result is known or if it belongs to a previous generation
+        """
+
+        if simulation.generation == ASYNC:
+            return simulation.index not in self.submitted
+        return simulation.generation != self.generation or simulation.index in self.completed
+
+    def response_batch_item(self, server_id, generation, index, rsp):
+        """
+        Callback function called by a server when one simulation of a batch has finished
+        :param server_id: Int Server id for the cloud
+        :param generation: Int generation of the batch
+        :param index: Int index of the request in the response list
+        :param rsp: Tuple of (key, value) pairs of the simulation results
+        """
+
+        # Remove the request from the in-flight table
+        found = self.inflight.pop_item(server_id, generation, index)
+        if found is None:
+            logging.error("Result " + str(index) + " received from server " + str(server_id) +
+                          " does not match any running simulation.")
+            return
+
+        # We add the rsp from the simulation to the rsp list
+        try:
+            result = wire.decode(rsp)
+        except wire.WireError as e:
+            logging.error("Impossible to decode the result " + str(index) + ". Exception:\n" + str(e))
+            result = {}
+        if not self.handle_busy(server_id, found, result):
+            self.store_result(server_id, found, result)
+
+        # Decrease thread number in cloud_state dict
+        self.mutex_cloud_state.acquire()
+        if server_id in self.cloud_state:
+            self.cloud_state[server_id].nb_threads -= 1
+        self.mutex_cloud_state.release()
+
+        # A slot is free on the server
+        self.wake_dispatcher()
+
+    def response_simulate_batch(self, rsp):
+        """
+        Callback function called when a batch of simulations has finished
+        :param rsp: rpyc response to process
+        """
+
+        def function(server_id, rsp_, lost):
+            """
+            Function to send back to the request list the simulations of the batch without results
+            :param server_id: Int Server id for the cloud
+            :param rsp_: rpyc response to process
+            :param lost: List of SimulationRequest of the batch that did not return
+            """
+
+            if lost:
+                logging.error(str(len(lost)) + " simulation(s) of the batch returned no result. Resending them.")
+                self.requeue(lost)
+                self.mutex_cloud_state.acquire()
+                if server_id in self.cloud_state:  # The server may have been lost meanwhile
+                    self.cloud_state[server_id].nb_threads -= len(lost)
+                self.mutex_cloud_state.release()
+                self.wake_dispatcher()
+
         self.__process_callback(rsp, function)
 
     def response_test(self, rsp):
@@ -215,11 +413,12 @@ class Client(Observable):
         :param rsp: rpyc response to process
         """
 
-        def function(server_id, rsp_):
+        def function(server_id, rsp_, simulations):
             """
             Function to process the simulation test results
             :param server_id: Int Server id for the cloud
             :param rsp_: rpyc response to process
+            :param simulations: List of SimulationRequest answered by the response
             """
             rsp_cast = self.rpyc_casting(rsp_)
             if type(rsp_cast) == dict:
@@ -241,41 +440,58 @@ class Client(Observable):
         :param function: Function to process the simulation results
         """
 
-        if not rsp.error:
-            conn_found = False
-            for item in self.conn_list:
-                if rsp._conn.__hash__() == item.connexion.__hash__():  # The server has been requested from this client
-                    conn_found = True
-                    server_id = item.server_id
-                    if server_id in self.cloud_state:  # The server is still in the cloud
-                        function(server_id, rsp)
-                        logging.info("Response received from server " + str(self.cloud_state[server_id].address) +
-                                     ":" + str(self.cloud_state[server_id].port))
-
-                        # Remove clean simulation callback from the list
-                        self.del_clean_simulation(server_id, rsp)
-                    else:
-                        logging.error("Server " + str(server_id) +
-                                      " not in the list anymore. Please check connection to ensure simulation results.")
-                    # Close connection and listening thread
-                    # As soon as we stop the thread, the function is directly exited because the callback
-                    # function is handle by the thread itself
-
-                    logging.info("Deletion of connection: " + str(item.connexion.__hash__()))
-                    item.connexion.close()
-                    t = item.thread
-                    self.mutex_conn_list.acquire()
-                    self.conn_list.remove(item)
-                    self.mutex_conn_list.release()
-                    t._active = False
-                    break
+        # Find the requests and the pooled connection of the response
+        entry = self.inflight.pop_result(rsp)
+        if entry is None:
+            logging.error("Response not in the in-flight table anymore. Its simulations have already been resent.")
+            return
+        server_id, connexion, simulations = entry
 
-            # If no candidate in the list
-            if not conn_found:
-                logging.error("Connection " + str(rsp._conn.__hash__()) +
+        if not rsp.error:
+            if server_id in self.cloud_state:  # The server is still in the cloud
+                function(server_id, rsp, simulations)
+                logging.info("Response received from server " + str(self.cloud_state[server_id].address) +
+                             ":" + str(self.cloud_state[server_id].port))
+            else:
+                logging.error("Server " + str(server_id) +
                               " not in the list anymore. Please check connection to ensure simulation results.")
+                self.requeue(simulations)
         else:
             logging.error('Client.process_callback() : The simulation server return an exception\n')
+            self.requeue(simulations)
+            self.report_failure(server_id, "Error")
+
+        # The connection stays opened for the next requests
+        pool = self.pools.get(server_id)
+        if pool is not None:
+            pool.release(connexion)
+
+    def requeue(self, simulations):
+        """
+        Send back to the request list the simulations that still need a result
+        :param simulations: List of SimulationRequest to send again
+        """
+
+        self.mutex_rqt.acquire()
+        for simulation in simulations:
+            if not self.is_done(simulation):
+                simulation.callback = None
+                self.rqt.append(simulation.copy())
+                self.rqt_n += 1
+        self.mutex_rqt.release()
+        self.wake_dispatcher()
+
+    def report_failure(self, server_id, reason):
+        """
+        Ask the dispatcher to resend the simulations of a server that failed and to stop using it
+        :param server_id: Int Server id for the cloud
+        :param reason: String reason of the failure
+        """
+
+        self.mutex_cloud_state.acquire()
+        self.failures[server_id] = reason
+        self.mutex_cloud_state.release()
+        self.wake_dispatcher()
 
     def simulate(self, sim_list):
         """Perform synchronous simulation with the given list and return response list"""
@@ -283,33 +499,41 @@ class Client(Observable):
         # If rqt list is empty
         if not self.rqt:
 
+            # Look for the results in the cache. Identical requests are sent only once
+            hits, requests, aliases = self.cache.split(sim_list)
+
             # Create a request list and reset results
-            self.mutex_rqt.acquire()
-            for k, v in enumerate(sim_list):
-                self.rqt.append(SimulationRequest(v, k))
-            sim_n = len(sim_list)
-            self.rqt_n += sim_n
-            self.mutex_rqt.release()
+            self.sim_done.clear()
             self.mutex_rsp.acquire()
-            self.rsp = list()
-            for i in range(self.rqt_n):
-                self.rsp.append({})
+            self.generation += 1
+            self.completed = set(k for k, result in hits)
+            self.aliases = aliases
+            self.rsp = [{} for _ in sim_list]
+            for k, result in hits:
+                self.rsp[k] = result
+            self.pending = len(sim_list) - len(hits)
+            if self.pending <= 0:
+                self.sim_done.set()
             self.mutex_rsp.release()
-            # Check for simulation and interrupt when processed or interrupted
+            for k, result in hits:
+                self.notify_observers(**{"result": (k, result)})
+            self.mutex_rqt.acquire()
+            for k, v, key in requests:
+                self.rqt.append(SimulationRequest(v, k, generation=self.generation, cache_key=key))
+            self.rqt_n += len(requests)
+            self.mutex_rqt.release()
+            self.wake_dispatcher()
+
+            # Wait for the completion event and interrupt when processed or interrupted
             to = 0
             to_init = 0
-            simulation_running = True
-            time.sleep(1)
-            while (self.rqt or simulation_running) and not self.terminated and to < self.interrupt_to:
-                simulation_running = False
-                for result in self.results.values():
-                    if len(result) != 0:
-                        simulation_running = True
-                        break
+            while not self.sim_done.is_set() and not self.terminated and to < self.interrupt_to:
                 if self.interrupted:
                     to = time.time() - to_init
                 try:
-                    time.sleep(self.sim_prun_t)
+                    # A timed wait returns as soon as the event is set and lets Python handle
+                    # the user interruptions in the meantime
+                    self.sim_done.wait(self.sim_prun_t)
                 except KeyboardInterrupt:
                     logging.warning("Simulation interrupted by user!")
                     self.notify_observers(**{"interruption": True})
@@ -324,14 +548,106 @@ class Client(Observable):
                           " simulation. Try again later")
             return 0
 
+    def submit(self, rqt):
+        """
+        Send a simulation request without waiting for its result. The result is notified to the observers
+        as an "async_result" (ticket, result) pair.
+        :param rqt: Dictionary containing simulation parameters
+        :return: Int ticket of the request
+        """
+
+        self.mutex_rsp.acquire()
+        self.ticket += 1
+        ticket = self.ticket
+        self.mutex_rsp.release()
+
+        key = self.cache.key(rqt) if self.cache.policy != OFF else None
+        result = self.cache.get(key) if key is not None else None
+        if result is not None:
+            self.notify_observers(**{"async_result": (ticket, result)})
+            return ticket
+
+        self.mutex_rsp.acquire()
+        self.submitted.add(ticket)
+        self.mutex_rsp.release()
+        self.mutex_rqt.acquire()
+        self.rqt.append(SimulationRequest(rqt, ticket, generation=ASYNC, cache_key=key))
+        self.rqt_n += 1
+        self.mutex_rqt.release()
+        self.wake_dispatcher()
+        return ticket
+
+    def capacity(self):
+        """
+        Return the number of simulations the cloud can run in parallel
+        :return: Int number of simulation slots of the available servers
+        """
+
+        self.mutex_cloud_state.acquire()
+        capacity = sum(int(server.max_threads) for server in self.cloud_state.values() if server.status)
+        self.mutex_cloud_state.release()
+        return capacity
+
+    def wake_dispatcher(self):
+        """Wake the dispatching loop up. Called when a request, a free slot or a stop order is available"""
+
+        self.dispatch_cond.acquire()
+        self.dispatch_flag = True
+        self.dispatch_cond.notify_all()
+        self.dispatch_cond.release()
+
+    def __wait_dispatcher(self, timeout=None):
+        """
+        Block the dispatching loop until it is woken up or until the timeout expires
+        :param timeout: Float maximum waiting time in seconds, None to wait for a wake up
+        """
+
+        self.dispatch_cond.acquire()
+        if not self.dispatch_flag and not self.mng_stop:
+            self.dispatch_cond.wait(timeout)
+        self.dispatch_flag = False
+        self.dispatch_cond.release()
+
+    def __check_delay(self):
+        """
+        Return the delay before the next check of the running simulations
+        :return: Float delay in seconds, None if no simulation is running
+        """
+
+        deadline = self.inflight.next_deadline()
+        if deadline is None:
+            return None
+        return max(deadline - time.time(), 0.)
+
+    def __retry_delay(self):
+        """
+        Return the delay before a busy server can receive requests again
+        :return: Float delay in seconds, None if no server is waiting
+        """
+
+        now = time.time()
+        self.mutex_cloud_state.acquire()
+        delays = [server.retry_at - now for server in self.cloud_state.values() if server.retry_at > now]
+        self.mutex_cloud_state.release()
+        return max(min(delays), 0.) if delays else None
+
     def stop(self):
         """Stop the simulation client"""
 
         # Stop managing loop
         self.mng_stop = True
         self.sim_time = time.time() - self.t_sim_init
+        self.wake_dispatcher()
+        self.discovery_event.set()
         if self.thread and self.thread.is_alive():
             self.thread.join()
+        if self.discovery_thread and self.discovery_thread.is_alive():
+            self.discovery_thread.join()
+
+        # Close the persistent connections
+        for server_id in list(self.pools.keys()):
+            self.close_pool(server_id)
+        self.cache.close()
 
     def start(self):
         """Start a simulation client"""
@@ -340,17 +656,27 @@ class Client(Observable):
         self.t_sim_init = time.time()
         self.terminated = False
         self.mng_stop = False
+        self.discovery_event.clear()
+        self.discovery_thread = Thread(target=self.__discovery_loop)
+        self.discovery_thread.setDaemon(True)
+        self.discovery_thread.start()
         self.thread = Thread(target=self.run)
         self.thread.start()
 
     def run(self):
         """Run the client loop. Check rqt stack for simulation request. Select the candidate \
-        server for simulation. Start simulation."""
+        server for simulation. Start simulation. The loop sleeps until it is woken up by a new request,
+        a simulation result or a stop order."""
 
         logging.info("Start Client main loop")
         # Continue while not asked for termination or when there are candidates in the list
         # and a server to process them
         while not self.mng_stop:
+            # Check the running simulations only when a server failed or a deadline is reached
+            deadline = self.inflight.next_deadline()
+            if self.failures or (deadline is not None and time.time() >= deadline):
+                self.check_sim()
+
             if self.rqt:
                 # Select a candidate server
                 server_hash = self.__select_candidate()
@@ -358,8 +684,10 @@ class Client(Observable):
                 if server_hash != 0:
                     # We found a server
                     self.server_dispo = True
+                    batch = []
                     try:
-                        self.request_server(server_hash, self.cloud_state[server_hash], self.rqt[-1], "Simulation")
+                        batch = self.build_batch(server_hash, self.cloud_state[server_hash])
+                        self.request_batch(server_hash, self.cloud_state[server_hash], batch)
                     except EOFError as eo:
                         # Connection reset by peer
                         logging.error("Unexpected disconnection from the server " +
@@ -373,144 +701,259 @@ class Client(Observable):
                     if self.server_dispo:
                         # Update the cloud_state list
                         self.mutex_cloud_state.acquire()
-                        self.cloud_state[server_hash].nb_threads += 1
+                        if server_hash in self.cloud_state:
+                            self.cloud_state[server_hash].nb_threads += len(batch)
                         self.mutex_cloud_state.release()
 
-                        # Clear request from list:
+                        # Clear requests from list:
                         self.mutex_rqt.acquire()
-                        self.rqt.pop()
-                        self.rqt_n -= 1
+                        for rqt in batch:
+                            self.rqt.remove(rqt)
+                        self.rqt_n -= len(batch)
                         self.mutex_rqt.release()
                 else:
+                    # No server available: wait for a free slot, a new server, the end of a retry delay
+                    # or the next simulation to expire
                     self.server_dispo = False
-                    time.sleep(self.mng_prun_t)
+                    delays = [d for d in (self.__check_delay(), self.__retry_delay()) if d is not None]
+                    self.__wait_dispatcher(min(delays) if delays else None)
+            elif (self.pending > 0 or self.submitted) and self.dispatch_backups():
+                # Straggling simulations have been duplicated on idle servers
+                continue
             else:
-                time.sleep(self.mng_prun_t)
+                # Nothing to dispatch: wait for new requests or for the next running simulation to expire
+                self.__wait_dispatcher(self.__check_delay())
 
         self.terminated = True
+        self.sim_done.set()
 
-    def del_clean_simulation(self, server_hash, res):
+    def check_sim(self):
         """
-        Remove a clean simulation result from the result array
-        :param server_hash: Int Server id for the cloud
-        :param res: rpyc response to process
+        Resend the simulations of the servers that failed or whose requests expired
+        and update the state of these servers
         """
 
-        if server_hash in self.results:
-            server = self.results[server_hash]
-            for simulation in server:
-                if res == simulation.callback and res.ready:
-                    for key, sim_ in enumerate(self.results[server_hash]):
-                        if sim_.index == simulation.index:
-                            self.mutex_res.acquire()
-                            del self.results[server_hash][key]
-                            self.mutex_res.release()
-                            break
-                    break
+        # Servers with an expired request
+        failures = dict((server_hash, "Timeout") for server_hash in self.inflight.expired(time.time()))
+        self.mutex_cloud_state.acquire()
+        failures.update(self.failures)
+        self.failures = {}
+        self.mutex_cloud_state.release()
 
-    def check_sim(self):
+        for server_hash, reason in failures.items():
+            # Add the request sent to the server to the request list
+            simulations = self.inflight.pop_server(server_hash)
+            if simulations:
+                logging.error(reason + " of server " + str(server_hash) + ". Resending its " +
+                              str(len(simulations)) + " simulation(s).")
+                self.requeue(simulations)
+
+            if server_hash in self.cloud_state:
+                self.mutex_cloud_state.acquire()
+                # The server won't be use for simulation anymore.
+                logging.error(reason + " from server: " +
+                              str(self.cloud_state[server_hash].address) + ":" +
+                              str(self.cloud_state[server_hash].port))
+                self.cloud_state[server_hash].status = False
+                self.mutex_cloud_state.release()
+                self.close_pool(server_hash)
+
+    def get_pool(self, server_id, server):
         """
-        Check if simulations have not timeout or returned errors
-        If so, retrieve all the requests of the broken server, add
-        them to the request list and update the state of the server
+        Return the connection pool of a server. The pool is created on the first request and sized to
+        the number of simulations the server can run in parallel.
+        :param server_id: Int Server id for the cloud
+        :param server: ServerInfo of the server
+        :return: ConnectionPool of the server
         """
 
-        for server_hash, simulations in self.results.items():
-            # For every server, we check its current simulation
-            clean = True
-            reason = ""
-            for simulation in simulations:
-                result = simulation.callback
-                if result.expired or result.error:
-                    reason = "Timeout" if result.expired else "Error"
-                    clean = False
-                    break
-            # If one of the simulation returned an error or a timeout
-            if not clean:
-                self.mutex_rqt.acquire()
-                # Add the request sent to the server to the request list
-                for simulation in simulations:
-                    simulation.callback = None
-                    self.rqt.append(simulation.copy())
-                    self.rqt_n += 1
-                self.mutex_rqt.release()
-
-                if server_hash in self.cloud_state:
-                    self.mutex_cloud_state.acquire()
-                    # The server won't be use for simulation anymore.
-                    logging.error(reason + " from server: " +
-                                  str(self.cloud_state[server_hash].address) + ":" +
-                                  str(self.cloud_state[server_hash].port))
-                    self.cloud_state[server_hash].status = False
-                    self.mutex_cloud_state.release()
-                    for connection in self.conn_list:
-                        if connection.server_id == server_hash:
-                            self.mutex_conn_list.acquire()
-                            connection.connexion.close()
-                            del connection
-                            self.mutex_conn_list.release()
-                            break
-
-                self.mutex_res.acquire()
-                del self.results[server_hash]
-                self.mutex_res.release()
+        self.mutex_pools.acquire()
+        try:
+            if server_id not in self.pools:
+                pool = ConnectionPool(server_id, server, server.max_threads, REQUESTS.values())
+                # Connect once to know the server capacity
+                pool.release(pool.acquire())
+                self.pools[server_id] = pool
+                logging.info("Connected to server " + str(server.address) + ":" + str(server.port) +
+                             " with " + str(server.max_threads) + " simulation slot(s)")
+            return self.pools[server_id]
+        finally:
+            self.mutex_pools.release()
+
+    def close_pool(self, server_id):
+        """
+        Close every connection to a server
+        :param server_id: Int Server id for the cloud
+        """
+
+        self.mutex_pools.acquire()
+        pool = self.pools.pop(server_id, None)
+        self.mutex_pools.release()
+        if pool is not None:
+            pool.close()
 
     def request_server(self, server_id, server, rqt, service):
-        """Create a connexion to a server and send a request for a service
+        """Send a request for a service to a server through its connection pool
         Raise Exception if an error occurred."""
 
-        # Connect to the server
-        try:
-            conn = rpyc.connect(server.address,
-                                server.port, config=PROTOCOL_CONFIG)
-        except Exception as e:
-            exception = "Exception when connecting: " + str(e)
+        if service not in REQUESTS:
+            exception = "Client.request_server: Service unhandled by the client"
+            logging.error(exception)
             raise Exception(exception)
 
-        # Create serving thread to handle answer
+        # Get a pooled connection to the server
+        pool = self.get_pool(server_id, server)
+        connexion = pool.acquire()
+
+        # Create asynchronous handle
+        logging.info("Starting " + REQUESTS[service] + " service on server: " +
+                     str(server.address) + ":" +
+                     str(server.port))
+        callback = getattr(self, "response_" + REQUESTS[service])
         try:
-            bgt = rpyc.BgServingThread(conn)
+            res = connexion.request(REQUESTS[service])(wire.encode(rqt.rqt))
+            res.set_expiry(self.sim_timeout)
+            rqt.t_sent = time.time()
+            rqt.deadline = rqt.t_sent + self.sim_timeout
+            rqt.callback = res
+        except EOFError:
+            pool.discard(connexion)
+            raise
         except Exception as e:
-            exception = "Exception in serving thread: " + str(e)
+            exception = "Exception from server: " + str(e)
             logging.error(exception)
-            conn.close()
+            pool.release(connexion)
             raise Exception(exception)
 
-        self.mutex_conn_list.acquire()
-        self.conn_list.append(Connexion(server_id, conn, bgt))
-        self.mutex_conn_list.release()
+        # Add the request to the in-flight table to be handled after
+        self.inflight.add(server_id, connexion, res, [rqt])
 
-        # Create asynchronous handle
-        if service in REQUESTS:
-            logging.info("Starting " + REQUESTS[service] + " service on server: " +
-                         str(server.address) + ":" +
-                         str(server.port))
-            async_simulation = rpyc.async(eval("conn.root.exposed_" + REQUESTS[service]))
-            callback = eval("self.response_" + REQUESTS[service])
-        else:
-            exception = "Client.request_server: Service unhandled by the client"
-            logging.error(exception)
-            conn.close()
-            bgt._active = False
-            raise Exception(exception)
+        # Assign asynchronous callback once the request is registered
+        res.add_callback(callback)
+
+    @staticmethod
+    def split_request(rqt):
+        """
+        Split a simulation request into its shared configuration and its own values: the genome or
+        the noise seed of an evolution strategy
+        :param rqt: Dictionary containing simulation parameters
+        :return: Tuple of (key, value) pairs of the configuration and Tuple of (key, value) pairs of the request
+        """
+
+        base = tuple(sorted((k, v) for k, v in rqt.items() if k not in ITEM_KEYS))
+        values = tuple((k, tuple(rqt[k]) if k == "genome" else rqt[k]) for k in ITEM_KEYS
+                       if k in rqt and rqt[k] is not None)
+        return base, values
+
+    def build_batch(self, server_id, server):
+        """
+        Group the pending requests that share the same configuration, as many as the server has free slots
+        :param server_id: Int Server id for the cloud
+        :param server: ServerInfo of the server
+        :return: List of SimulationRequest to send in a batch
+        """
+
+        # The server capacity is known once connected
+        self.get_pool(server_id, server)
+        free_slots = max(int(server.max_threads) - server.nb_threads, 1)
+
+        batch = []
+        base = None
+        self.mutex_rqt.acquire()
+        for rqt in reversed(self.rqt):
+            rqt_base = self.split_request(rqt.rqt)[0]
+            if base is None:
+                base = rqt_base
+            # The results of a batch are matched with the generation of its first request
+            if rqt_base == base and (not batch or rqt.generation == batch[0].generation):
+                batch.append(rqt)
+                if len(batch) >= free_slots:
+                    break
+        self.mutex_rqt.release()
+        return batch
 
+    def request_batch(self, server_id, server, batch):
+        """Send a batch of simulation requests sharing the same configuration to a server.
+        Results are streamed back one at a time.
+        Raise Exception if an error occurred."""
+
+        base = self.split_request(batch[0].rqt)[0]
+        items = tuple((rqt.index, self.split_request(rqt.rqt)[1]) for rqt in batch)
+
+        generation = batch[0].generation
+
+        def item_callback(index, rsp):
+            """Stream callback of the batch"""
+            self.response_batch_item(server_id, generation, index, rsp)
+
+        # Get a pooled connection to the server
+        pool = self.get_pool(server_id, server)
+        connexion = pool.acquire()
+
+        logging.info("Starting " + REQUESTS["Batch"] + " service with " + str(len(batch)) +
+                     " simulation(s) on server: " + str(server.address) + ":" + str(server.port))
         try:
-            res = async_simulation(rqt.rqt)
+            res = connexion.request(REQUESTS["Batch"])(items, wire.encode(dict(base)), item_callback)
             res.set_expiry(self.sim_timeout)
-
-            # Assign asynchronous callback
-            res.add_callback(callback)
-            rqt.callback = res
+        except EOFError:
+            pool.discard(connexion)
+            raise
         except Exception as e:
             exception = "Exception from server: " + str(e)
             logging.error(exception)
-            conn.close()
-            bgt._active = False
+            pool.release(connexion)
             raise Exception(exception)
 
-        # Add result to the result list to be handled after
-        self.mutex_res.acquire()
-        if server_id not in self.results:
-            self.results[server_id] = []
-        self.results[server_id].append(rqt)
-        self.mutex_res.release()
+        # Add the requests to the in-flight table to be handled after
+        t_sent = time.time()
+        for rqt in batch:
+            rqt.callback = res
+            rqt.t_sent = t_sent
+            rqt.deadline = t_sent + self.sim_timeout
+        self.inflight.add(server_id, connexion, res, batch)
+
+        # Assign asynchronous callback once the requests are registered
+        res.add_callback(self.response_simulate_batch)
+
+    def dispatch_backups(self):
+        """
+        Duplicate the simulations still running on slow servers on the idle servers once every request
+        has been dispatched. The first result to arrive is kept.
+        :return: Boolean True if simulations have been duplicated
+        """
+
+        self.mutex_cloud_state.acquire()
+        cloud_list = list(self.cloud_state.items())
+        self.mutex_cloud_state.release()
+        server_hash = self.scheduler.select(cloud_list)
+        if server_hash == 0:
+            return False
+
+        server = self.cloud_state[server_hash]
+        stragglers = self.scheduler.stragglers(server_hash, self.inflight.running(), self.is_done,
+                                               max(server.max_threads - server.nb_threads, 1))
+        if not stragglers:
+            return False
+
+        # Backups must share the same configuration and generation to be sent in a single batch
+        base = self.split_request(stragglers[0].rqt)[0]
+        batch = []
+        for simulation in stragglers:
+            if self.split_request(simulation.rqt)[0] == base and simulation.generation == stragglers[0].generation:
+                backup = simulation.copy()
+                backup.callback = None
+                backup.backup = True
+                batch.append(backup)
+
+        logging.info("Duplicating " + str(len(batch)) + " straggling simulation(s) on server " +
+                     str(server.address) + ":" + str(server.port))
+        try:
+            self.request_batch(server_hash, server, batch)
+        except Exception as e:
+            logging.error("Backup simulations not sent: " + str(e))
+            return False
+
+        self.mutex_cloud_state.acquire()
+        server.nb_threads += len(batch)
+        self.mutex_cloud_state.release()
+        return True
@@ -15,16 +15,26 @@
 # June 2016
 ##
 import copy
+import time
+
+import rpyc
 
 
 class SimulationRequest:
-    def __init__(self, rqt, index, callback=None):
+    def __init__(self, rqt, index, callback=None, deadline=None, generation=0, backup=False, cache_key=None):
         self.rqt = rqt
         self.index = index
         self.callback = callback
+        self.deadline = deadline  # Time at which the simulation expires once sent to a server
+        self.t_sent = None  # Time at which the simulation was sent to a server
+        self.generation = generation  # Call to Client.simulate the request belongs to
+        self.backup = backup  # True if the request duplicates a straggling simulation
+        self.request_id = None  # Id given by the in-flight table once sent to a server
+        self.cache_key = cache_key  # Key of the request in the result cache
 
     def copy(self):
-        return SimulationRequest(self.rqt, self.index, copy.copy(self.callback))
+        return SimulationRequest(self.rqt, self.index, copy.copy(self.callback), generation=self.generation,
+                                 cache_key=self.cache_key)
 
 
 class Connexion:
@@ -32,11 +42,27 @@ class Connexion:
         self.server_id = server_id
         self.connexion = connexion
         self.thread = thread
+        self.in_flight = 0  # Number of requests waiting for a reply on this connection
+        self.last_used = time.time()
+        self.services = {}
+
+    def request(self, service):
+        """
+        Return the asynchronous proxy of a service exposed by the server. The proxy is created once per connection.
+        :param service: String name of the service without the exposed_ prefix
+        :return: rpyc asynchronous function
+        """
+
+        if service not in self.services:
+            self.services[service] = rpyc.async(getattr(self.connexion.root, "exposed_" + service))
+        return self.services[service]
 
 
 class ServerInfo:
-    def __init__(self, address, port, nb_threads=0, status=False):
+    def __init__(self, address, port, nb_threads=0, status=False, max_threads=1):
         self.address = address
         self.port = port
         self.nb_threads = nb_threads
         self.status = status
+        self.max_threads = max_threads
+        self.retry_at = 0  # Time before which the server asked not to receive new requests
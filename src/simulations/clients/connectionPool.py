@@ -0,0 +1,260 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import logging
+import time
+from threading import Lock, Thread
+
+import rpyc
+from simulations import PROTOCOL_CONFIG
+
+from .connection import Connexion
+
+
+class ServingThread:
+    """
+    Serve the replies of a pooled connection in the background. Unlike rpyc.BgServingThread, the thread
+    blocks on the connection socket instead of sleeping between two polls, so a result is processed as soon as
+    it arrives.
+    """
+
+    SERVE_TIMEOUT = 1.
+
+    def __init__(self, conn):
+        """
+        Class initialization
+        :param conn: rpyc Connection to serve
+        """
+
+        self._conn = conn
+        self._active = True
+        self._thread = Thread(target=self.run)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def run(self):
+        """Serve the connection until it is closed or the thread stopped"""
+
+        try:
+            while self._active and not self._conn.closed:
+                self._conn.serve(self.SERVE_TIMEOUT)
+        except (EOFError, IOError, ValueError) as e:
+            if self._active:
+                logging.warning("Pooled connection lost: " + str(e))
+        self._active = False
+
+    def is_alive(self):
+        """
+        Tell if the connection is still served
+        :return: Boolean True if the thread is serving the connection
+        """
+
+        return self._active and self._thread.is_alive()
+
+    def stop(self):
+        """Stop serving the connection"""
+
+        self._active = False
+
+
+class ConnectionPool:
+    """
+    ConnectionPool keeps persistent rpyc connections to a simulation server. The pool is sized to the server
+    number of simulation slots and the asynchronous requests are multiplexed over the pooled connections,
+    so no TCP handshake and no thread creation are needed for each simulation.
+    Usage:
+            # Create the pool of a server
+            pool = ConnectionPool(server_id, server_info)
+
+            # Get a connection, send requests on it and give it back when a result arrived
+            connexion = pool.acquire()
+            res = connexion.request("simulation")(opt)
+            pool.release(connexion)
+
+            # Close every connection of the pool
+            pool.close()
+    """
+
+    HEALTH_CHECK_T = 30.  # Idle delay after which a connection is pinged before being reused
+    PING_TIMEOUT = 3.
+
+    def __init__(self, server_id, server, size=1, services=()):
+        """
+        Class initialization
+        :param server_id: Int server id for the cloud
+        :param server: ServerInfo of the server to connect to
+        :param size: Int maximum number of connections in the pool. It is updated with the server capacity.
+        :param services: List of String names of the services that will be requested on the connections
+        """
+
+        self.server_id = server_id
+        self.server = server
+        self.size = max(int(size), 1)
+        self.services = services
+        self.connexions = {}  # Pooled Connexion instances indexed by rpyc connection hash
+        self.mutex = Lock()
+
+    def __connect(self):
+        """
+        Open a new connection to the server and start serving its replies
+        Raise Exception if the connection failed
+        :return: Connexion created
+        """
+
+        try:
+            conn = rpyc.connect(self.server.address, self.server.port, config=PROTOCOL_CONFIG)
+        except Exception as e:
+            raise Exception("Exception when connecting: " + str(e))
+
+        # Synchronous requests are done before the serving thread takes the connection over
+        connexion = Connexion(self.server_id, conn)
+        try:
+            self.server.max_threads = int(conn.root.capacity())
+            self.size = max(self.server.max_threads, 1)
+        except AttributeError:
+            logging.debug("Server " + str(self.server.address) + ":" + str(self.server.port) +
+                          " does not expose its capacity")
+        try:
+            for service in self.services:
+                connexion.request(service)
+            connexion.thread = ServingThread(conn)
+        except Exception as e:
+            exception = "Exception in serving thread: " + str(e)
+            logging.error(exception)
+            conn.close()
+            raise Exception(exception)
+
+        logging.info("New pooled connection " + str(conn.__hash__()) + " to server " + str(self.server.address) + ":" +
+                     str(self.server.port) + " (" + str(len(self.connexions) + 1) + "/" + str(self.size) + ")")
+        return connexion
+
+    def __is_healthy(self, connexion):
+        """
+        Check a connection before reusing it. Idle connections are pinged.
+        :param connexion: Connexion to check
+        :return: Boolean True if the connection can be used
+        """
+
+        if connexion.connexion.closed or not connexion.thread.is_alive():
+            return False
+        if connexion.in_flight == 0 and time.time() - connexion.last_used > self.HEALTH_CHECK_T:
+            try:
+                connexion.connexion.ping(timeout=self.PING_TIMEOUT)
+            except Exception as e:
+                logging.warning("Health check failed on connection " + str(connexion.connexion.__hash__()) + ": " + str(e))
+                return False
+        return True
+
+    def resize(self, size):
+        """
+        Change the maximum number of connections of the pool
+        :param size: Int new size of the pool
+        """
+
+        self.size = max(int(size), 1)
+
+    def acquire(self):
+        """
+        Return the least loaded healthy connection of the pool. A new connection is opened when every
+        connection is busy and the pool is not full. Broken connections are replaced.
+        Raise Exception if no connection could be opened
+        :return: Connexion to send a request on
+        """
+
+        self.mutex.acquire()
+        try:
+            for key, connexion in list(self.connexions.items()):
+                if not self.__is_healthy(connexion):
+                    self.__drop(key)
+
+            candidate = None
+            if self.connexions:
+                candidate = min(self.connexions.values(), key=lambda x: x.in_flight)
+            if candidate is None or (candidate.in_flight > 0 and len(self.connexions) < self.size):
+                candidate = self.__connect()
+                self.connexions[candidate.connexion.__hash__()] = candidate
+
+            candidate.in_flight += 1
+            candidate.last_used = time.time()
+            return candidate
+        finally:
+            self.mutex.release()
+
+    def release(self, connexion):
+        """
+        Give a connection back to the pool once a reply has been received on it
+        :param connexion: Connexion to release
+        """
+
+        self.mutex.acquire()
+        connexion.in_flight = max(connexion.in_flight - 1, 0)
+        connexion.last_used = time.time()
+        self.mutex.release()
+
+    def find(self, conn):
+        """
+        Retrieve the pooled connection of a rpyc connection
+        :param conn: rpyc Connection or a weak proxy on it, as found in asynchronous results
+        :return: Connexion of the pool, None if the connection is not pooled here
+        """
+
+        return self.connexions.get(conn.__hash__())
+
+    def discard(self, connexion):
+        """
+        Close a broken connection and remove it from the pool. It will be replaced on the next acquire.
+        :param connexion: Connexion to discard
+        """
+
+        self.mutex.acquire()
+        self.__drop(connexion.connexion.__hash__())
+        self.mutex.release()
+
+    def __drop(self, key):
+        """
+        Close a connection and remove it from the pool (the pool mutex must be held)
+        :param key: Int hash of the rpyc connection
+        """
+
+        connexion = self.connexions.pop(key, None)
+        if connexion is not None:
+            logging.info("Deletion of connection: " + str(key))
+            connexion.thread.stop()
+            try:
+                connexion.connexion.close()
+            except Exception as e:
+                logging.debug("Error while closing connection " + str(key) + ": " + str(e))
+
+    def close(self):
+        """Close every connection of the pool"""
+
+        self.mutex.acquire()
+        for key in list(self.connexions.keys()):
+            self.__drop(key)
+        self.mutex.release()
+
+    def __len__(self):
+        """Return the number of opened connections"""
+
+        return len(self.connexions)
+
+    def __repr__(self):
+        """Return a short description of the pool state"""
+
+        return "ConnectionPool(" + str(self.server.address) + ":" + str(self.server.port) + ", " + \
+               str(len(self.connexions)) + "/" + str(self.size) + " connection(s), " + \
+               str(sum(c.in_flight for c in self.connexions.values())) + " request(s) in flight)"
@@ -0,0 +1,194 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import heapq
+import itertools
+from threading import Lock
+
+
+class InFlightTable:
+    """
+    InFlightTable keeps the simulation requests sent to the servers and not answered yet. The requests are indexed by
+    request id, by asynchronous result, by server and by simulation index, so a reply is matched with its request in
+    constant time. The deadlines are kept in a heap to find the expired requests without scanning the table.
+    Usage:
+            # Register the requests sent with an asynchronous result
+            table = InFlightTable()
+            table.add(server_id, connexion, res, [rqt_1, rqt_2])
+
+            # Remove a request answered on its own, then the remaining requests of a result
+            rqt = table.pop_item(server_id, generation, index)
+            server_id, connexion, requests = table.pop_result(res)
+
+            # Find the servers with expired requests
+            servers = table.expired(time.time())
+    """
+
+    def __init__(self):
+        """Class initialization"""
+
+        self.requests = {}  # SimulationRequest indexed by request id
+        self.servers = {}  # Server id of every request, indexed by request id
+        self.results = {}  # (server id, Connexion, set of request ids) indexed by asynchronous result
+        self.by_result = {}  # Asynchronous result of every request, indexed by request id
+        self.by_server = {}  # Set of request ids indexed by server id
+        self.by_item = {}  # Request id indexed by (server id, generation, simulation index)
+        self.deadlines = []  # Heap of (deadline, request id)
+        self.ids = itertools.count(1)
+        self.mutex = Lock()
+
+    def add(self, server_id, connexion, result, requests):
+        """
+        Register requests sent to a server
+        :param server_id: Int Server id for the cloud
+        :param connexion: Connexion the requests were sent on
+        :param result: rpyc asynchronous result of the requests
+        :param requests: List of SimulationRequest sent
+        """
+
+        self.mutex.acquire()
+        ids = set()
+        for rqt in requests:
+            rqt.request_id = next(self.ids)
+            ids.add(rqt.request_id)
+            self.requests[rqt.request_id] = rqt
+            self.servers[rqt.request_id] = server_id
+            self.by_result[rqt.request_id] = result
+            self.by_server.setdefault(server_id, set()).add(rqt.request_id)
+            self.by_item[(server_id, rqt.generation, rqt.index)] = rqt.request_id
+            if rqt.deadline is not None:
+                heapq.heappush(self.deadlines, (rqt.deadline, rqt.request_id))
+        self.results[result] = (server_id, connexion, ids)
+        self.mutex.release()
+
+    def __remove(self, request_id):
+        """
+        Remove a request from every index except the heap, where it is skipped later (the mutex must be held)
+        :param request_id: Int id of the request
+        :return: SimulationRequest removed
+        """
+
+        rqt = self.requests.pop(request_id)
+        server_id = self.servers.pop(request_id)
+        result = self.by_result.pop(request_id)
+        if result in self.results:
+            self.results[result][2].discard(request_id)
+        self.by_server[server_id].discard(request_id)
+        if not self.by_server[server_id]:
+            del self.by_server[server_id]
+        if self.by_item.get((server_id, rqt.generation, rqt.index)) == request_id:
+            del self.by_item[(server_id, rqt.generation, rqt.index)]
+        return rqt
+
+    def pop_item(self, server_id, generation, index):
+        """
+        Remove the request of a simulation answered on its own
+        :param server_id: Int Server id for the cloud
+        :param generation: Int generation of the simulation
+        :param index: Int index of the simulation
+        :return: SimulationRequest removed, None if it is not in flight anymore
+        """
+
+        self.mutex.acquire()
+        try:
+            request_id = self.by_item.get((server_id, generation, index))
+            return self.__remove(request_id) if request_id is not None else None
+        finally:
+            self.mutex.release()
+
+    def pop_result(self, result):
+        """
+        Remove an asynchronous result and the requests still waiting for it
+        :param result: rpyc asynchronous result
+        :return: Tuple (server id, Connexion, List of SimulationRequest), None if the result is unknown
+        """
+
+        self.mutex.acquire()
+        try:
+            if result not in self.results:
+                return None
+            server_id, connexion, ids = self.results.pop(result)
+            return server_id, connexion, [self.__remove(request_id) for request_id in list(ids)]
+        finally:
+            self.mutex.release()
+
+    def pop_server(self, server_id):
+        """
+        Remove every request sent to a server
+        :param server_id: Int Server id for the cloud
+        :return: List of SimulationRequest removed
+        """
+
+        self.mutex.acquire()
+        try:
+            requests = [self.__remove(request_id) for request_id in list(self.by_server.get(server_id, ()))]
+            for result in [r for r, entry in self.results.items() if entry[0] == server_id]:
+                del self.results[result]
+            return requests
+        finally:
+            self.mutex.release()
+
+    def __clean_heap(self):
+        """Drop the answered requests from the top of the deadline heap (the mutex must be held)"""
+
+        while self.deadlines and self.deadlines[0][1] not in self.requests:
+            heapq.heappop(self.deadlines)
+
+    def next_deadline(self):
+        """
+        Return the earliest deadline of the requests in flight
+        :return: Float time, None if no request is in flight
+        """
+
+        self.mutex.acquire()
+        self.__clean_heap()
+        deadline = self.deadlines[0][0] if self.deadlines else None
+        self.mutex.release()
+        return deadline
+
+    def expired(self, now):
+        """
+        Return the servers with requests whose deadline is over. The requests stay in the table.
+        :param now: Float current time
+        :return: Set of Int server ids
+        """
+
+        servers = set()
+        self.mutex.acquire()
+        self.__clean_heap()
+        while self.deadlines and self.deadlines[0][0] <= now:
+            deadline, request_id = heapq.heappop(self.deadlines)
+            if request_id in self.requests:
+                servers.add(self.servers[request_id])
+        self.mutex.release()
+        return servers
+
+    def running(self):
+        """
+        Return the requests in flight
+        :return: List of (Int server id, SimulationRequest) pairs
+        """
+
+        self.mutex.acquire()
+        running = [(self.servers[request_id], rqt) for request_id, rqt in self.requests.items()]
+        self.mutex.release()
+        return running
+
+    def __len__(self):
+        """Return the number of requests in flight"""
+
+        return len(self.requests)
@@ -0,0 +1,234 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import logging
+import multiprocessing
+import time
+from multiprocessing.pool import ThreadPool
+from threading import Lock, Event
+
+from simulators import common
+from simulators.executor import SimulationExecutor
+from utils import Observable
+from .client import ASYNC
+from .resultCache import ResultCache, USE, OFF
+from ..servers import SimServer
+
+
+class LocalExecutor(Observable):
+    """
+    LocalExecutor runs the simulations on the local machine, with the same interface as the Client but
+    without registry, server or network. Every simulation is a simulator process started on a dedicated slot
+    of a SimulationExecutor. The number of slots is calibrated like the capacity of a server.
+    Usage:
+            # Create and start the LocalExecutor
+            executor = LocalExecutor(opt)
+            executor.start()
+
+            # Send simulation list and wait for results
+            res_list = executor.simulate(sim_list)
+
+            # Stop the LocalExecutor
+            executor.stop()
+    """
+
+    def __init__(self, opt):
+        """
+        Class initialization
+        :param opt: Dictionary containing simulation parameters
+        """
+
+        Observable.__init__(self)
+        self.opt = opt
+        self.n_jobs = int(opt["jobs"]) if "jobs" in opt and opt["jobs"] else None
+        self.sim_timeout = float(opt["timeout"])
+        self.sim_prun_t = 0.1  # Maximum delay before handling a user interruption while waiting for results
+        cache_file = opt["cache_file"] if "cache_file" in opt else \
+            (opt["root_dir"] + "/save/results.db" if "root_dir" in opt else None)
+        self.cache = ResultCache(cache_file, policy=opt["cache"] if "cache" in opt else USE)
+        self.executor = None
+        self.pool = None
+        self.rsp = []
+        self.aliases = {}  # Indexes of the identical requests waiting for a request, indexed by its index
+        self.generation = 0
+        self.pending = 0
+        self.ticket = 0  # Last ticket given to a request submitted alone
+        self.sim_done = Event()
+        self.mutex_rsp = Lock()
+        self.terminated = False
+        self.interrupted = False
+
+    def calibrate(self):
+        """
+        Compute the number of simulations the machine can run in parallel
+        :return: Int number of slots
+        """
+
+        try:
+            n_slots = int(SimServer.capacity(self.opt))
+        except (ZeroDivisionError, KeyError) as e:
+            logging.warning("Impossible to calibrate the local capacity, one simulation per cpu is run. " +
+                            "Exception:\n" + str(e))
+            n_slots = multiprocessing.cpu_count()
+        return max(n_slots, 1)
+
+    def start(self):
+        """Start the local executor. The slots are created with the first simulations"""
+
+        self.terminated = False
+        self.interrupted = False
+
+    def __create_slots(self):
+        """Create the simulation slots and the threads waiting for them"""
+
+        n_slots = self.n_jobs if self.n_jobs is not None else self.calibrate()
+        self.executor = SimulationExecutor(n_slots,
+                                           self.opt['sim_memory'] if 'sim_memory' in self.opt else None,
+                                           self.opt['sim_cpu_time'] if 'sim_cpu_time' in self.opt else None)
+        # The simulations are run by processes: the threads only wait for them
+        self.pool = ThreadPool(n_slots)
+        logging.info("Local executor started with " + str(n_slots) + " simulation slot(s)")
+
+    def stop(self):
+        """Stop the simulation slots, kill the simulations still running and close the result cache"""
+
+        self.terminated = True
+        self.sim_done.set()
+        if self.executor is not None:
+            self.executor.kill_all()
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+        self.cache.close()
+
+    def run_simulation(self, generation, index, rqt, key):
+        """
+        Run one simulation and store its result. Called by the threads of the pool.
+        :param generation: Int call to simulate the request belongs to
+        :param index: Int index of the request in the simulation list
+        :param rqt: Dictionary containing simulation parameters
+        :param key: String key of the request in the result cache
+        """
+
+        try:
+            result = common.launch_simulator(rqt, self.executor, time.time() + self.sim_timeout)
+        except Exception as e:
+            logging.error("Exception during the local simulation " + str(index) + ":\n" + str(e))
+            result = {}
+        self.store_result(generation, index, key, result)
+
+    def store_result(self, generation, index, key, result):
+        """
+        Store the result of a simulation and notify the observers
+        :param generation: Int call to simulate the request belongs to
+        :param index: Int index of the request in the simulation list
+        :param key: String key of the request in the result cache
+        :param result: Dictionary of the simulation results
+        """
+
+        if generation == ASYNC:
+            self.cache.put(key, result)
+            self.notify_observers(**{"async_result": (index, result)})
+            return
+
+        self.mutex_rsp.acquire()
+        if generation != self.generation:
+            self.mutex_rsp.release()
+            return
+        # The identical requests of the list get the same result
+        indexes = [index] + self.aliases.pop(index, [])
+        for i in indexes:
+            self.rsp[i] = result
+        self.pending -= len(indexes)
+        if self.pending <= 0:
+            self.sim_done.set()
+        self.mutex_rsp.release()
+
+        self.cache.put(key, result)
+        for i in indexes:
+            self.notify_observers(**{"result": (i, result)})
+
+    def submit(self, rqt):
+        """
+        Start a simulation without waiting for its result. The result is notified to the observers
+        as an "async_result" (ticket, result) pair.
+        :param rqt: Dictionary containing simulation parameters
+        :return: Int ticket of the request
+        """
+
+        self.mutex_rsp.acquire()
+        self.ticket += 1
+        ticket = self.ticket
+        self.mutex_rsp.release()
+
+        key = self.cache.key(rqt) if self.cache.policy != OFF else None
+        result = self.cache.get(key) if key is not None else None
+        if result is not None:
+            self.notify_observers(**{"async_result": (ticket, result)})
+            return ticket
+
+        if self.pool is None:
+            self.__create_slots()
+        self.pool.apply_async(self.run_simulation, (ASYNC, ticket, rqt, key))
+        return ticket
+
+    def capacity(self):
+        """
+        Return the number of simulations run in parallel
+        :return: Int number of simulation slots
+        """
+
+        if self.pool is None:
+            self.__create_slots()
+        return self.executor.n_slots
+
+    def simulate(self, sim_list):
+        """Perform synchronous simulation with the given list and return response list"""
+
+        # Look for the results in the cache. Identical requests are run only once
+        hits, requests, aliases = self.cache.split(sim_list)
+
+        self.sim_done.clear()
+        self.mutex_rsp.acquire()
+        self.generation += 1
+        generation = self.generation
+        self.aliases = aliases
+        self.rsp = [{} for _ in sim_list]
+        for k, result in hits:
+            self.rsp[k] = result
+        self.pending = len(sim_list) - len(hits)
+        if self.pending <= 0:
+            self.sim_done.set()
+        self.mutex_rsp.release()
+        for k, result in hits:
+            self.notify_observers(**{"result": (k, result)})
+
+        if requests and self.pool is None:
+            self.__create_slots()
+        for k, v, key in requests:
+            self.pool.apply_async(self.run_simulation, (generation, k, v, key))
+
+        # Wait for the completion event and interrupt when processed or interrupted
+        while not self.sim_done.is_set() and not self.terminated:
+            try:
+                self.sim_done.wait(self.sim_prun_t)
+            except KeyboardInterrupt:
+                logging.warning("Simulation interrupted by user!")
+                self.interrupted = True
+                self.notify_observers(**{"interruption": True})
+                self.stop()
+        return self.rsp
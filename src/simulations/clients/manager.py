@@ -16,12 +16,15 @@
 ##
 
 import datetime
+import glob
 import logging
 
-from optimizations import Genetic, GeneticMetaOptimization
+from optimizations import Genetic, ArrayGenetic, GeneticMetaOptimization, SteadyStateGenetic, SurrogateGenetic, \
+    MultiFidelityGenetic, IslandGenetic, CMAES, EvolutionStrategy, ResultStore, parse_address
 from simulators import common
 from utils import PickleUtils
 from .client import Client
+from .localExecutor import LocalExecutor
 from ..simulation import Simulation
 
 
@@ -30,6 +33,13 @@ class Manager(Simulation):
     The Manager class launch different type of simulation including :
     - Simple simulation
     - Genetic optimization on simulations (opt["sim_type"]="CM")
+    - Genetic optimization on a numpy population, for large populations (opt["sim_type"]="CM_ARRAY")
+    - Asynchronous steady-state genetic optimization on simulations (opt["sim_type"]="CM_ASYNC")
+    - Genetic optimization screening the specimens with a surrogate model (opt["sim_type"]="CM_SURROGATE")
+    - Genetic optimization simulating the best specimens at increasing horizons (opt["sim_type"]="CM_FIDELITY")
+    - Island genetic optimization exchanging specimens with other Managers (opt["sim_type"]="ISLAND")
+    - CMA-ES optimization on simulations, resumable from a state file (opt["sim_type"]="CMA")
+    - Evolution strategy sending noise seeds instead of genomes (opt["sim_type"]="ES")
     - Meta-Genetic optimization on simulation (opt["sim_type"]="META_GA")
     Usage:
             # Create and start the simulation Process
@@ -49,7 +59,8 @@ class Manager(Simulation):
         self.opt = opt
         self.sim_type = opt["sim_type"] if "sim_type" in opt else None
         self.save = opt["save"] if "save" in opt else True
-        self.client = Client(opt)
+        # Local mode runs the simulations on this machine, without registry nor servers
+        self.client = LocalExecutor(opt) if "local" in opt and opt["local"] else Client(opt)
         self.res_list = []
 
     def start(self):
@@ -69,6 +80,20 @@ class Manager(Simulation):
             self.run_sim(self.opt)
         elif self.sim_type == "CM":
             self.connection_matrix_opti_sim()
+        elif self.sim_type == "CM_ARRAY":
+            self.array_opti_sim()
+        elif self.sim_type == "CM_ASYNC":
+            self.steady_state_opti_sim()
+        elif self.sim_type == "CM_SURROGATE":
+            self.surrogate_opti_sim()
+        elif self.sim_type == "CM_FIDELITY":
+            self.multi_fidelity_opti_sim()
+        elif self.sim_type == "ISLAND":
+            self.island_opti_sim()
+        elif self.sim_type == "CMA":
+            self.cma_opti_sim()
+        elif self.sim_type == "ES":
+            self.es_opti_sim()
         elif self.sim_type == "META_GA":
             self.meta_ga_sim()
         else:
@@ -96,14 +121,109 @@ class Manager(Simulation):
         # Stop and display results
         logging.info(genetic.ga.bestIndividual())
 
+    def array_opti_sim(self):
+        """Optimize the connection matrix parameters with a genetic algorithm working on a numpy population"""
+
+        # Create genetic algorithm
+        genetic = ArrayGenetic(self.opt, self.client)
+
+        # Run genetic algorithm until convergence or max iteration reached
+        genetic.start(**{"freq_stats": 2})
+
+        # Stop and display results
+        logging.info(genetic.bestIndividual())
+
+    def steady_state_opti_sim(self):
+        """Optimize the connection matrix parameters with a steady-state genetic algorithm that keeps
+        every simulation slot busy"""
+
+        # Create genetic algorithm
+        genetic = SteadyStateGenetic(self.opt, self.client)
+
+        # Run genetic algorithm until convergence or max iteration reached
+        genetic.start()
+
+    def surrogate_opti_sim(self):
+        """Optimize the connection matrix parameters with a genetic algorithm that simulates only the
+        specimens selected by a surrogate model"""
+
+        # Create genetic algorithm, the surrogate is trained with the previous runs if given
+        history = sorted(glob.glob(self.opt["history"])) if "history" in self.opt and self.opt["history"] else None
+        genetic = SurrogateGenetic(self.opt, self.client, history)
+
+        # Run genetic algorithm until convergence or max iteration reached
+        genetic.start(**{"freq_stats": 2})
+
+        # Stop and display results
+        logging.info(genetic.ga.bestIndividual())
+
+    def multi_fidelity_opti_sim(self):
+        """Optimize the connection matrix parameters with a genetic algorithm that simulates the specimens at
+        increasing horizons, only the best ones reaching the full simulation"""
+
+        # Create genetic algorithm with the horizons of the short simulations
+        horizons = [int(h) for h in self.opt["horizons"].split(",") if h] \
+            if "horizons" in self.opt and self.opt["horizons"] else (125, 250)
+        genetic = MultiFidelityGenetic(self.opt, self.client, horizons)
+
+        # Run genetic algorithm until convergence or max iteration reached
+        genetic.start(**{"freq_stats": 2})
+
+        # Stop and display results
+        logging.info(genetic.ga.bestIndividual())
+
+    def island_opti_sim(self):
+        """Optimize the connection matrix parameters on an island of a distributed genetic algorithm"""
+
+        island = parse_address(self.opt["island"])
+        islands = [parse_address(address) for address in self.opt["islands"].split(",") if address] \
+            if "islands" in self.opt and self.opt["islands"] else [island]
+
+        # Create genetic algorithm
+        genetic = IslandGenetic(self.opt, self.client, island, islands,
+                                self.opt["topology"] if "topology" in self.opt else "ring",
+                                int(self.opt["migration_rate"]) if "migration_rate" in self.opt else 5)
+
+        # Run genetic algorithm until convergence or max iteration reached
+        genetic.start(**{"freq_stats": 2})
+
+        # Stop and display results
+        logging.info(genetic.ga.bestIndividual())
+
+    def cma_opti_sim(self):
+        """Optimize the connection matrix parameters with a CMA evolution strategy"""
+
+        # Create the evolution strategy and resume it from a state file if given
+        cma = CMAES(self.opt, self.client)
+        if "resume" in self.opt and self.opt["resume"]:
+            cma.load_state(self.opt["resume"])
+
+        # Run the evolution strategy until convergence or max iteration reached
+        cma.start()
+
+    def es_opti_sim(self):
+        """Optimize the connection matrix parameters with a seed-based evolution strategy"""
+
+        # Run the evolution strategy until convergence or max iteration reached
+        es = EvolutionStrategy(self.opt, self.client)
+        es.start()
+
     def meta_ga_sim(self):
         """Run an meta simulation to benchmark genetic algorithm parameters"""
 
         # Create meta optimization
         mga = GeneticMetaOptimization(self.opt, self.client)
 
-        # Run cross-over benchmark
-        mga.co_bench()
+        # Run the benchmark, the cross-over one by default
+        bench = self.opt["bench"] if "bench" in self.opt and self.opt["bench"] else "co"
+        if bench == "mut":
+            mga.mut_bench()
+        elif bench == "pop_size":
+            mga.pop_size_bench()
+        elif bench == "init_strat":
+            mga.init_strat_bench()
+        else:
+            mga.co_bench()
 
     def run_sim(self, sim_list):
         """
@@ -113,20 +233,26 @@ class Manager(Simulation):
 
         if "local" in sim_list and sim_list["local"]:
             self.res_list.append(common.launch_simulator(sim_list))
+            simulated = [(sim_list, self.res_list[-1])]
         elif "load_file" in sim_list and sim_list["load_file"]:
             sim_list["genome"] = PickleUtils.read_file(sim_list["load_file"])
             self.res_list.append(common.launch_simulator(sim_list))
+            simulated = [(sim_list, self.res_list[-1])]
         else:
             # Simulate
             if type(sim_list) != list:
                 sim_list = [sim_list]
             self.res_list.append(self.client.simulate(sim_list))
+            simulated = list(zip(sim_list, self.res_list[-1]))
 
         # Save the results
         if self.save:
-            PickleUtils.write_file(
-                self.save_directory + "Simulation_" + datetime.datetime.now().strftime("%Y_%m_%d_%H_%M") +
-                ".sim", self.res_list)
+            run = "Simulation" + datetime.datetime.now().strftime("_%Y_%m_%d_%H_%M_%S")
+            store = ResultStore(self.save_directory + ResultStore.FILENAME)
+            store.register(run, "Simulation", simulated[0][0].get("config_name") if simulated else None)
+            for rqt, res in simulated:
+                store.add(run, 0, rqt.get("genome"), res)
+            store.close()
 
     def display_results(self):
         """
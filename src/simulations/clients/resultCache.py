@@ -0,0 +1,290 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from simulations import wire
+
+# Cache policies
+USE = "use"  # Read and write the cache
+REFRESH = "refresh"  # Always simulate and write the cache, for stochastic models
+OFF = "off"  # Do not use the cache
+POLICIES = (USE, REFRESH, OFF)
+
+# Request entries that change the result of a simulation. The other entries configure the client, the servers
+# or the optimization and are left out of the key. The files and the genomes are hashed by content
+FILE_KEYS = ("model", "config_name")
+GENOME_KEYS = ("genome", "es_base")
+RESULT_KEYS = ("simulator", "exit_condition", "es_seed", "es_sigma", "trajectory", "trace")
+
+
+class ResultCache:
+    """
+    ResultCache stores the results of the simulations, indexed by a hash of the content of the model file,
+    the content of the config file, the quantized genome and the parameters in RESULT_KEYS. The last results
+    are kept in memory and every result is written in a SQLite database shared between the runs. The writes
+    are committed by batches, and when the cache is closed.
+    Usage:
+            # Create a cache stored in a file
+            cache = ResultCache("save/results.db")
+
+            # Look for the result of a request, then store it once simulated
+            key = cache.key(opt)
+            res = cache.get(key)
+            if res is None:
+                cache.put(key, simulate(opt))
+
+            # Write the last results
+            cache.close()
+    """
+
+    SIZE = 4096  # Number of results kept in memory
+    DECIMALS = 9  # Number of decimals of the genome values in the hash
+    BATCH = 64  # Number of results buffered before being written
+    FLUSH_T = 5.  # Maximum delay in seconds before a buffered result is written
+
+    def __init__(self, filename=None, size=SIZE, decimals=DECIMALS, policy=USE, batch=BATCH):
+        """
+        Class initialization
+        :param filename: String path to the SQLite database, None to keep the results in memory only
+        :param size: Int number of results kept in memory
+        :param decimals: Int number of decimals of the genome values in the hash
+        :param policy: String cache policy: use, refresh or off
+        :param batch: Int number of results buffered before being written
+        """
+
+        if policy not in POLICIES:
+            raise ValueError("Unknown cache policy " + str(policy) + ". Choose one of " + str(POLICIES))
+        self.policy = policy
+        self.size = size
+        self.decimals = decimals
+        self.memory = OrderedDict()
+        self.digests = {}  # Digest of the files, indexed by path. Entries are (mtime, size, digest)
+        self.hits = 0
+        self.misses = 0
+        self.batch = batch
+        self.rows = []  # Results not written yet. They are still found in memory
+        self.t_flush = time.time()
+        self.mutex = Lock()
+        self.db = None
+        if filename is not None and policy != OFF:
+            self.__open(filename)
+
+    def __open(self, filename):
+        """
+        Open the SQLite database and create its table
+        :param filename: String path to the SQLite database
+        """
+
+        dirname = os.path.dirname(filename)
+        try:
+            if dirname != "" and not os.path.exists(dirname):
+                os.makedirs(dirname)
+            self.db = sqlite3.connect(filename, timeout=30., check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result BLOB, created REAL)")
+            self.db.commit()
+            logging.info("Result cache opened in " + filename)
+        except (OSError, sqlite3.Error) as e:
+            logging.error("Impossible to open the result cache " + filename + ", results are kept in memory only. " +
+                          "Exception:\n" + str(e))
+            self.db = None
+
+    @property
+    def enabled(self):
+        """Return True if the results are looked for in the cache"""
+
+        return self.policy == USE
+
+    def file_digest(self, path):
+        """
+        Return the digest of the content of a file. The digest is computed again when the file changes.
+        :param path: String path to the file
+        :return: String hexadecimal digest, the path itself if the file cannot be read
+        """
+
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            return str(path)
+
+        self.mutex.acquire()
+        entry = self.digests.get(path)
+        self.mutex.release()
+        if entry is not None and entry[0] == stat.st_mtime and entry[1] == stat.st_size:
+            return entry[2]
+
+        sha = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        self.mutex.acquire()
+        self.digests[path] = (stat.st_mtime, stat.st_size, digest)
+        self.mutex.release()
+        return digest
+
+    def quantize(self, genome):
+        """
+        Round the genome values so nearly identical genomes share the same key
+        :param genome: List of Float genome values
+        :return: Tuple of Float rounded values
+        """
+
+        # Adding 0. turns -0.0 into 0.0
+        return tuple(round(float(value), self.decimals) + 0. for value in genome)
+
+    def key(self, rqt):
+        """
+        Return the canonical hash of a simulation request
+        :param rqt: Dictionary containing simulation parameters
+        :return: String hexadecimal key
+        """
+
+        entries = [(k, self.file_digest(rqt.get(k))) for k in FILE_KEYS]
+        entries.extend((k, self.quantize(rqt[k]) if rqt.get(k) is not None else None) for k in GENOME_KEYS)
+        entries.extend((k, rqt.get(k)) for k in RESULT_KEYS)
+        return hashlib.sha1(repr(entries).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Return the result of a request, looked for in memory then in the database
+        :param key: String key of the request
+        :return: Dictionary of the simulation results, None if the request has not been simulated yet
+        """
+
+        if not self.enabled:
+            return None
+
+        self.mutex.acquire()
+        try:
+            if key in self.memory:
+                result = self.memory.pop(key)
+                self.memory[key] = result
+            elif self.db is not None:
+                row = self.db.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+                result = wire.decode(row[0]) if row is not None else None
+                if result is not None:
+                    self.__remember(key, result)
+            else:
+                result = None
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        except (sqlite3.Error, wire.WireError) as e:
+            logging.error("Impossible to read the result cache. Exception:\n" + str(e))
+            result = None
+        finally:
+            self.mutex.release()
+        return dict(result) if result is not None else None
+
+    def put(self, key, result):
+        """
+        Store the result of a request. Empty results and busy replies are not stored.
+        :param key: String key of the request
+        :param result: Dictionary of the simulation results
+        """
+
+        if self.policy == OFF or key is None or not isinstance(result, dict) or not result or "busy" in result:
+            return
+
+        self.mutex.acquire()
+        self.__remember(key, dict(result))
+        if self.db is not None:
+            self.rows.append((key, sqlite3.Binary(wire.encode(result)), time.time()))
+            if len(self.rows) >= self.batch or time.time() - self.t_flush > self.FLUSH_T:
+                self.__flush()
+        self.mutex.release()
+
+    def flush(self):
+        """Write the buffered results in a single transaction"""
+
+        self.mutex.acquire()
+        self.__flush()
+        self.mutex.release()
+
+    def __flush(self):
+        """Write the buffered results (the mutex must be held)"""
+
+        rows = self.rows
+        self.rows = []
+        self.t_flush = time.time()
+        try:
+            if rows and self.db is not None:
+                self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", rows)
+                self.db.commit()
+        except sqlite3.Error as e:
+            logging.error("Impossible to write " + str(len(rows)) + " result(s) in the result cache. " +
+                          "Exception:\n" + str(e))
+
+    def split(self, sim_list):
+        """
+        Look for the results of a list of requests. Identical requests are simulated only once
+        when the cache is used.
+        :param sim_list: List of Dictionary containing simulation parameters
+        :return: Tuple of the List of (index, result) pairs found, the List of (index, request, key) to simulate
+        and the Dictionary of the indexes of the identical requests, indexed by the index of the one simulated
+        """
+
+        hits = []
+        requests = []
+        first = {}
+        aliases = {}
+        for k, v in enumerate(sim_list):
+            key = self.key(v) if self.policy != OFF else None
+            result = self.get(key) if key is not None else None
+            if result is not None:
+                hits.append((k, result))
+            elif self.enabled and key in first:
+                aliases.setdefault(first[key], []).append(k)
+            else:
+                first[key] = k
+                requests.append((k, v, key))
+        if hits or aliases:
+            logging.info(str(len(hits)) + " result(s) found in the cache, " + str(len(requests)) +
+                         " simulation(s) to run for " + str(len(sim_list)) + " request(s)")
+        return hits, requests, aliases
+
+    def __remember(self, key, result):
+        """
+        Keep a result in memory and forget the least recently used ones (the mutex must be held)
+        :param key: String key of the request
+        :param result: Dictionary of the simulation results
+        """
+
+        self.memory.pop(key, None)
+        self.memory[key] = result
+        while len(self.memory) > self.size:
+            self.memory.popitem(last=False)
+
+    def close(self):
+        """Write the buffered results and close the database"""
+
+        self.mutex.acquire()
+        if self.db is not None:
+            self.__flush()
+            self.db.close()
+            self.db = None
+        self.mutex.release()
+        if self.hits or self.misses:
+            logging.info("Result cache: " + str(self.hits) + " hit(s), " + str(self.misses) + " miss(es)")
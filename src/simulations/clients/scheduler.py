@@ -0,0 +1,154 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import logging
+import time
+from threading import Lock
+
+
+class Scheduler:
+    """
+    Scheduler keeps track of the speed of every simulation server to maximize the throughput of the cloud.
+    The duration of the simulations run by a server is averaged with an exponentially weighted moving average.
+    New requests go to the fastest server with a free slot. When no request is left, the simulations still
+    running on slow servers can be duplicated on idle ones: the first result to arrive is kept.
+    Usage:
+            # Create the scheduler
+            scheduler = Scheduler()
+
+            # Record the duration of every simulation
+            scheduler.record(server_id, duration)
+
+            # Select the best server for a new request
+            server_id = scheduler.select(cloud_state.items())
+
+            # Select the simulations to duplicate on an idle server
+            backups = scheduler.stragglers(server_id, inflight.running(), is_done)
+    """
+
+    ALPHA = 0.3  # Weight of the last measure in the latency average
+
+    def __init__(self, alpha=ALPHA):
+        """
+        Class initialization
+        :param alpha: Float weight of the last measure in the latency average, between 0 and 1
+        """
+
+        self.alpha = alpha
+        self.latency = {}  # Average duration of a simulation, indexed by server id
+        self.mutex = Lock()
+
+    def record(self, server_id, duration):
+        """
+        Update the average simulation duration of a server
+        :param server_id: Int Server id for the cloud
+        :param duration: Float duration in seconds between the request and the result
+        """
+
+        self.mutex.acquire()
+        if server_id in self.latency:
+            self.latency[server_id] = self.alpha * duration + (1 - self.alpha) * self.latency[server_id]
+        else:
+            self.latency[server_id] = duration
+        self.mutex.release()
+        logging.debug("Server " + str(server_id) + " average simulation time: " +
+                      str(round(self.latency[server_id], 3)) + "s")
+
+    def forget(self, server_id):
+        """
+        Remove the statistics of a server that left the cloud
+        :param server_id: Int Server id for the cloud
+        """
+
+        self.mutex.acquire()
+        self.latency.pop(server_id, None)
+        self.mutex.release()
+
+    def expected_latency(self, server_id):
+        """
+        Return the expected duration of a simulation on a server. Servers never measured are expected to
+        be as fast as the average server.
+        :param server_id: Int Server id for the cloud
+        :return: Float duration in seconds, None if no server has been measured yet
+        """
+
+        self.mutex.acquire()
+        try:
+            if server_id in self.latency:
+                return self.latency[server_id]
+            if self.latency:
+                return sum(self.latency.values()) / len(self.latency)
+            return None
+        finally:
+            self.mutex.release()
+
+    def select(self, cloud_list):
+        """
+        Select the server that will return a result the soonest. Servers never measured are tried first,
+        then the fastest servers, then the ones with the most free slots. Busy servers are skipped until the
+        retry delay they advised is over.
+        :param cloud_list: List of (server id, ServerInfo) pairs
+        :return: Int id of the best candidate, 0 if no server has a free slot
+        """
+
+        now = time.time()
+        candidates = [(key, server) for key, server in cloud_list
+                      if server.status and server.nb_threads < server.max_threads and server.retry_at <= now]
+        if not candidates:
+            return 0
+
+        self.mutex.acquire()
+        best = min(candidates, key=lambda x: (x[0] in self.latency, self.latency.get(x[0], 0.),
+                                              x[1].nb_threads - x[1].max_threads))
+        self.mutex.release()
+        return best[0]
+
+    def stragglers(self, server_id, running, is_done, n=1):
+        """
+        Select the running simulations that an idle server would finish before the server running them
+        :param server_id: Int id of the idle server
+        :param running: List of (server id, SimulationRequest) pairs of the simulations running
+        :param is_done: Function telling if a SimulationRequest does not need to run anymore
+        :param n: Int maximum number of simulations to select
+        :return: List of SimulationRequest to duplicate, the latest expected first
+        """
+
+        latency = self.expected_latency(server_id)
+        if latency is None:
+            return []
+
+        now = time.time()
+        duplicated = set()
+        candidates = []
+        for key, simulation in running:
+            if is_done(simulation) or simulation.t_sent is None:
+                continue
+            if key == server_id or simulation.backup:
+                # Already running here or already a duplicate
+                duplicated.add(simulation.index)
+                continue
+            # A simulation running longer than expected is assumed to need as long again
+            expected = self.expected_latency(key)
+            remaining = simulation.t_sent + (expected if expected is not None else 0.) - now
+            if remaining <= 0:
+                remaining = now - simulation.t_sent
+            if remaining > latency:
+                candidates.append((remaining, simulation))
+
+        candidates = [c for c in candidates if c[1].index not in duplicated]
+        candidates.sort(key=lambda x: x[0], reverse=True)
+        return [c[1] for c in candidates[:n]]
@@ -33,11 +33,47 @@ class ClientLauncher(ServerLauncher):
 
     # Simulation parameters
     sim_type = SwitchAttr(["-t", "--type"], str, default=DEF_OPT["sim_type"],
-                          help="Specify the type of simulation: RUN, META_GA or CM")
+                          help="Specify the type of simulation: RUN, META_GA, CM, CM_ARRAY, CM_ASYNC, "
+                               "CM_SURROGATE, CM_FIDELITY, ISLAND, CMA or ES")
     sim_timeout = SwitchAttr(["-T", "--timeout"], str, default=DEF_OPT["timeout"],
                              help="Maximum duration for the simulation")
+    discovery_ttl = SwitchAttr(["--discovery-ttl"], float, default=DEF_OPT["discovery_ttl"],
+                               help="Delay in seconds between two lookups for simulation servers on the network")
+    cache = SwitchAttr(["--cache"], str, default=DEF_OPT["cache"],
+                       help="Result cache policy: use, refresh (always simulate, for stochastic models) or off")
     local = Flag(["-l"], default=DEF_OPT["local"],
-                 help="Start a single local simulation. Used to bypass simulation distributed architecture")
+                 help="Run the simulations on this machine. Used to bypass simulation distributed architecture")
+    jobs = SwitchAttr(["-j", "--jobs"], int, default=None,
+                      help="Number of parallel simulations in local mode. Default is the calibrated capacity")
+    trajectory = SwitchAttr(["--trajectory"], int, default=0,
+                            help="Record the trajectory of the simulations every N iterations, 0 to disable it")
+    trace = Flag(["--trace"], default=False,
+                 help="Keep the last events of the simulation steps and write them at the end of the simulations")
+
+    # Island parameters
+    island = SwitchAttr(["--island"], str, default=None,
+                        help="Address host:port of this island in ISLAND mode")
+    islands = SwitchAttr(["--islands"], str, default=None,
+                         help="Comma separated addresses host:port of every island in ISLAND mode")
+    topology = SwitchAttr(["--topology"], str, default="ring",
+                          help="Migration graph between the islands: ring, full or star")
+    migration_rate = SwitchAttr(["--migration-rate"], int, default=5,
+                                help="Number of generations between two migrations of the islands")
+
+    # Optimization parameters
+    bench = SwitchAttr(["--bench"], str, default="co",
+                       help="Parameter benchmarked in META_GA mode: co, mut, pop_size or init_strat")
+    racing = Flag(["--racing"], default=False,
+                  help="Eliminate the worst configurations of the META_GA benchmark by successive halving")
+    race_budget = SwitchAttr(["--race-budget"], int, default=None,
+                             help="Maximum number of simulations of a META_GA benchmark with racing")
+    history = SwitchAttr(["--history"], str, default=None,
+                         help="Pattern of the saved optimization files or result stores (.db) used to train "
+                              "the surrogate in CM_SURROGATE mode")
+    horizons = SwitchAttr(["--horizons"], str, default=None,
+                          help="Comma separated numbers of iterations of the short simulations in CM_FIDELITY mode")
+    resume = SwitchAttr(["--resume"], str, default=None,
+                        help="State file of a CMA optimization to resume")
 
     # Save and load config
     save = Flag(["-S"], default=False,
@@ -58,9 +94,24 @@ class ClientLauncher(ServerLauncher):
         opt = ServerLauncher.build_opt(self).copy()
         opt["sim_type"] = self.sim_type
         opt["local"] = self.local
+        opt["jobs"] = self.jobs
+        opt["trajectory"] = self.trajectory
+        opt["trace"] = self.trace
         opt["load_file"] = self.load_file
         opt["save"] = self.save
         opt["timeout"] = self.sim_timeout
+        opt["discovery_ttl"] = self.discovery_ttl
+        opt["cache"] = self.cache
+        opt["island"] = self.island
+        opt["islands"] = self.islands
+        opt["topology"] = self.topology
+        opt["migration_rate"] = self.migration_rate
+        opt["resume"] = self.resume
+        opt["history"] = self.history
+        opt["bench"] = self.bench
+        opt["horizons"] = self.horizons
+        opt["racing"] = self.racing
+        opt["race_budget"] = self.race_budget
         return opt
 
     def main(self, *args):
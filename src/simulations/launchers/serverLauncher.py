@@ -46,6 +46,13 @@ class ServerLauncher(Launcher):
                         help="The config class to be used for simulation")
     fullscreen = Flag(["-f", "--fullscreen"], default=DEF_OPT["fullscreen"],
                       help="Enable fullscreen mode")
+    queue_depth = SwitchAttr(["-q", "--queue"], int, default=None,
+                             help="Maximum number of simulation requests waiting for a free slot. " +
+                                  "Default is the number of parallel simulations")
+    sim_memory = SwitchAttr(["--sim-mem"], int, default=None,
+                            help="Maximum memory of a simulation process in MB")
+    sim_cpu_time = SwitchAttr(["--sim-cpu-time"], int, default=None,
+                              help="Maximum CPU time of a simulation process in seconds")
 
     def __init__(self, executable):
         self.thread_name = "Locomotion_Server_Thread"
@@ -70,6 +77,9 @@ class ServerLauncher(Launcher):
         opt["fullscreen"] = self.fullscreen
         opt["cpu_use"] = self.max_cpu_percentage if self.max_cpu_percentage is not None else 50
         opt["memory_use"] = self.max_memory_percentage if self.max_memory_percentage is not None else 90
+        opt["queue_depth"] = self.queue_depth
+        opt["sim_memory"] = self.sim_memory
+        opt["sim_cpu_time"] = self.sim_cpu_time
         return opt
 
     def main(self, *args):
@@ -18,6 +18,7 @@
 import logging
 import math
 
+from simulators.executor import SimulationExecutor
 from utils import PickleUtils
 from .service import SimService
 from .serviceServer import ServiceServer
@@ -50,9 +51,14 @@ class SimServer(Simulation):
 
         if self.max_threads >= 1:
             try:
+                executor = SimulationExecutor(int(self.max_threads),
+                                              self.opt['sim_memory'] if 'sim_memory' in self.opt else None,
+                                              self.opt['sim_cpu_time'] if 'sim_cpu_time' in self.opt else None)
                 t = ServiceServer(SimService, int(self.max_threads),
                                   self.opt[
-                                      'register_ip'] if self.opt is not None and 'register_ip' in self.opt else None)
+                                      'register_ip'] if self.opt is not None and 'register_ip' in self.opt else None,
+                                  self.opt['queue_depth'] if self.opt is not None and 'queue_depth' in self.opt else None,
+                                  executor)
                 self.port = t.port
                 Simulation.start(self)
                 t.start()
@@ -65,23 +71,36 @@ class SimServer(Simulation):
     def test(self):
         """Test the server capacities to know how many parallel simulations it can run"""
 
+        self.max_threads = SimServer.capacity(self.opt)
+
+    @staticmethod
+    def capacity(opt):
+        """
+        Run a test simulation and compute how many simulations the machine can run in parallel
+        within its cpu and memory budget
+        :param opt: Dictionary containing simulation parameters
+        :return: Float maximum number of parallel simulations, 0 if the machine cannot run any
+        """
+
         logging.info("Test of the server capacities.")
-        rsp_ = SimService.test_simulators(self.opt)
-        if "interruption" not in rsp_[self.simulator]:
-            cpu_capacity = (self.opt['cpu_use'] - rsp_["common"]["CPU"]) / \
-                           (rsp_[self.simulator]["CPU"] - rsp_["common"]["CPU"])
+        simulator = opt["simulator"]
+        rsp_ = SimService.test_simulators(opt)
+        if "interruption" not in rsp_[simulator]:
+            cpu_capacity = (float(opt['cpu_use']) - rsp_["common"]["CPU"]) / \
+                           (rsp_[simulator]["CPU"] - rsp_["common"]["CPU"])
 
-            memory_capacity = (self.opt['memory_use'] - rsp_["common"]["memory"]) / \
-                              (rsp_[self.simulator]["memory"] - rsp_["common"]["memory"])
-            self.max_threads = math.floor(min(cpu_capacity, memory_capacity))
-            if self.max_threads >= 1:  # Change the status of the server on the cloud
+            memory_capacity = (float(opt['memory_use']) - rsp_["common"]["memory"]) / \
+                              (rsp_[simulator]["memory"] - rsp_["common"]["memory"])
+            max_threads = math.floor(min(cpu_capacity, memory_capacity))
+            if max_threads >= 1:  # Change the status of the server on the cloud
                 logging.info("Server tests finished: The server can run a maximum of " +
-                             str(self.max_threads) + " parallel simulation(s) on " + self.simulator + ".\n")
+                             str(max_threads) + " parallel simulation(s) on " + simulator + ".\n")
             else:
                 logging.info("Server tests finished: Server capacities does not allow simulations.\n")
         else:
             logging.info("User interruption during simulation test.\n")
-            self.max_threads = 0.
+            max_threads = 0.
+        return max_threads
 
     def stop(self):
         """Close the Simulation Server and delete file results"""
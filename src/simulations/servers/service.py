@@ -17,10 +17,12 @@
 
 import logging
 import os
+import time
+from threading import Lock, Thread
 
-import psutil
 import sys
 from rpyc import Service
+from simulations import wire
 from simulators import common
 
 
@@ -33,20 +35,152 @@ class SimService(Service):
                 conn = rpyc.connect(address, port)
                 bgt = rpyc.BgServingThread(conn)
                 async_simulation = rpyc.async(conn.root.exposed_simulation)
+
+                # Requests and results are encoded byte strings
+                res = async_simulation(wire.encode(opt))
+                results = wire.decode(res.value)
+
+                # Or send a batch of genomes sharing the same configuration
+                async_batch = rpyc.async(conn.root.exposed_simulate_batch)
+                async_batch(((0, (("genome", genome_0),)), (1, (("es_seed", 12),))), wire.encode(opt), callback)
+
+                # A result {"busy": True, "retry_after": delay} means the server queue was full
+                status = dict(conn.root.status())
     """
 
     # Service ALIASES used to be recognized by the rpyc registry
     ALIASES = ["BLENDERSIM", "BLENDERPLAYER"]
 
+    def get_server(self):
+        """
+        Return the ServiceServer serving this service, if any
+        :return: ServiceServer instance or None
+        """
+
+        return self._conn._config["service_server"] if "service_server" in self._conn._config else None
+
+    def exposed_capacity(self):
+        """
+        Return the number of simulations the server can run in parallel. Clients size their connection pool on it.
+        :return: Int maximum number of parallel simulations
+        """
+
+        server = self.get_server()
+        return int(server.max_threads) if server is not None else 1
+
+    def exposed_status(self):
+        """
+        Return the current load of the server
+        :return: Tuple of (key, value) pairs with the number of slots, free slots, waiting requests and queue depth
+        """
+
+        server = self.get_server()
+        return tuple(sorted(server.status().items())) if server is not None else ()
+
+    def run_simulation(self, opt_):
+        """
+        Launch a simulation once the server admitted it
+        :param opt_: Dictionary containing simulation parameters
+        :return: Dictionary of the simulation results or the busy reply of the server if it refused the simulation
+        """
+
+        # The simulation is killed when the client stops waiting for it
+        deadline = time.time() + float(opt_["timeout"]) if "timeout" in opt_ else None
+
+        server = self.get_server()
+        if server is None:
+            return common.launch_simulator(opt_)
+        if not server.admit():
+            logging.warning("Server busy: simulation refused")
+            return server.busy_reply()
+        t_init = time.time()
+        try:
+            return common.launch_simulator(opt_, server.executor, deadline)
+        finally:
+            server.leave(time.time() - t_init)
+
     def exposed_simulation(self, opt_):
         """Launch a normal simulation and return its results"""
 
-        return common.launch_simulator(opt_)
+        return wire.encode(self.run_simulation(self.read_request(opt_)))
+
+    @staticmethod
+    def read_request(opt_):
+        """
+        Return the simulation parameters sent by a client
+        :param opt_: String of bytes of the encoded parameters
+        :return: Dictionary containing simulation parameters
+        """
+
+        return wire.decode(opt_)
+
+    def exposed_simulate_batch(self, items, base_opt, callback):
+        """
+        Launch a batch of simulations sharing the same configuration on the local slots. Every result is
+        streamed back through the callback as soon as its simulation is over.
+        :param items: Tuple of (id, values) pairs, where values is a Tuple of (key, value) pairs of the simulation,
+        its genome or its noise seed. Without genome, the configuration connection matrix is kept
+        :param base_opt: String of bytes of the encoded simulation parameters shared by the batch
+        :param callback: Function called with (id, encoded result) for every finished simulation
+        :return: Int number of simulations processed
+        """
+
+        base = self.read_request(base_opt)
+        queue = list(items)
+        server = self.get_server()
+        n_workers = min(len(queue), int(server.max_threads)) if server is not None else len(queue)
+        mutex_queue = Lock()
+        mutex_callback = Lock()
+
+        def worker():
+            """Launch the simulations of the batch until the queue is empty"""
+
+            while True:
+                mutex_queue.acquire()
+                if not queue:
+                    mutex_queue.release()
+                    return
+                id_, values = queue.pop(0)
+                mutex_queue.release()
+
+                opt_ = base.copy()
+                for key, value in values:
+                    opt_[key] = list(value) if key == "genome" else value
+                try:
+                    res = self.run_simulation(opt_)
+                except Exception as e:
+                    logging.error("Simulation " + str(id_) + " of the batch failed: " + str(e))
+                    res = {}
+
+                # Results are sent by value, one at a time on the connection
+                mutex_callback.acquire()
+                try:
+                    callback(id_, wire.encode(res))
+                except EOFError:
+                    # The client left: the rest of the batch is dropped, it will be resent elsewhere
+                    logging.warning("Client disconnected during a batch. Dropping the remaining simulations.")
+                    mutex_queue.acquire()
+                    del queue[:]
+                    mutex_queue.release()
+                    return
+                finally:
+                    mutex_callback.release()
+
+        logging.info("Processing a batch of " + str(len(queue)) + " simulation(s) on " + str(n_workers) + " slot(s)")
+        workers = [Thread(target=worker) for _ in range(n_workers)]
+        for t in workers:
+            t.setDaemon(True)
+            t.start()
+        for t in workers:
+            t.join()
+        return len(items)
 
     @staticmethod
     def test_simulators(opt_):
         """Launch a simulation and return its results and its cpu and memory usage"""
 
+        import psutil  # Only loaded to test the machine
+
         # Get the machine current cpu usage and memory before launching simulation
         cpu_percent = sum(psutil.cpu_percent(interval=0.5, percpu=True)) / float(
             psutil.cpu_count() if sys.version_info <= (2, 8) else os.cpu_count())
@@ -61,8 +195,8 @@ class SimService(Service):
         """Launch a simulation and return its results and its cpu and memory usage"""
 
         # Get the machine current cpu usage and memory before launching simulation
-        res = self.test_simulators(opt_)
+        res = self.test_simulators(self.read_request(opt_))
         logging.info("Test Server " + type(self).__name__ +
                      ": \nCPU = " + str(res["common"]["CPU"]) +
                      "\nMemory = " + str(res["common"]["memory"]))
-        return res
+        return wire.encode(res)
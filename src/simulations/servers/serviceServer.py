@@ -29,23 +29,45 @@ from simulations import Registry
 class ServiceServer(Server):
     """
     ServiceServer class is a rpyc server implementation to control the number of threads the server will run in parallel
-    and to get errors during simulation
+    and to get errors during simulation.
+    Every simulation request goes through an admission control: it runs if a simulation slot is free, waits in a
+    bounded queue otherwise, and is refused with a busy reply when the queue is full.
     """
 
-    def __init__(self, service, max_threads, ip_register):
+    CONNECTIONS_PER_REQUEST = 4  # Maximum number of connections for every request the server can admit
+    SLOT_WAIT_T = 1.  # Maximum delay before a waiting request checks if the server is still active
+    RETRY_AFTER_T = 1.  # Retry delay advised to clients before any simulation duration is known
+    ALPHA = 0.3  # Weight of the last simulation duration in its moving average
+
+    def __init__(self, service, max_threads, ip_register, queue_depth=None, executor=None):
         """
         Class initialization
         :param service: Service to serve on client connection
         :param max_threads: Integer for the maximum number of thread that the server can run in parallel
+        :param queue_depth: Integer for the maximum number of requests waiting for a free slot.
+        Default is max_threads
+        :param executor: SimulationExecutor running the simulator processes, None to run them directly
         """
 
         self.ip_register = Registry.test_register(ip_register)
+        # The server is given to the services through the connection configuration
+        protocol_config = PROTOCOL_CONFIG.copy()
+        protocol_config["service_server"] = self
         Server.__init__(self, service, auto_register=True,
-                        protocol_config=PROTOCOL_CONFIG,
+                        protocol_config=protocol_config,
                         registrar=UDPRegistryClient(ip=self.ip_register, port=REGISTRY_PORT))
         self.workers = 0
         self.max_threads = max_threads
+        self.executor = executor
+        self.queue_depth = int(max_threads if queue_depth is None else queue_depth)
+        self.max_connections = self.CONNECTIONS_PER_REQUEST * (int(max_threads) + self.queue_depth)
         self.lock = threading.Lock()
+        self.connection_cond = threading.Condition(self.lock)
+        # Admission control
+        self.running = 0
+        self.pending = 0
+        self.sim_time = None  # Moving average of the simulation duration
+        self.slot_cond = threading.Condition()
 
     def _accept_method(self, sock):
         """
@@ -69,12 +91,86 @@ class ServiceServer(Server):
         self._authenticate_and_serve_client(sock)
         parent.lock.acquire()
         parent.workers -= 1
+        parent.connection_cond.notify()
         parent.lock.release()
 
+    def admit(self):
+        """
+        Take a simulation slot, waiting in the queue if none is free
+        :return: Boolean True if the simulation can run, False if the server is busy
+        """
+
+        self.slot_cond.acquire()
+        try:
+            if self.running >= self.max_threads:
+                if self.pending >= self.queue_depth:
+                    return False
+                self.pending += 1
+                while self.running >= self.max_threads and self.active:
+                    self.slot_cond.wait(self.SLOT_WAIT_T)
+                self.pending -= 1
+                if not self.active:
+                    return False
+            self.running += 1
+            return True
+        finally:
+            self.slot_cond.release()
+
+    def leave(self, duration):
+        """
+        Give a simulation slot back and wake up the next waiting request
+        :param duration: Float duration of the simulation in seconds
+        """
+
+        self.slot_cond.acquire()
+        self.running -= 1
+        if self.sim_time is None:
+            self.sim_time = duration
+        else:
+            self.sim_time = self.ALPHA * duration + (1 - self.ALPHA) * self.sim_time
+        self.slot_cond.notify()
+        self.slot_cond.release()
+
+    def retry_after(self):
+        """
+        Estimate the delay after which a refused request has a chance to be admitted
+        :return: Float delay in seconds
+        """
+
+        if self.sim_time is None:
+            return self.RETRY_AFTER_T
+        return self.sim_time * (self.pending + 1) / float(max(self.max_threads, 1))
+
+    def busy_reply(self):
+        """
+        Return the reply sent instead of a result when a request is refused
+        :return: Dictionary with the busy flag and the retry delay advised to the client
+        """
+
+        return {"busy": True, "retry_after": self.retry_after()}
+
+    def status(self):
+        """
+        Return the current load of the server
+        :return: Dictionary with the number of slots, free slots, waiting requests and queue depth
+        """
+
+        self.slot_cond.acquire()
+        status = {"max_threads": int(self.max_threads), "free_slots": max(int(self.max_threads) - self.running, 0),
+                  "queue": self.pending, "queue_depth": self.queue_depth, "retry_after": self.retry_after(),
+                  "connections": self.workers}
+        self.slot_cond.release()
+        return status
+
     def accept(self):
-        """Accepts incoming socket connections if the number of working threads is not too high"""
+        """Accepts incoming socket connections. Wait for a connection to close if there are too many of them"""
+
+        self.lock.acquire()
+        while self.workers >= self.max_connections and self.active:
+            self.connection_cond.wait(self.SLOT_WAIT_T)
+        self.lock.release()
 
-        if self.workers < self.max_threads:
+        if self.active:
             while self.active:
                 try:
                     sock, addrinfo = self.listener.accept()
@@ -114,3 +210,11 @@ class ServiceServer(Server):
         except KeyboardInterrupt as e:
             self.close()
             raise e
+
+    def close(self):
+        """Close the server and refuse the requests waiting for a slot"""
+
+        Server.close(self)
+        self.slot_cond.acquire()
+        self.slot_cond.notify_all()
+        self.slot_cond.release()
@@ -16,7 +16,6 @@
 ##
 
 import logging
-import netifaces
 import os
 import socket
 
@@ -55,6 +54,8 @@ class Simulation:
         :return: String machine ip
         """
 
+        import netifaces  # Only loaded to look for the address of the machine
+
         devices = filter(lambda x: 2 in netifaces.ifaddresses(x)
                                    and 10 in netifaces.ifaddresses(x)
                                    and 'broadcast' in netifaces.ifaddresses(x)[2][0],
@@ -0,0 +1,252 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+"""
+Binary encoding of the simulation requests and results exchanged between the clients and the servers.
+An encoded message is a single byte string, so it is sent by value in one rpyc message and decoded without eval.
+
+Format (version 1, little endian):
+    - Header: MAGIC, Int8 version
+    - Fixed fields: UInt16 mask of the RESULT_FIELDS present, then one Float64 per present field
+    - Other entries: a tagged dictionary
+
+Tagged values start with a one byte tag:
+    N: None, T: True, F: False, i: Int64, I: integer out of the Int64 range as a decimal string,
+    f: Float64, s: UTF-8 string, l: list, t: tuple, d: dictionary, a: NumPy array (dtype string, Int8 number of dimensions, UInt32 shape, raw buffer in C order)
+"""
+
+import logging
+import struct
+import sys
+
+MAGIC = b"MLS"
+VERSION = 1
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+# Float fields of the simulation results, stored without tags
+RESULT_FIELDS = ("distance", "power", "stability", "t_sim", "t_init", "t_end", "t_out", "sim_speed")
+
+if sys.version_info[0] >= 3:
+    string_types = (str,)
+    integer_types = (int,)
+else:
+    string_types = (str, unicode)
+    integer_types = (int, long)
+
+
+class WireError(Exception):
+    """Raised when a message cannot be decoded"""
+    pass
+
+
+def encode(dict_):
+    """
+    Encode a dictionary of simulation parameters or results
+    :param dict_: Dictionary to encode
+    :return: String of bytes of the encoded message
+    """
+
+    mask = 0
+    fields = []
+    others = {}
+    for key, value in dict_.items():
+        if key in RESULT_FIELDS and type(value) == float:
+            mask |= 1 << RESULT_FIELDS.index(key)
+        else:
+            others[key] = value
+    for i, key in enumerate(RESULT_FIELDS):
+        if mask & (1 << i):
+            fields.append(dict_[key])
+
+    chunks = [MAGIC, struct.pack("<BH", VERSION, mask), struct.pack("<" + str(len(fields)) + "d", *fields)]
+    _encode_value(others, chunks)
+    return b"".join(chunks)
+
+
+def decode(message):
+    """
+    Decode a message created by encode
+    Raise WireError if the message is not valid
+    :param message: String of bytes of the encoded message
+    :return: Dictionary decoded
+    """
+
+    message = bytes(message)
+    if message[:len(MAGIC)] != MAGIC:
+        raise WireError("Not a simulation message")
+    try:
+        offset = len(MAGIC)
+        version, mask = struct.unpack_from("<BH", message, offset)
+        if version != VERSION:
+            raise WireError("Unsupported message version " + str(version))
+        offset += struct.calcsize("<BH")
+
+        keys = [key for i, key in enumerate(RESULT_FIELDS) if mask & (1 << i)]
+        values = struct.unpack_from("<" + str(len(keys)) + "d", message, offset)
+        offset += 8 * len(keys)
+
+        dict_, offset = _decode_value(message, offset)
+    except (struct.error, IndexError, ValueError, TypeError) as e:
+        raise WireError("Corrupted message: " + str(e))
+    if offset != len(message):
+        raise WireError("Corrupted message: " + str(len(message) - offset) + " trailing byte(s)")
+    dict_.update(zip(keys, values))
+    return dict_
+
+
+def _encode_string(value, chunks):
+    """
+    Append a length prefixed UTF-8 string
+    :param value: String to encode
+    :param chunks: List of String of bytes of the message
+    """
+
+    data = value.encode("utf-8") if not isinstance(value, bytes) else value
+    chunks.append(struct.pack("<I", len(data)))
+    chunks.append(data)
+
+
+def _encode_value(value, chunks):
+    """
+    Append a tagged value
+    :param value: Value to encode
+    :param chunks: List of String of bytes of the message
+    """
+
+    numpy = sys.modules.get("numpy")  # A value can only be a numpy object once numpy has been imported
+    if value is None:
+        chunks.append(b"N")
+    elif value is True or value is False:
+        chunks.append(b"T" if value else b"F")
+    elif numpy is not None and isinstance(value, numpy.ndarray):
+        array = numpy.ascontiguousarray(value)
+        chunks.append(b"a")
+        _encode_string(array.dtype.str, chunks)
+        chunks.append(struct.pack("<B" + str(array.ndim) + "I", array.ndim, *array.shape))
+        chunks.append(array.tobytes())
+    elif numpy is not None and isinstance(value, numpy.generic):
+        _encode_value(value.item(), chunks)
+    elif isinstance(value, integer_types) and INT64_MIN <= value <= INT64_MAX:
+        chunks.append(b"i" + struct.pack("<q", value))
+    elif isinstance(value, integer_types):
+        chunks.append(b"I")
+        _encode_string(str(value), chunks)
+    elif isinstance(value, float):
+        chunks.append(b"f" + struct.pack("<d", value))
+    elif isinstance(value, string_types):
+        chunks.append(b"s")
+        _encode_string(value, chunks)
+    elif isinstance(value, (list, tuple)):
+        chunks.append((b"l" if isinstance(value, list) else b"t") + struct.pack("<I", len(value)))
+        for item in value:
+            _encode_value(item, chunks)
+    elif isinstance(value, dict):
+        chunks.append(b"d" + struct.pack("<I", len(value)))
+        for key, item in value.items():
+            _encode_value(key, chunks)
+            _encode_value(item, chunks)
+    else:
+        logging.warning("Type " + type(value).__name__ + " cannot be encoded, its string is sent instead")
+        _encode_value(str(value), chunks)
+
+
+def _decode_string(message, offset):
+    """
+    Read a length prefixed UTF-8 string
+    :param message: String of bytes of the message
+    :param offset: Int position of the string in the message
+    :return: Tuple of the String decoded and the Int position after it
+    """
+
+    length, = struct.unpack_from("<I", message, offset)
+    offset += 4
+    if offset + length > len(message):
+        raise ValueError("string out of the message")
+    return message[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _decode_value(message, offset):
+    """
+    Read a tagged value
+    :param message: String of bytes of the message
+    :param offset: Int position of the value in the message
+    :return: Tuple of the value decoded and the Int position after it
+    """
+
+    tag = message[offset:offset + 1]
+    offset += 1
+    if tag == b"N":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"i":
+        return struct.unpack_from("<q", message, offset)[0], offset + 8
+    if tag == b"I":
+        value, offset = _decode_string(message, offset)
+        return int(value), offset
+    if tag == b"f":
+        return struct.unpack_from("<d", message, offset)[0], offset + 8
+    if tag == b"s":
+        value, offset = _decode_string(message, offset)
+        return value if sys.version_info[0] >= 3 else _to_str(value), offset
+    if tag == b"l" or tag == b"t":
+        length, = struct.unpack_from("<I", message, offset)
+        offset += 4
+        items = []
+        for _ in range(length):
+            item, offset = _decode_value(message, offset)
+            items.append(item)
+        return (items if tag == b"l" else tuple(items)), offset
+    if tag == b"d":
+        length, = struct.unpack_from("<I", message, offset)
+        offset += 4
+        dict_ = {}
+        for _ in range(length):
+            key, offset = _decode_value(message, offset)
+            dict_[key], offset = _decode_value(message, offset)
+        return dict_, offset
+    if tag == b"a":
+        import numpy
+        dtype, offset = _decode_string(message, offset)
+        ndim, = struct.unpack_from("<B", message, offset)
+        shape = struct.unpack_from("<" + str(ndim) + "I", message, offset + 1)
+        offset += 1 + 4 * ndim
+        dtype = numpy.dtype(str(dtype))
+        if dtype.hasobject:
+            raise ValueError("object arrays are not allowed")
+        size = dtype.itemsize * int(numpy.prod(shape))
+        if offset + size > len(message):
+            raise ValueError("array out of the message")
+        array = numpy.frombuffer(message[offset:offset + size], dtype=dtype).reshape(shape).copy()
+        return array, offset + size
+    raise ValueError("unknown tag " + repr(tag))
+
+
+def _to_str(value):
+    """
+    Return a Python 2 unicode string as a str when it is ASCII, so results compare like the original ones
+    :param value: unicode string
+    :return: str or unicode string
+    """
+
+    try:
+        return value.encode("ascii")
+    except UnicodeEncodeError:
+        return value
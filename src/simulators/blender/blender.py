@@ -52,7 +52,7 @@ class Blender(Simulator):
             eval("self.start_" + self.ALIASES[self.type] + "()")
         else:
             self.create_pop()
-        Simulator.launch_simulation(self.args)
+        Simulator.launch_simulation(self.args, self.executor, self.deadline)
 
     def start_blenderplayer(self):
         """Call blenderplayer via command line subprocess"""
@@ -77,6 +77,12 @@ class Blender(Simulator):
                   'filename': self.filename}
         if self.genome is not None:
             params["genome"] = str(self.genome)
+        if self.exit_condition is not None:
+            params["exit_condition"] = str(self.exit_condition)
+        if self.trajectory:
+            params["trajectory"] = int(self.trajectory)
+        if self.trace:
+            params["trace"] = True
         self.args.extend([str(params)])
         self.args.extend(["FROM_START.PY"])
 
@@ -17,6 +17,7 @@
 
 import logging
 from simulators import *
+from utils import NumpyUtils
 
 SIMULATORS = {"BLENDER": "Blender"}
 DEFAULT_SIMULATOR = "BLENDER"
@@ -39,15 +40,37 @@ def get_simulator(opt_):
     return eval(SIMULATORS[simulator_] + "(opt_)")
 
 
-def launch_simulator(opt_):
+def expand_request(opt_):
+    """
+    Return the simulation parameters of a request. The genome of a seed-based evolution strategy request
+    is regenerated from its base, its noise seed and its noise deviation.
+    :param opt_: Dictionary containing simulation parameters
+    :return: Dictionary containing simulation parameters with the genome
+    """
+
+    if "es_seed" not in opt_:
+        return opt_
+    opt_ = dict(opt_)
+    seed = opt_.pop("es_seed")
+    opt_.pop("es_version", None)
+    opt_["genome"] = NumpyUtils.perturb(opt_.pop("es_base"), seed, float(opt_.pop("es_sigma")))
+    return opt_
+
+
+def launch_simulator(opt_, executor=None, deadline=None):
     """
     Launch a simulation based on the opt_ parameters and return its results
     :param opt_: Dictionary containing simulation parameters
+    :param executor: SimulationExecutor running the simulator process, None to run it directly
+    :param deadline: Float time at which the simulator process is killed, None for no deadline
     :return: Dictionary containing simulation results
     """
 
     logging.info("Processing simulation request")
+    opt_ = expand_request(opt_)
     simulator_ = get_simulator(opt_)
+    simulator_.executor = executor
+    simulator_.deadline = deadline
     simulator_.launch_simulation()
     logging.info("Simulation request processed")
 
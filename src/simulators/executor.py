@@ -0,0 +1,270 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import glob
+import logging
+import subprocess
+import threading
+import time
+from distutils.spawn import find_executable
+
+try:
+    import resource
+except ImportError:  # Resource limits are only available on Unix
+    resource = None
+
+NUMA_NODES_PATH = "/sys/devices/system/node/node[0-9]*/cpulist"
+
+
+def parse_cpu_list(cpu_list):
+    """
+    Parse a Linux cpu list such as "0-3,8-11"
+    :param cpu_list: String cpu list
+    :return: List of Int cpu indexes
+    """
+
+    cpus = []
+    for item in cpu_list.strip().split(","):
+        if "-" in item:
+            first, last = item.split("-")
+            cpus.extend(range(int(first), int(last) + 1))
+        elif item:
+            cpus.append(int(item))
+    return cpus
+
+
+def get_numa_nodes(cpus):
+    """
+    Return the cpus of every NUMA node of the machine, restricted to the given cpus
+    :param cpus: List of Int cpu indexes the process can use
+    :return: List of (Int node index, List of Int cpu indexes) pairs. The node index is None when
+    the machine does not describe its NUMA nodes
+    """
+
+    nodes = []
+    for path in sorted(glob.glob(NUMA_NODES_PATH)):
+        try:
+            with open(path) as f:
+                node_cpus = [cpu for cpu in parse_cpu_list(f.read()) if cpu in cpus]
+        except (IOError, ValueError):
+            continue
+        if node_cpus:
+            nodes.append((int(path.split("/")[-2][4:]), node_cpus))
+    return nodes if nodes else [(None, list(cpus))]
+
+
+class SimulationExecutor:
+    """
+    SimulationExecutor runs the simulator processes of a server on a fixed number of slots. Every slot gets a
+    dedicated set of cpus, on a single NUMA node when the machine has several of them. The processes are pinned
+    to the cpus of their slot, limited in memory and cpu time and killed when their deadline expires.
+    Usage:
+            # Create an executor with 4 slots and 2GB of memory per simulation
+            executor = SimulationExecutor(4, memory_limit=2048)
+
+            # Run a simulator command line, killed after 60 seconds
+            return_code = executor.run(args, deadline=time.time() + 60)
+    """
+
+    KILL_GRACE_T = 3.  # Delay between the termination and the kill of a simulation process
+
+    def __init__(self, n_slots, memory_limit=None, cpu_time_limit=None):
+        """
+        Class initialization
+        :param n_slots: Int number of simulations run in parallel
+        :param memory_limit: Int maximum memory of a simulation process in MB, None for no limit
+        :param cpu_time_limit: Int maximum cpu time of a simulation process in seconds, None for no limit
+        """
+
+        self.n_slots = max(int(n_slots), 1)
+        self.memory_limit = int(memory_limit) if memory_limit else None
+        self.cpu_time_limit = int(cpu_time_limit) if cpu_time_limit else None
+        self.numactl = find_executable("numactl")
+        self.slots = self.__create_slots()
+        self.free_slots = list(range(self.n_slots))
+        self.slot_cond = threading.Condition()
+        self.processes = {}  # Simulation processes running, indexed by slot
+        for slot, (node, cpus) in enumerate(self.slots):
+            logging.info("Simulation slot " + str(slot) + ": cpus " + str(cpus) +
+                         ("" if node is None else " on NUMA node " + str(node)))
+
+    def __create_slots(self):
+        """
+        Share the cpus of the machine between the slots. The slots are spread over the NUMA nodes and
+        the cpus of a node are split between its slots.
+        :return: List of (Int node index, List of Int cpu indexes) pairs, one per slot
+        """
+
+        import psutil  # psutil is only loaded once an executor is created
+
+        try:
+            cpus = sorted(psutil.Process().cpu_affinity())
+        except (AttributeError, NotImplementedError, psutil.Error):
+            cpus = list(range(psutil.cpu_count()))
+        nodes = get_numa_nodes(cpus)
+
+        slots = []
+        for slot in range(self.n_slots):
+            node, node_cpus = nodes[slot % len(nodes)]
+            node_slots = len(range(slot % len(nodes), self.n_slots, len(nodes)))
+            rank = slot // len(nodes)
+            if len(node_cpus) >= node_slots:
+                # Contiguous cpus for every slot of the node
+                size = len(node_cpus) // node_slots
+                slot_cpus = node_cpus[rank * size:(rank + 1) * size]
+            else:
+                # More slots than cpus: the cpus are shared
+                slot_cpus = [node_cpus[rank % len(node_cpus)]]
+            slots.append((node, slot_cpus))
+        return slots
+
+    def __acquire(self):
+        """
+        Wait for a free slot and take it
+        :return: Int index of the slot
+        """
+
+        self.slot_cond.acquire()
+        while not self.free_slots:
+            self.slot_cond.wait()
+        slot = self.free_slots.pop(0)
+        self.slot_cond.release()
+        return slot
+
+    def __release(self, slot):
+        """
+        Give a slot back
+        :param slot: Int index of the slot
+        """
+
+        self.slot_cond.acquire()
+        self.free_slots.append(slot)
+        self.slot_cond.notify()
+        self.slot_cond.release()
+
+    def __preexec(self, cpus):
+        """
+        Return the function run in the simulation process before the simulator starts
+        :param cpus: List of Int cpu indexes of the slot
+        :return: Function to give to subprocess.Popen
+        """
+
+        import psutil
+        memory_limit = self.memory_limit
+        cpu_time_limit = self.cpu_time_limit
+
+        def preexec():
+            """Pin the process to its cpus and apply the resource limits"""
+
+            try:
+                psutil.Process().cpu_affinity(cpus)
+            except (AttributeError, NotImplementedError, psutil.Error):
+                pass
+            if resource is not None:
+                if memory_limit:
+                    limit = memory_limit * 1024 * 1024
+                    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+                if cpu_time_limit:
+                    resource.setrlimit(resource.RLIMIT_CPU, (cpu_time_limit, cpu_time_limit))
+
+        return preexec
+
+    def kill(self, proc):
+        """
+        Terminate a simulation process and its children, then kill them if they are still alive
+        :param proc: subprocess.Popen of the simulation
+        """
+
+        import psutil
+        try:
+            parent = psutil.Process(proc.pid)
+            processes = parent.children(recursive=True) + [parent]
+        except psutil.NoSuchProcess:
+            return
+        for p in processes:
+            try:
+                p.terminate()
+            except psutil.NoSuchProcess:
+                pass
+        gone, alive = psutil.wait_procs(processes, timeout=self.KILL_GRACE_T)
+        for p in alive:
+            try:
+                p.kill()
+            except psutil.NoSuchProcess:
+                pass
+
+    def kill_all(self):
+        """Kill the simulation processes running on every slot"""
+
+        self.slot_cond.acquire()
+        processes = list(self.processes.values())
+        self.slot_cond.release()
+        for proc in processes:
+            self.kill(proc)
+        if processes:
+            logging.warning(str(len(processes)) + " simulation process(es) killed")
+
+    def run(self, args, deadline=None):
+        """
+        Run a simulator command line on a free slot and wait for its end
+        :param args: List of String command line arguments
+        :param deadline: Float time at which the simulation is killed, None for no deadline
+        :return: Int return code of the process, None if it was killed at its deadline
+        """
+
+        slot = self.__acquire()
+        node, cpus = self.slots[slot]
+        if node is not None and self.numactl is not None:
+            args = [self.numactl, "--cpunodebind=" + str(node), "--membind=" + str(node)] + list(args)
+
+        timer = None
+        expired = threading.Event()
+        try:
+            logging.debug("Subprocess call on slot " + str(slot) + ": " + str(args))
+            if resource is not None:
+                proc = subprocess.Popen(args, preexec_fn=self.__preexec(cpus), close_fds=True)
+            else:
+                # No pre-execution hook: the process is pinned once started
+                import psutil
+                proc = subprocess.Popen(args)
+                try:
+                    psutil.Process(proc.pid).cpu_affinity(cpus)
+                except (AttributeError, NotImplementedError, psutil.Error):
+                    pass
+            self.slot_cond.acquire()
+            self.processes[slot] = proc
+            self.slot_cond.release()
+            if deadline is not None:
+                def expire():
+                    """Kill the simulation when its deadline expires"""
+                    expired.set()
+                    logging.warning("Simulation on slot " + str(slot) + " killed: deadline expired")
+                    self.kill(proc)
+
+                timer = threading.Timer(max(deadline - time.time(), 0.), expire)
+                timer.setDaemon(True)
+                timer.start()
+            return_code = proc.wait()
+            logging.debug("Subprocess end on slot " + str(slot) + " with code " + str(return_code))
+            return None if expired.is_set() else return_code
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self.slot_cond.acquire()
+            self.processes.pop(slot, None)
+            self.slot_cond.release()
+            self.__release(slot)
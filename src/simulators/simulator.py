@@ -52,6 +52,13 @@ class Simulator:
         self.config = opt["config_name"]
         self.logfile = opt["logfile"]
         self.genome = opt["genome"] if "genome" in opt else None
+        # Exit condition replacing the one of the config, to run a shorter simulation
+        self.exit_condition = opt["exit_condition"] if "exit_condition" in opt else None
+        # Number of iterations between two records of the trajectory, 0 to disable it
+        self.trajectory = opt["trajectory"] if "trajectory" in opt and opt["trajectory"] else 0
+        self.trace = opt["trace"] if "trace" in opt else False  # Dump the trace of the simulation steps
+        self.executor = None  # SimulationExecutor running the simulator process, if any
+        self.deadline = None  # Time at which the simulator process is killed, if any
 
     def update_filename(self):
         """Update the save file name to the current datetime"""
@@ -60,12 +67,20 @@ class Simulator:
         self.filename = self.dirname + "/" + self.filename
 
     @staticmethod
-    def launch_simulation(args):
-        """Launch a simulation subprocess"""
+    def launch_simulation(args, executor=None, deadline=None):
+        """
+        Launch a simulation subprocess
+        :param args: List of String command line arguments
+        :param executor: SimulationExecutor running the process on a dedicated slot, None for a direct call
+        :param deadline: Float time at which the process is killed. Only used with an executor
+        """
 
         logging.debug("Subprocess call: " + str(args))
         try:
-            subprocess.call(args)
+            if executor is not None:
+                executor.run(args, deadline)
+            else:
+                subprocess.call(args)
         except KeyboardInterrupt:
             logging.warning("Keyboard interruption during simulation")
         logging.debug("Subprocess end")
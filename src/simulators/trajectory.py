@@ -0,0 +1,301 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+import json
+import logging
+import mmap
+import os
+import struct
+import zlib
+
+MAGIC = b"MLTRJ1\n\0"  # Beginning of a trajectory file
+HEADER = "<I"  # Length of the JSON description of the columns
+CHUNK = "<II"  # Number of rows and number of bytes of a chunk
+DTYPE = "<f4"
+EXTENSION = ".trj"
+NAN = float("nan")  # Control signal of a muscle not yet activated
+
+
+def as_floats(value):
+    """
+    Flatten a sensor signal into floats
+    :param value: Float, vector or list signal
+    :return: List of Float values
+    """
+
+    try:
+        return [float(v) for v in value]
+    except TypeError:
+        return [float(value)]
+
+
+def trajectory_filename(save_file):
+    """
+    Return the path of the trajectory of a simulation
+    :param save_file: String path to the result file of the simulation
+    :return: String path to the trajectory file
+    """
+
+    return os.path.splitext(save_file)[0] + EXTENSION
+
+
+class TrajectoryRecorder:
+    """
+    TrajectoryRecorder captures the state of a body every few iterations of a simulation: the body position,
+    the control signal, force and length of every active muscle, the brain state and the sensor values.
+    The rows are buffered in float32 chunks, compressed and appended to a file the Trajectory class reads.
+    The columns are laid out at the first record, once the brain and the sensors have a state.
+    Usage:
+            # Record a row every 4 iterations
+            recorder = TrajectoryRecorder(body, "save/sim.trj", decimation=4)
+
+            # At every iteration, then at the end of the simulation
+            recorder.record(n_iter)
+            recorder.close()
+    """
+
+    CHUNK_ROWS = 256  # Number of rows of a chunk
+    LEVEL = 1  # zlib compression level, 0 to store raw chunks that can be memory-mapped
+
+    def __init__(self, body, filename, decimation=1, chunk_rows=CHUNK_ROWS, level=LEVEL):
+        """
+        Class initialization
+        :param body: Body instance to record
+        :param filename: String path to the trajectory file
+        :param decimation: Int number of iterations between two records
+        :param chunk_rows: Int number of rows of a chunk
+        :param level: Int zlib compression level, 0 to store raw chunks
+        """
+
+        self.body = body
+        self.filename = filename
+        self.decimation = max(int(decimation), 1)
+        self.chunk_rows = chunk_rows
+        self.level = level
+        self.muscles = [m for part in (body.l_fo_leg, body.l_ba_leg, body.r_fo_leg, body.r_ba_leg, body)
+                        for m in part.muscles if m.active]
+        self.columns = None
+        self.buffer = None
+        self.n_rows = 0
+        self.file = None
+
+    def layout(self):
+        """
+        Name the columns from the current state of the body and open the file
+        :return: List of String names of the columns
+        """
+
+        import numpy  # numpy is only loaded when a trajectory is recorded
+
+        columns = ["x", "y", "z"]
+        for m in self.muscles:
+            columns.extend([m.name + ".ctrl", m.name + ".force", m.name + ".length"])
+        columns.extend("brain." + str(i) for i in range(len(self.body.brain.state)))
+        for i, sensor in enumerate(self.body.sensors):
+            name = sensor.__class__.__name__ + "." + str(i)
+            columns.extend(name + "." + str(j) for j in range(len(as_floats(sensor.signal))))
+
+        description = json.dumps({"columns": columns, "decimation": self.decimation, "dtype": DTYPE,
+                                  "compressed": self.level > 0}).encode("utf-8")
+        self.file = open(self.filename, "wb")
+        self.file.write(MAGIC + struct.pack(HEADER, len(description)) + description)
+        self.buffer = numpy.empty((self.chunk_rows, len(columns)), dtype=DTYPE)
+        return columns
+
+    def record(self, n_iter):
+        """
+        Record the state of the body if the iteration is not decimated
+        :param n_iter: Int iteration of the simulation
+        """
+
+        if n_iter % self.decimation:
+            return
+        if self.columns is None:
+            self.columns = self.layout()
+
+        row = list(self.body.body_obj.worldPosition)
+        for m in self.muscles:
+            row.append(m.ctrl_sig if m.ctrl_sig is not None else NAN)
+            row.append(m.get_force_magnitude())
+            row.append(m.length.length)
+        row.extend(self.body.brain.state)
+        for sensor in self.body.sensors:
+            row.extend(as_floats(sensor.signal))
+
+        self.buffer[self.n_rows] = row
+        self.n_rows += 1
+        if self.n_rows == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Append the buffered rows to the file as a chunk"""
+
+        if not self.n_rows:
+            return
+        data = self.buffer[:self.n_rows].tobytes()
+        if self.level > 0:
+            data = zlib.compress(data, self.level)
+        self.file.write(struct.pack(CHUNK, self.n_rows, len(data)) + data)
+        self.n_rows = 0
+
+    def close(self):
+        """
+        Write the last rows and close the file
+        :return: String path to the trajectory file, None if nothing has been recorded
+        """
+
+        if self.file is None:
+            return None
+        try:
+            self.flush()
+        finally:
+            self.file.close()
+            self.file = None
+        return self.filename
+
+
+class Trajectory:
+    """
+    Trajectory reads a file written by TrajectoryRecorder. The file is memory-mapped and a chunk is only
+    decompressed when one of its rows is read. Raw chunks are read in place, without copy.
+    Usage:
+            # Open a trajectory and read the body position and a muscle force
+            trajectory = Trajectory(res["trajectory"])
+            x = trajectory["x"]
+            force = trajectory["ForeLeg_L_muscle.force"]
+
+            # Or read the first 100 rows of every column
+            rows = trajectory.rows(0, 100)
+    """
+
+    def __init__(self, filename):
+        """
+        Class initialization
+        Raise ValueError if the file is not a trajectory
+        :param filename: String path to the trajectory file
+        """
+
+        self.filename = filename
+        self.file = open(filename, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(str(filename) + " is not a trajectory file")
+
+        offset = len(MAGIC)
+        length = struct.unpack_from(HEADER, self.map, offset)[0]
+        offset += struct.calcsize(HEADER)
+        description = json.loads(self.map[offset:offset + length].decode("utf-8"))
+        offset += length
+        self.columns = description["columns"]
+        self.decimation = description["decimation"]
+        self.compressed = description["compressed"]
+
+        # Index of the chunks: (first row, number of rows, offset of the data, number of bytes)
+        self.chunks = []
+        n_rows = 0
+        while offset + struct.calcsize(CHUNK) <= len(self.map):
+            rows, nbytes = struct.unpack_from(CHUNK, self.map, offset)
+            offset += struct.calcsize(CHUNK)
+            if offset + nbytes > len(self.map):
+                logging.warning("Trajectory " + str(filename) + " is truncated after " + str(n_rows) + " rows")
+                break
+            self.chunks.append((n_rows, rows, offset, nbytes))
+            n_rows += rows
+            offset += nbytes
+        self.n_rows = n_rows
+        self.cache = (None, None)  # Last chunk read, as (index, array)
+
+    def __len__(self):
+        """Return the number of rows"""
+
+        return self.n_rows
+
+    def __getitem__(self, column):
+        """
+        Return every row of a column
+        :param column: String name of the column
+        :return: numpy array of float32 values
+        """
+
+        import numpy
+
+        j = self.columns.index(column)
+        return numpy.concatenate([self.chunk(i)[:, j] for i in range(len(self.chunks))]) \
+            if self.chunks else numpy.empty(0, dtype=DTYPE)
+
+    def chunk(self, i):
+        """
+        Return the rows of a chunk
+        :param i: Int index of the chunk
+        :return: numpy array of float32 values, a row per record
+        """
+
+        import numpy
+
+        if self.cache[0] == i:
+            return self.cache[1]
+        first, rows, offset, nbytes = self.chunks[i]
+        if self.compressed:
+            data = numpy.frombuffer(zlib.decompress(self.map[offset:offset + nbytes]), dtype=DTYPE)
+        else:
+            data = numpy.frombuffer(self.map, dtype=DTYPE, count=nbytes // 4, offset=offset)
+        data = data.reshape(rows, len(self.columns))
+        self.cache = (i, data)
+        return data
+
+    def rows(self, start, stop):
+        """
+        Return a range of rows, reading only the chunks they are in
+        :param start: Int index of the first row
+        :param stop: Int index after the last row
+        :return: numpy array of float32 values, a row per record
+        """
+
+        import numpy
+
+        parts = []
+        for i, (first, rows, _, _) in enumerate(self.chunks):
+            if first + rows > start and first < stop:
+                parts.append(self.chunk(i)[max(start - first, 0):stop - first])
+        return numpy.concatenate(parts) if parts else numpy.empty((0, len(self.columns)), dtype=DTYPE)
+
+    def iterations(self):
+        """
+        Return the simulation iteration of every row
+        :return: numpy array of Int iterations
+        """
+
+        import numpy
+
+        return (numpy.arange(self.n_rows) + 1) * self.decimation
+
+    def close(self):
+        """Release the memory map and close the file"""
+
+        self.cache = (None, None)
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                # Arrays of raw chunks still point to the map, it is released with them
+                pass
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
@@ -23,7 +23,8 @@ import time
 from config import Config
 from musculoskeletals import Body
 from result import Result
-from utils import FileUtils
+from simulators.trajectory import TrajectoryRecorder, trajectory_filename
+from utils import FileUtils, trace
 
 
 class Updater:
@@ -41,6 +42,10 @@ class Updater:
         self.save_file = None
 
         self.genome = False
+        self.exit_override = None  # Exit condition of the request, replacing the one of the config
+        self.trajectory = 0  # Number of iterations between two records of the trajectory, 0 to disable it
+        self.recorder = None
+        self.debug = False
         self.body = None
         self.config = None
         self.utility_class = None
@@ -81,6 +86,10 @@ class Updater:
             self.save_file = dirname + "/" + filename
 
         self.genome = eval(argv["genome"]) if "genome" in argv else False
+        self.exit_override = argv["exit_condition"] if "exit_condition" in argv else None
+        self.trajectory = int(argv["trajectory"]) if "trajectory" in argv else 0
+        if "trace" in argv and argv["trace"]:
+            trace.enable()
 
         FileUtils.create_file(log_file)
 
@@ -97,14 +106,19 @@ class Updater:
 
         configuration = Config("Simulator", self.config_name)
         self.logger = configuration.logger
+        self.debug = trace.debug_enabled(self.logger)
         configuration.save_path = self.save_file
         configuration.n_iter = 0
         configuration.t_init = time.time()
         if self.genome:
             configuration.set_conn_matrix(self.genome)
+        if self.exit_override:
+            configuration.exit_condition = self.exit_override
 
         self.body = Body(configuration, self.utility_class)
         self.config = self.body.config
+        if self.trajectory > 0:
+            self.recorder = TrajectoryRecorder(self.body, trajectory_filename(self.save_file), self.trajectory)
 
     def advertise(self):
         """Advertise simulation has begun"""
@@ -124,12 +138,19 @@ class Updater:
         Test the exit condition and stop simulation if it is True.
         """
 
-        brain_signal = self.body.get_brain_output()
-        self.penalty = self.body.update(brain_signal)
-        self.config.n_iter += 1
-
-        self.logger.debug("Main iteration " + str(self.config.n_iter) + ": stop state = " +
-                          str(eval(self.config.exit_condition)))
+        try:
+            brain_signal = self.body.get_brain_output()
+            self.penalty = self.body.update(brain_signal)
+            self.config.n_iter += 1
+            if self.recorder is not None:
+                self.recorder.record(self.config.n_iter)
+        except Exception:
+            trace.dump(self.trace_filename())
+            raise
+
+        if self.debug:
+            self.logger.debug("Main iteration " + str(self.config.n_iter) + ": stop state = " +
+                              str(eval(self.config.exit_condition)))
 
         if self.exit_condition():
             self.exit()
@@ -144,6 +165,14 @@ class Updater:
                or time.time() - self.config.t_init > self.config.timeout \
                or self.penalty
 
+    def trace_filename(self):
+        """
+        Return the path of the trace dump of the simulation
+        :return: String path to the trace dump
+        """
+
+        return os.path.splitext(self.save_file)[0] + ".trace"
+
     def exit(self):
         """Exit the simulation and create a result file"""
 
@@ -155,6 +184,10 @@ class Updater:
         # Create a result instance and save
         try:
             results = Result(self.body)
+            if self.recorder is not None:
+                results.result_dict["trajectory"] = self.recorder.close()
+            if trace.ENABLED:
+                results.result_dict["trace"] = trace.dump(self.trace_filename())
             self.logger.info(results)
             results.save_results()
         except Exception as e:
@@ -15,8 +15,6 @@
 # August 2016
 ##
 import logging
-
-import numpy
 import os
 from utils.fileUtils import FileUtils
 
@@ -38,8 +36,29 @@ class NumpyUtils(FileUtils):
         :param element: Content to store in the file
         """
 
+        import numpy  # numpy is loaded on first use: the utils are imported by every process
+
         numpy.save(filename, element)
 
+    @staticmethod
+    def perturb(base, seed, sigma):
+        """
+        Add to a vector the gaussian noise generated from a seed. The same seed gives the same noise on every
+        machine, so a perturbed vector can be sent as its seed only.
+        :param base: List of Float values
+        :param seed: Int seed of the noise. The noise is subtracted for a negative seed, 0 returns the base
+        :param sigma: Float standard deviation of the noise
+        :return: List of Float perturbed values
+        """
+
+        import numpy
+
+        base = numpy.asarray(base, dtype=float)
+        if seed == 0:
+            return base.tolist()
+        noise = numpy.random.RandomState(abs(int(seed))).randn(len(base))
+        return (base + numpy.sign(seed) * sigma * noise).tolist()
+
     @staticmethod
     def read_file(filename):
         """
@@ -51,6 +70,7 @@ class NumpyUtils(FileUtils):
             filename += ".npy"
         if os.path.isfile(filename):
             try:
+                import numpy
                 f = open(filename, 'rb')
                 result_dict = numpy.load(filename)
                 f.close()
@@ -0,0 +1,204 @@
+##
+# Mouse Locomotion Simulation
+#
+# Human Brain Project SP10
+#
+# This project provides the user with a framework based on 3D simulators allowing:
+#  - Edition of a 3D model
+#  - Edition of a physical controller model (torque-based or muscle-based)
+#  - Edition of a brain controller model (oscillator-based or neural network-based)
+#  - Simulation of the model
+#  - Optimization and Meta-optimization of the parameters in distributed cloud simulations
+#
+# File created by: Gabriel Urbain <gabriel.urbain@ugent.be>
+#                  Dimitri Rodarie <d.rodarie@gmail.com>
+# October 2026
+##
+
+"""
+Tracing tools for the code run at every simulation step. The models check once, when they are created,
+if their debug logs reach a handler and if tracing is enabled, so the step code only tests a boolean:
+
+        # At creation
+        self.debug = trace.debug_enabled(self.logger)
+        self.tracer = trace.tracer()
+        self.trace_id = self.tracer.register("muscle " + self.name, ("ctrl", "force")) if self.tracer else 0
+
+        # At every step
+        if self.debug:
+            self.logger.debug("Force = " + str(self.force))
+        if self.tracer is not None:
+            self.tracer.record(self.trace_id, self.n_iter, self.ctrl_sig, self.force.length)
+
+Tracing is enabled in a process with the MLS_TRACE environment variable or with enable(). The events are kept
+in a fixed-size ring buffer, only written to a file by dump().
+"""
+
+import json
+import logging
+import os
+import struct
+
+MAGIC = b"MLTRC1\n\0"  # Beginning of a trace dump
+CAPACITY = 1 << 16  # Default number of events kept in the ring buffer
+VALUES = 4  # Number of Float values of an event
+
+ENABLED = os.environ.get("MLS_TRACE", "0") not in ("", "0")
+_buffer = None
+
+
+def debug_enabled(logger):
+    """
+    Test if a debug record of a logger would reach a handler
+    :param logger: Logger instance
+    :return: Boolean True if debug messages of the logger are emitted
+    """
+
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    current = logger
+    while current is not None:
+        if any(handler.level <= logging.DEBUG for handler in current.handlers):
+            return True
+        if not current.propagate:
+            break
+        current = current.parent
+    return False
+
+
+def enable(capacity=CAPACITY):
+    """
+    Enable tracing in this process. The models created afterwards record their events
+    :param capacity: Int number of events kept in the ring buffer
+    """
+
+    global ENABLED, _buffer
+    ENABLED = True
+    if _buffer is None or _buffer.capacity != capacity:
+        _buffer = TraceBuffer(capacity)
+
+
+def tracer():
+    """
+    Return the ring buffer of the process if tracing is enabled
+    :return: TraceBuffer instance, None if tracing is disabled
+    """
+
+    if ENABLED and _buffer is None:
+        enable()
+    return _buffer if ENABLED else None
+
+
+def dump(filename):
+    """
+    Write the events of the ring buffer of the process, if tracing is enabled
+    :param filename: String path to the dump file
+    :return: String path to the dump file, None if tracing is disabled
+    """
+
+    if not ENABLED or _buffer is None:
+        return None
+    _buffer.dump(filename)
+    return filename
+
+
+class TraceBuffer:
+    """
+    TraceBuffer keeps the last events of the simulation steps in preallocated arrays. An event is the id of
+    its source, the iteration and up to VALUES Float values. The oldest events are overwritten.
+    Usage:
+            buffer = TraceBuffer(4096)
+            event = buffer.register("body", ("power", "penalty"))
+            buffer.record(event, n_iter, power, penalty)
+            buffer.dump("save/sim.trace")
+
+            # Read the events back
+            events = TraceBuffer.load("save/sim.trace")
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        """
+        Class initialization
+        :param capacity: Int number of events kept
+        """
+
+        import numpy  # numpy is only loaded when tracing is enabled
+
+        self.capacity = capacity
+        self.sources = []  # (name, field names) of every source, indexed by id
+        self.ids = numpy.zeros(capacity, dtype="<u2")
+        self.iterations = numpy.zeros(capacity, dtype="<u4")
+        self.values = numpy.zeros((capacity, VALUES), dtype="<f4")
+        self.head = 0  # Number of events recorded since the creation
+
+    def register(self, name, fields):
+        """
+        Declare a source of events
+        :param name: String name of the source
+        :param fields: Tuple of String names of the values of its events, at most VALUES
+        :return: Int id of the source
+        """
+
+        self.sources.append((name, list(fields)[:VALUES]))
+        return len(self.sources) - 1
+
+    def record(self, source, n_iter, *values):
+        """
+        Record an event
+        :param source: Int id of the source
+        :param n_iter: Int iteration of the simulation
+        :param values: Float values of the event. The values after them keep the ones of an older event
+        """
+
+        i = self.head % self.capacity
+        self.ids[i] = source
+        self.iterations[i] = n_iter
+        self.values[i, :len(values)] = values
+        self.head += 1
+
+    def dump(self, filename):
+        """
+        Write the events kept, the oldest first
+        :param filename: String path to the dump file
+        """
+
+        import numpy
+
+        count = min(self.head, self.capacity)
+        order = (numpy.arange(self.head - count, self.head)) % self.capacity
+        header = json.dumps({"sources": self.sources, "count": count, "dropped": self.head - count}).encode("utf-8")
+        with open(filename, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            f.write(self.ids[order].tobytes())
+            f.write(self.iterations[order].tobytes())
+            f.write(self.values[order].tobytes())
+        logging.info("Trace of " + str(count) + " event(s) written in " + str(filename))
+
+    @staticmethod
+    def load(filename):
+        """
+        Read a dump file
+        Raise ValueError if the file is not a trace dump
+        :param filename: String path to the dump file
+        :return: Dictionary with the sources and the "source", "iteration" and "values" arrays of the events
+        """
+
+        import numpy
+
+        with open(filename, "rb") as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(str(filename) + " is not a trace dump")
+        offset = len(MAGIC)
+        length = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        header = json.loads(data[offset:offset + length].decode("utf-8"))
+        offset += length
+        count = header["count"]
+        ids = numpy.frombuffer(data, dtype="<u2", count=count, offset=offset)
+        offset += 2 * count
+        iterations = numpy.frombuffer(data, dtype="<u4", count=count, offset=offset)
+        offset += 4 * count
+        values = numpy.frombuffer(data, dtype="<f4", count=count * VALUES, offset=offset).reshape(count, VALUES)
+        return {"sources": header["sources"], "dropped": header["dropped"], "source": ids,
+                "iteration": iterations, "values": values}